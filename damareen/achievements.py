@@ -0,0 +1,200 @@
+"""
+Achievementek kiértékelése
+
+Minden achievement egy játékos metrikát figyel (Achievement.tipus, paraméteres
+típusoknál a paraméterrel együtt, pl. 'kazamata_gyozelem:3'), és akkor teljesül,
+amikor a metrika eléri a cél értékét. A metrikák fajtáját a SZABALYOK adja:
+a számláló a növekményeket összegzi, a szint az elért legnagyobb értéket tartja.
+
+Az achievement katalógus metrikánként a küszöbök rendezett listája; processzen
+belül él, egy verzió bélyeggel, mint a kazamata tervek (lásd belyegek.py), és a
+signals.py lépteti, ha egy Achievement megváltozik. Egy metrika változásakor a
+régi és az új érték közötti küszöböket bisect adja, így a kiértékelés nem függ
+az achievementek számától.
+
+Egy harc (vagy harc sorozat) hatása egy menetben íródik ki: a metrikák egy
+olvasása és egy bulk upsert-je, és csak teljesüléskor az achievementek upsert-je
+és a pontok egyetlen F() növelése. A pontok az UPDATE miatt nem mennek át a
+profil mentésen, így a rangsor indexbe külön bejegyzés viszi be őket.
+"""
+from bisect import bisect_right
+from collections import Counter
+
+from django.db.models import F
+
+from . import belyegek, leaderboard_index
+from .models import Achievement, PlayerAchievement, JatekosMetrika, UserProfile
+
+SZAMLALO = 'szamlalo'   # a haladás a növekmények összege
+SZINT = 'szint'         # a haladás az eddig elért legnagyobb érték
+
+# Achievement típus -> a metrika fajtája
+SZABALYOK = {
+    Achievement.TIPUS_GYOZELEM: SZAMLALO,
+    Achievement.TIPUS_VERESEG: SZAMLALO,
+    Achievement.TIPUS_SOROZAT: SZINT,
+    Achievement.TIPUS_KAZAMATA_GYOZELEM: SZAMLALO,
+    Achievement.TIPUS_KAZAMATA_TIPUS_GYOZELEM: SZAMLALO,
+    Achievement.TIPUS_ELEM_UTKOZET: SZAMLALO,
+}
+
+_KATALOGUS_VERZIO_KULCS = 'damareen:achievement_verzio'
+
+# (verzió, metrika kulcs -> (küszöbök rendezve, ((id, cél érték, pontok), ...) ugyanabban a sorrendben))
+_katalogus = (None, {})
+
+
+def achievement_katalogus():
+    """
+    Az achievementek metrikánként, cél érték szerint rendezve.
+
+    Csak akkor kérdez le, ha a katalógus még nincs meg ebben a processzben,
+    vagy a verziója azóta megváltozott.
+
+    Visszatérés: dict metrika kulcs -> (küszöbök, ((id, cél érték, pontok), ...))
+    """
+    global _katalogus
+    verzio = belyegek.belyeg(_KATALOGUS_VERZIO_KULCS)
+    if _katalogus[0] == verzio:
+        return _katalogus[1]
+
+    metrikak = {}
+    for achievement_id, tipus, parameter, cel_ertek, pontok in Achievement.objects.order_by(
+            'cel_ertek', 'id').values_list('id', 'tipus', 'parameter', 'cel_ertek', 'pontok'):
+        metrikak.setdefault(Achievement.metrika_kulcs(tipus, parameter), []).append(
+            (achievement_id, cel_ertek, pontok)
+        )
+    _katalogus = (verzio, {
+        kulcs: (tuple(cel_ertek for _, cel_ertek, _ in tetelek), tuple(tetelek))
+        for kulcs, tetelek in metrikak.items()
+    })
+    return _katalogus[1]
+
+
+def achievement_katalogus_ervenytelenites():
+    """Új verzió bélyeg: minden processz újratölti a katalógust a következő használatkor"""
+    belyegek.leptetes([_KATALOGUS_VERZIO_KULCS])
+
+
+def _szabaly(kulcs):
+    return SZABALYOK.get(kulcs.split(':', 1)[0], SZAMLALO)
+
+
+def harc_metrikak(kazamata, jatekos_gyozott, utkozetek):
+    """
+    Egy harc paraméteres számlálóinak növekményei.
+
+    Args:
+        kazamata: Kazamata objektum
+        jatekos_gyozott: Boolean - igaz, ha a játékos nyert
+        utkozetek: (játékos kártya eleme, játékos nyert) párok
+
+    Visszatérés: Counter metrika kulcs -> növekmény
+    """
+    metrikak = Counter()
+    if jatekos_gyozott:
+        metrikak[Achievement.metrika_kulcs(Achievement.TIPUS_KAZAMATA_GYOZELEM, kazamata.id)] += 1
+        metrikak[Achievement.metrika_kulcs(Achievement.TIPUS_KAZAMATA_TIPUS_GYOZELEM, kazamata.tipus)] += 1
+    for elem, nyert in utkozetek:
+        if nyert:
+            metrikak[Achievement.metrika_kulcs(Achievement.TIPUS_ELEM_UTKOZET, elem)] += 1
+    return metrikak
+
+
+def _pontok_jovairasa(user_ids, pontok, rangsor_index=True):
+    UserProfile.objects.filter(user_id__in=user_ids).update(osszes_pontszam=F('osszes_pontszam') + pontok)
+    if rangsor_index:
+        leaderboard_index.profilok_valtozasa(user_ids)
+
+
+def achievementek_frissitese(user, metrikak, profile=None, rangsor_index=True):
+    """
+    Egy harc (vagy harc sorozat) hatása a játékos metrikáira és achievementjeire.
+
+    Lekérdezések: a metrikák olvasása és upsert-je; csak teljesüléskor még az
+    achievementek upsert-je és a pontok UPDATE-je. A katalógus bélyege helyben
+    van, csak belyegek.ELETTARTAM-onként kerül egy cache olvasásba.
+
+    Args:
+        user: User objektum
+        metrikak: dict metrika kulcs -> érték; számlálónál növekmény,
+            szintnél az elért érték (pl. {'gyozelem': 1, 'sorozat': 4})
+        profile: A hívónál lévő UserProfile példány; a pontok ezen is jóváíródnak,
+            hogy egy későbbi mentése ne írja felül őket
+        rangsor_index: False esetén a pontokat a hívó vezeti be a rangsor indexbe
+            (a harc saját változásával együtt, egy bejegyzéssel)
+
+    Visszatérés: a megszerzett pontok összege
+    """
+    metrikak = {kulcs: ertek for kulcs, ertek in metrikak.items() if ertek}
+    if not metrikak:
+        return 0
+    katalogus = achievement_katalogus()
+
+    regi = dict(
+        JatekosMetrika.objects.filter(jatekos=user, kulcs__in=metrikak).values_list('kulcs', 'ertek')
+    )
+
+    frissitendo = []
+    teljesult = []
+    for kulcs, ertek in metrikak.items():
+        elotte = regi.get(kulcs, 0)
+        utana = max(elotte, ertek) if _szabaly(kulcs) == SZINT else elotte + ertek
+        if utana == elotte:
+            continue
+        frissitendo.append(JatekosMetrika(jatekos=user, kulcs=kulcs, ertek=utana))
+
+        # Csak a most átlépett küszöbök: (elotte, utana]
+        kuszobok, tetelek = katalogus.get(kulcs, ((), ()))
+        teljesult.extend(tetelek[bisect_right(kuszobok, elotte):bisect_right(kuszobok, utana)])
+
+    if frissitendo:
+        JatekosMetrika.objects.bulk_create(
+            frissitendo, update_conflicts=True, unique_fields=['jatekos', 'kulcs'], update_fields=['ertek'],
+        )
+    if not teljesult:
+        return 0
+
+    PlayerAchievement.objects.bulk_create(
+        [
+            PlayerAchievement(jatekos=user, achievement_id=achievement_id, jelenlegi_haladás=cel_ertek)
+            for achievement_id, cel_ertek, pontok in teljesult
+        ],
+        update_conflicts=True, unique_fields=['jatekos', 'achievement'], update_fields=['jelenlegi_haladás'],
+    )
+    pontok_osszesen = sum(pontok for _, _, pontok in teljesult)
+    _pontok_jovairasa([user.id], pontok_osszesen, rangsor_index)
+    if profile is not None:
+        profile.osszes_pontszam += pontok_osszesen
+    return pontok_osszesen
+
+
+def achievement_visszamenoleg(achievement):
+    """
+    Egy új (vagy új kulcsú, cél értékű) achievement jóváírása azoknak, akiknek
+    a metrikája már elérte a célt.
+
+    Ők a küszöböt korábban lépték át, így a harcok kiértékelése nem adná meg.
+
+    Visszatérés: a jutalmazott játékosok száma
+    """
+    teljesitettek = PlayerAchievement.objects.filter(
+        achievement=achievement, jelenlegi_haladás__gte=achievement.cel_ertek
+    ).values('jatekos_id')
+    user_ids = list(
+        JatekosMetrika.objects.filter(kulcs=achievement.kulcs, ertek__gte=achievement.cel_ertek)
+        .exclude(jatekos_id__in=teljesitettek)
+        .values_list('jatekos_id', flat=True)
+    )
+    if not user_ids:
+        return 0
+
+    PlayerAchievement.objects.bulk_create(
+        [
+            PlayerAchievement(jatekos_id=user_id, achievement=achievement, jelenlegi_haladás=achievement.cel_ertek)
+            for user_id in user_ids
+        ],
+        update_conflicts=True, unique_fields=['jatekos', 'achievement'], update_fields=['jelenlegi_haladás'],
+    )
+    _pontok_jovairasa(user_ids, achievement.pontok)
+    return len(user_ids)
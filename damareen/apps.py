@@ -1,6 +1,9 @@
-from django.apps import AppConfig
-
-
-class DamareenConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'damareen'
+from django.apps import AppConfig
+
+
+class DamareenConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'damareen'
+
+    def ready(self):
+        from . import signals  # noqa: F401
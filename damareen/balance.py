@@ -0,0 +1,150 @@
+"""
+Balansz elemzés játékmestereknek
+
+Minden világkártya (alap statokkal) és minden kazamata kártya közötti
+győzelmi mátrix, valamint kazamatánkénti nehézség. Egyetlen tömeges
+kiértékeléssel számoljuk, de csak a balance_matrix command (vagy az azt
+időzítve futtató háttérfolyamat) számol; a műszerfal a közös cache-ben tartott
+utolsó eredményt mutatja, és ha nincs, csak jelzi.
+
+Egy kártya vagy kazamata szerkesztése (signals.py) elavultnak jelöli a mátrixot,
+és BALANSZ_FRISSESSEG után magától is elavult, mert a tömeges UPDATE-ek nem
+küldenek signalt. Az elavult mátrix a következő számolásig látszik.
+"""
+from datetime import timedelta
+
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .battle_engine import tomeges_utközet_ertekeles
+from .game_logic import kazamatak_betoltese
+from .models import Vilagkartya
+
+BALANSZ_CACHE_KULCS = 'damareen:balansz'
+BALANSZ_ELAVULT_KULCS = 'damareen:balansz:elavult'
+
+# Legfeljebb ennyi ideig él a mátrix a cache-ben (másodperc)
+BALANSZ_CACHE_IDO = 24 * 60 * 60
+
+# Ennél régebbi mátrix elavultnak számít (másodperc)
+BALANSZ_FRISSESSEG = 60 * 60
+
+
+def balansz_szamitas():
+    """
+    Kiszámolja a teljes győzelmi mátrixot és az összesítőket.
+    
+    Két lekérdezés (világkártyák, kazamata kártyák), a többi memóriában fut.
+    """
+    kezdes = time.perf_counter()
+    
+    vilag_kartyak = list(
+        Vilagkartya.objects.order_by('nev').values_list('id', 'nev', 'sebzes', 'eletero', 'tipus')
+    )
+    kazamatak = kazamatak_betoltese()
+    oszlopok = [(kazamata, kartya) for kazamata, kartyak in kazamatak for kartya in kartyak]
+    
+    # Minden (világkártya, kazamata kártya) pár egy sor a tömeges kiértékelésben
+    j_sebzes, j_eletero, j_tipus = [], [], []
+    k_sebzes, k_eletero, k_tipus = [], [], []
+    for _, _, sebzes, eletero, tipus in vilag_kartyak:
+        for _, kartya in oszlopok:
+            j_sebzes.append(sebzes)
+            j_eletero.append(eletero)
+            j_tipus.append(tipus)
+            k_sebzes.append(kartya.sebzes)
+            k_eletero.append(kartya.eletero)
+            k_tipus.append(kartya.tipus)
+    nyertek, _ = tomeges_utközet_ertekeles(j_sebzes, j_eletero, j_tipus, k_sebzes, k_eletero, k_tipus)
+    
+    # Soronként bitmaszk: az i. bit az i. oszlop ellen nyert ütközet
+    oszlopszam = len(oszlopok)
+    sorok = []
+    oszlop_gyozelmek = [0] * oszlopszam
+    for sor_index in range(len(vilag_kartyak)):
+        maszk = 0
+        eltolas = sor_index * oszlopszam
+        for oszlop in range(oszlopszam):
+            if nyertek[eltolas + oszlop]:
+                maszk |= 1 << oszlop
+                oszlop_gyozelmek[oszlop] += 1
+        sorok.append(maszk)
+    
+    kartyak_szama = len(vilag_kartyak)
+    kartya_osszesito = sorted(
+        (
+            {
+                'id': kartya_id,
+                'nev': nev,
+                'gyozelmek': bin(maszk).count('1'),
+                'arany': round(100 * bin(maszk).count('1') / oszlopszam, 1) if oszlopszam else 0,
+            }
+            for (kartya_id, nev, _, _, _), maszk in zip(vilag_kartyak, sorok)
+        ),
+        key=lambda k: (-k['gyozelmek'], k['nev'])
+    )
+    
+    # Kazamata nehézség: a kártyái ellen vesztes ütközetek átlagos aránya
+    kazamata_osszesito = []
+    oszlop = 0
+    for kazamata, kartyak in kazamatak:
+        aranyok = []
+        for kartya in kartyak:
+            aranyok.append(oszlop_gyozelmek[oszlop] / kartyak_szama if kartyak_szama else 0)
+            oszlop += 1
+        legnehezebb = kartyak[aranyok.index(min(aranyok))]
+        kazamata_osszesito.append({
+            'id': kazamata.id,
+            'nev': kazamata.nev,
+            'tipus': kazamata.get_tipus_display(),
+            'nehezseg': round(100 * (1 - sum(aranyok) / len(aranyok)), 1),
+            'legnehezebb_kartya': legnehezebb.nev,
+        })
+    kazamata_osszesito.sort(key=lambda k: -k['nehezseg'])
+    
+    return {
+        'kartyak': kartya_osszesito,
+        'kazamatak': kazamata_osszesito,
+        'matrix': {
+            'sorok': [kartya_id for kartya_id, _, _, _, _ in vilag_kartyak],
+            'oszlopok': [(kartya.id, kazamata.id, kartya.nev) for kazamata, kartya in oszlopok],
+            'gyozelmek': sorok,
+        },
+        'kartyak_szama': kartyak_szama,
+        'oszlopok_szama': oszlopszam,
+        'szamitva': timezone.now(),
+        'ido_ms': round((time.perf_counter() - kezdes) * 1000, 1),
+    }
+
+
+def balansz_matrix():
+    """
+    A cache-elt balansz mátrix, számolás nélkül.
+    
+    Visszatérés: (balansz vagy None, elavult)
+    """
+    tarolt = cache.get_many([BALANSZ_CACHE_KULCS, BALANSZ_ELAVULT_KULCS])
+    balansz = tarolt.get(BALANSZ_CACHE_KULCS)
+    if balansz is None:
+        return None, True
+    elavult = (
+        BALANSZ_ELAVULT_KULCS in tarolt
+        or timezone.now() - balansz['szamitva'] > timedelta(seconds=BALANSZ_FRISSESSEG)
+    )
+    return balansz, elavult
+
+
+def balansz_frissites():
+    """Kiszámolja és cache-eli a mátrixot; a balance_matrix command hívja"""
+    # A jelzőt számolás előtt töröljük: a közben érkező szerkesztés újra beállítja
+    cache.delete(BALANSZ_ELAVULT_KULCS)
+    balansz = balansz_szamitas()
+    cache.set(BALANSZ_CACHE_KULCS, balansz, BALANSZ_CACHE_IDO)
+    return balansz
+
+
+def balansz_ervenytelenites():
+    """Kártya vagy kazamata változásakor hívja a signals.py; a mátrix a következő számolásig látszik"""
+    cache.set(BALANSZ_ELAVULT_KULCS, True, None)
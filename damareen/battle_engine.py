@@ -0,0 +1,206 @@
+"""
+Damareen harc motor
+
+Adatbázistól független, tiszta Python kiértékelés. A HTTP és a WebSocket
+harc is ezt hívja: a kártyákat egyszer betöltjük HarcKartya objektumokba,
+a motor lefuttatja a harcot, a mentés pedig utána, külön történik.
+"""
+from .models import (
+    ELEMENT_FIRE, ELEMENT_EARTH, ELEMENT_WATER, ELEMENT_AIR, ELEMENT_CHOICES,
+    ELEMENT_NEVEK, UtkozetOk, utkozet_ok_szoveg
+)
+
+
+# Tűz > Föld > Víz > Levegő > Tűz
+ELEM_GYOZELMEK = {
+    ELEMENT_FIRE: ELEMENT_EARTH,      # Tűz > Föld
+    ELEMENT_EARTH: ELEMENT_WATER,     # Föld > Víz
+    ELEMENT_WATER: ELEMENT_AIR,       # Víz > Levegő
+    ELEMENT_AIR: ELEMENT_FIRE,        # Levegő > Tűz
+}
+
+
+def elem_legyozi(elem1, elem2):
+    """
+    Meghatározza, hogy elem1 legyőzi-e elem2-t.
+    Tűz > Föld > Víz > Levegő > Tűz
+    """
+    return ELEM_GYOZELMEK.get(elem1) == elem2
+
+
+def utközet_ertekeles(jatekos_sebzes, jatekos_eletero, jatekos_tipus,
+                       kazamata_sebzes, kazamata_eletero, kazamata_tipus):
+    """
+    Kiértékel egy ütközetet és visszaadja, hogy a játékos nyert-e, és miért.
+    
+    Az ok egy UtkozetOk kód; a szöveget csak megjelenítéskor állítjuk elő
+    az utkozet_ok_szoveg() segítségével ugyanezekből a számokból.
+    
+    Visszatérés: (jatekos_nyert: bool, ok: UtkozetOk)
+    """
+    
+    # 1. szabály: Sebzés vs életerő
+    jatekos_sebez = jatekos_sebzes > kazamata_eletero
+    kazamata_sebez = kazamata_sebzes > jatekos_eletero
+    
+    if jatekos_sebez and not kazamata_sebez:
+        return True, UtkozetOk.SEBZES_GYOZELEM
+    
+    if kazamata_sebez and not jatekos_sebez:
+        return False, UtkozetOk.SEBZES_VERESEG
+    
+    # 2. szabály: Típus alapján
+    if elem_legyozi(jatekos_tipus, kazamata_tipus):
+        return True, UtkozetOk.TIPUS_ELONY
+    
+    if elem_legyozi(kazamata_tipus, jatekos_tipus):
+        return False, UtkozetOk.TIPUS_HATRANY
+    
+    # 3. szabály: Ha nincs egyértelmű győztes, a kazamata nyer
+    return False, UtkozetOk.DONTETLEN
+
+
+# Előre kiszámolt típus kimenetelek a tömeges kiértékeléshez:
+# (játékos típus, kazamata típus) -> ok kód. Ami nincs benne, az döntetlen.
+def _tipus_kimenet_tabla():
+    tabla = {}
+    for elem1, _ in ELEMENT_CHOICES:
+        for elem2, _ in ELEMENT_CHOICES:
+            if elem_legyozi(elem1, elem2):
+                tabla[(elem1, elem2)] = int(UtkozetOk.TIPUS_ELONY)
+            elif elem_legyozi(elem2, elem1):
+                tabla[(elem1, elem2)] = int(UtkozetOk.TIPUS_HATRANY)
+    return tabla
+
+
+_TIPUS_KIMENET = _tipus_kimenet_tabla()
+
+# Ok kód -> játékos nyert-e (a kód az index)
+_OK_NYERT = [False] * (max(UtkozetOk.values) + 1)
+_OK_NYERT[UtkozetOk.SEBZES_GYOZELEM] = True
+_OK_NYERT[UtkozetOk.TIPUS_ELONY] = True
+
+
+def tomeges_utközet_ertekeles(jatekos_sebzesek, jatekos_eleterok, jatekos_tipusok,
+                               kazamata_sebzesek, kazamata_eleterok, kazamata_tipusok):
+    """
+    Sok ütközet kiértékelése egyszerre, oszlopos bemenetből.
+    
+    Ugyanazt adja, mint az utközet_ertekeles() soronként, de szöveg és
+    átmeneti objektumok nélkül, így szimulációkhoz és balansz elemzéshez
+    is elég gyors. A referencia továbbra is az utközet_ertekeles().
+    
+    Args:
+        jatekos_sebzesek, jatekos_eleterok, jatekos_tipusok: a játékos oszlopai
+        kazamata_sebzesek, kazamata_eleterok, kazamata_tipusok: a kazamata oszlopai
+    
+    Visszatérés: (jatekos_nyert: list[bool], okok: list[int]) - az okok UtkozetOk kódok
+    """
+    hossz = len(jatekos_sebzesek)
+    oszlopok = (jatekos_eleterok, jatekos_tipusok,
+                kazamata_sebzesek, kazamata_eleterok, kazamata_tipusok)
+    if any(len(oszlop) != hossz for oszlop in oszlopok):
+        raise ValueError("Az oszlopok hossza nem egyezik!")
+    
+    sebzes_gyozelem = int(UtkozetOk.SEBZES_GYOZELEM)
+    sebzes_vereseg = int(UtkozetOk.SEBZES_VERESEG)
+    dontetlen = int(UtkozetOk.DONTETLEN)
+    tipus_kimenet = _TIPUS_KIMENET.get
+    
+    okok = []
+    hozzaad = okok.append
+    for j_sebzes, j_eletero, j_tipus, k_sebzes, k_eletero, k_tipus in zip(
+            jatekos_sebzesek, jatekos_eleterok, jatekos_tipusok,
+            kazamata_sebzesek, kazamata_eleterok, kazamata_tipusok):
+        jatekos_sebez = j_sebzes > k_eletero
+        if jatekos_sebez != (k_sebzes > j_eletero):
+            hozzaad(sebzes_gyozelem if jatekos_sebez else sebzes_vereseg)
+        else:
+            hozzaad(tipus_kimenet((j_tipus, k_tipus), dontetlen))
+    
+    ok_nyert = _OK_NYERT
+    return [ok_nyert[ok] for ok in okok], okok
+
+
+def szukseges_gyozelmek(kartyak_szama):
+    """A győzelemhez szükséges nyert ütközetek száma (kerekítés felfelé)"""
+    return (kartyak_szama + 1) // 2
+
+
+class HarcKartya:
+    """Egy kártya harc közbeni, már kiszámolt értékei"""
+    __slots__ = ('id', 'nev', 'sebzes', 'eletero', 'tipus', 'vezer')
+    
+    def __init__(self, id, nev, sebzes, eletero, tipus, vezer=False):
+        self.id = id
+        self.nev = nev
+        self.sebzes = sebzes
+        self.eletero = eletero
+        self.tipus = tipus
+        self.vezer = vezer
+    
+    def __repr__(self):
+        return f"HarcKartya({self.nev}, S:{self.sebzes}, É:{self.eletero}, {self.tipus})"
+    
+    @property
+    def tipus_nev(self):
+        return ELEMENT_NEVEK.get(self.tipus, '')
+
+
+class UtkozetEredmeny:
+    """Egy ütközet kimenetele"""
+    __slots__ = ('sorrend', 'jatekos', 'kazamata', 'jatekos_nyert', 'ok')
+    
+    def __init__(self, sorrend, jatekos, kazamata, jatekos_nyert, ok):
+        self.sorrend = sorrend
+        self.jatekos = jatekos
+        self.kazamata = kazamata
+        self.jatekos_nyert = jatekos_nyert
+        self.ok = ok
+    
+    @property
+    def ok_szoveg(self):
+        return utkozet_ok_szoveg(
+            self.ok,
+            self.jatekos.sebzes, self.jatekos.eletero, self.jatekos.tipus,
+            self.kazamata.sebzes, self.kazamata.eletero, self.kazamata.tipus
+        )
+
+
+class HarcEredmeny:
+    """Egy teljes harc kimenetele"""
+    __slots__ = ('utkozetek', 'jatekos_gyozelmek', 'jatekos_gyozott')
+    
+    def __init__(self, utkozetek, jatekos_gyozelmek, jatekos_gyozott):
+        self.utkozetek = utkozetek
+        self.jatekos_gyozelmek = jatekos_gyozelmek
+        self.jatekos_gyozott = jatekos_gyozott
+
+
+def harc_lefuttatasa(pakli_kartyak, kazamata_kartyak):
+    """
+    Lefuttat egy harcot adatbázis nélkül.
+    
+    Args:
+        pakli_kartyak: HarcKartya lista a pakli sorrendjében
+        kazamata_kartyak: HarcKartya lista a kazamata sorrendjében
+    
+    Visszatérés: HarcEredmeny
+    """
+    if len(pakli_kartyak) != len(kazamata_kartyak):
+        raise ValueError("A pakli és a kazamata kártyáinak száma nem egyezik!")
+    
+    utkozetek = []
+    jatekos_gyozelmek = 0
+    
+    for i, (jatekos_k, kazamata_k) in enumerate(zip(pakli_kartyak, kazamata_kartyak)):
+        jatekos_nyert, ok = utközet_ertekeles(
+            jatekos_k.sebzes, jatekos_k.eletero, jatekos_k.tipus,
+            kazamata_k.sebzes, kazamata_k.eletero, kazamata_k.tipus
+        )
+        if jatekos_nyert:
+            jatekos_gyozelmek += 1
+        utkozetek.append(UtkozetEredmeny(i + 1, jatekos_k, kazamata_k, jatekos_nyert, ok))
+    
+    jatekos_gyozott = jatekos_gyozelmek >= szukseges_gyozelmek(len(kazamata_kartyak))
+    return HarcEredmeny(utkozetek, jatekos_gyozelmek, jatekos_gyozott)
@@ -0,0 +1,171 @@
+"""
+Harc utáni feldolgozás
+
+Egy befejezett harc rangsor, sorozat és achievement hatását nem a harc
+lezárása számolja ki: a lezárás ugyanabban a tranzakcióban csak egy
+HarcEsemeny sort ír (outbox), így a harc vége üzenet a könyvelésre várás
+nélkül mehet ki, és újraindításkor sem vész el semmi.
+
+Az eseményeket egy feldolgozó írja ki: az ébresztés után
+FELDOLGOZASI_IDOKOZ-ig gyűjt, majd játékosonként egyetlen
+frissit_rangsort_tomegesen hívással (egy profil UPDATE, egy achievement kör)
+dolgozza fel a felgyűlt eseményeket. Az ASGI processzekben a BattleConsumer
+indít egy asyncio feldolgozót; minden más esemény (pl. WSGI alatt az HTTP
+API-ból) a dedikált feldolgozóra vár:
+
+    python manage.py process_battle_events --folyamatos
+
+A kérés maga sosem könyvel: a commit legfeljebb felébreszti a processz
+feldolgozóját.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+
+from channels.db import database_sync_to_async
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import game_logic
+from .models import HarcEsemeny
+
+logger = logging.getLogger(__name__)
+
+# Ennyi ideig gyűlnek az ébresztés után érkező események egy körbe (másodperc)
+FELDOLGOZASI_IDOKOZ = 1.0
+
+# Ébresztés nélkül is ilyen gyakran néz rá a táblára (pl. másik processz eseményei)
+ELLENORZESI_IDOKOZ = 30.0
+
+# Egy körben legfeljebb ennyi esemény
+DARAB = 500
+
+# (event loop, ébresztő asyncio.Event, task), amíg a feldolgozó fut
+_feldolgozo = None
+
+
+def esemenyek_felvetele(esemenyek):
+    """
+    Befejezett harcok eseményeinek felvétele a hívó tranzakciójában.
+
+    Args:
+        esemenyek: Mentetlen HarcEsemeny lista
+    """
+    HarcEsemeny.objects.bulk_create(esemenyek)
+    transaction.on_commit(ebresztes)
+
+
+def feldolgozas(darab=DARAB):
+    """
+    A legrégebbi események feldolgozása, játékosonként összevonva.
+
+    Játékosonként egy rövid tranzakció: az események törlése egyben a
+    lefoglalásuk, így amit közben egy másik processz feldolgozott, azt nem
+    számoljuk újra.
+
+    Visszatérés: a feldolgozott események száma
+    """
+    esemenyek = list(
+        HarcEsemeny.objects.order_by('id').values_list(
+            'id', 'jatekos_id', 'jatekos_gyozott', 'metrikak', 'harc__inditas'
+        )[:darab]
+    )
+    jatekosonkent = {}
+    for esemeny in esemenyek:
+        jatekosonkent.setdefault(esemeny[1], []).append(esemeny)
+    jatekosok = User.objects.in_bulk(jatekosonkent)
+
+    feldolgozott = 0
+    for jatekos_id, sajat in jatekosonkent.items():
+        ids = [esemeny[0] for esemeny in sajat]
+        try:
+            with transaction.atomic():
+                torolt, _ = HarcEsemeny.objects.filter(id__in=ids).delete()
+                if torolt != len(ids):
+                    transaction.set_rollback(True)
+                    continue
+                game_logic.frissit_rangsort_tomegesen(
+                    jatekosok[jatekos_id],
+                    [esemeny[2] for esemeny in sajat],
+                    sum((Counter(esemeny[3]) for esemeny in sajat), Counter()),
+                    [esemeny[4] for esemeny in sajat],
+                )
+            feldolgozott += len(ids)
+        except Exception:
+            # A játékos eseményei a táblában maradnak, a következő kör újrapróbálja
+            logger.exception("Harc események feldolgozása sikertelen (user id: %s)", jatekos_id)
+
+    return feldolgozott
+
+
+def kiurites():
+    """
+    A várakozó események feldolgozása, amíg teli körök sikerülnek.
+
+    Visszatérés: a feldolgozott események száma
+    """
+    osszes = 0
+    while True:
+        db = feldolgozas(DARAB)
+        osszes += db
+        # Hibás események mellett nem pörög: azokat a következő kör próbálja újra
+        if db < DARAB:
+            return osszes
+
+
+def folyamatos_kiurites(idokoz=FELDOLGOZASI_IDOKOZ, korok=None):
+    """
+    A dedikált feldolgozó: kiürítés idokoz másodpercenként.
+
+    Args:
+        idokoz: A körök közötti szünet (másodperc)
+        korok: Legfeljebb ennyi kör, None esetén a leállításig
+    """
+    kor = 0
+    while korok is None or kor < korok:
+        try:
+            kiurites()
+        except Exception:
+            logger.exception("Harc események feldolgozása sikertelen")
+        kor += 1
+        time.sleep(idokoz)
+
+
+def inditas():
+    """A feldolgozó elindítása a futó event loop-on, ha ott még nem fut"""
+    global _feldolgozo
+    loop = asyncio.get_running_loop()
+    if _feldolgozo is not None and _feldolgozo[0] is loop and not _feldolgozo[2].done():
+        return
+    ebreszto = asyncio.Event()
+    # Induláskor a korábban (pl. újraindítás előtt) felgyűlt események jönnek
+    ebreszto.set()
+    _feldolgozo = (loop, ebreszto, loop.create_task(_futtatas(ebreszto)))
+
+
+def ebresztes():
+    """
+    Jelzés a processz feldolgozójának, ha fut ilyen.
+
+    Különben az események a táblában várnak a dedikált feldolgozóra (vagy egy
+    másik processz feldolgozójára), a kérés nem dolgozza fel őket.
+    """
+    feldolgozo = _feldolgozo
+    if feldolgozo is not None and not feldolgozo[2].done() and not feldolgozo[0].is_closed():
+        feldolgozo[0].call_soon_threadsafe(feldolgozo[1].set)
+
+
+async def _futtatas(ebreszto):
+    while True:
+        try:
+            await asyncio.wait_for(ebreszto.wait(), ELLENORZESI_IDOKOZ)
+        except asyncio.TimeoutError:
+            pass
+        # Az ablak alatt érkező események ugyanebbe a körbe kerülnek
+        await asyncio.sleep(FELDOLGOZASI_IDOKOZ)
+        ebreszto.clear()
+        try:
+            await database_sync_to_async(kiurites)()
+        except Exception:
+            logger.exception("Harc események feldolgozása sikertelen")
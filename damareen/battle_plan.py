@@ -0,0 +1,194 @@
+"""
+Kazamata harc tervek
+
+Egy kazamata "terve" a kártyái sorrendben, már kiszámolt értékekkel:
+(id, név, sebzés, életerő, típus, vezér) HarcKartya-k változtathatatlan
+tuple-je. A terveket processzen belül tartjuk, egy verzió bélyeggel együtt
+(lásd belyegek.py), így egy harc sem a tervért, sem a bélyegért nem kérdez le.
+A léptetést a signals.py végzi, amikor egy kazamata, kazamata kártya,
+vezérkártya vagy világkártya megváltozik.
+
+A harc determinisztikus, így a kimenetele is cache-elhető: kulcsa a pakli
+(sebzés, életerő, típus) sorozata és a kazamata verziója. A tárolt kimenetel
+ütközetenként (nyert, ok), LRU szerint kiszorítva; a régi verziók kulcsait
+többé senki nem kéri, így azok maguktól kikopnak.
+"""
+import threading
+from collections import OrderedDict
+
+from . import belyegek
+from .battle_engine import HarcKartya, UtkozetEredmeny, HarcEredmeny, harc_lefuttatasa
+from .models import KazamataKartya
+
+# kazamata id -> (verzió, terv)
+_TERVEK = {}
+
+EREDMENY_CACHE_MERET = 4096
+
+# (pakli statok, kazamata id, verzió) -> ((nyert, ok), ...), jatekos_gyozelmek, jatekos_gyozott
+_EREDMENYEK = OrderedDict()
+_eredmeny_zar = threading.Lock()
+_eredmeny_stat = {'talalat': 0, 'hiany': 0}
+
+
+def _verzio_kulcs(kazamata_id):
+    return f'damareen:kazamata_verzio:{kazamata_id}'
+
+
+def kazamata_verzio(kazamata_id):
+    """A kazamata aktuális verzió bélyege"""
+    return belyegek.belyeg(_verzio_kulcs(kazamata_id))
+
+
+def kazamata_terv(kazamata_id):
+    """
+    A kazamata kártyái sorrendben, HarcKartya-k tuple-jeként.
+    
+    Csak akkor kérdez le, ha a terv még nincs meg ebben a processzben,
+    vagy a verziója azóta megváltozott.
+    """
+    return _verzios_terv(kazamata_id)[1]
+
+
+def _harc_kartya(kk):
+    return HarcKartya(kk.id, kk.kartya.nev, kk.get_sebzes(), kk.get_eletero(), kk.get_tipus(), kk.is_vezer)
+
+
+def _kazamata_kartyak():
+    return KazamataKartya.objects.select_related('vilag_kartya', 'vezer_kartya__eredeti_kartya')
+
+
+def _verzios_terv(kazamata_id):
+    verzio = kazamata_verzio(kazamata_id)
+    tarolt = _TERVEK.get(kazamata_id)
+    if tarolt is not None and tarolt[0] == verzio:
+        return tarolt
+    
+    terv = tuple(
+        _harc_kartya(kk)
+        for kk in _kazamata_kartyak().filter(kazamata_id=kazamata_id).order_by('sorrend')
+    )
+    _TERVEK[kazamata_id] = (verzio, terv)
+    return verzio, terv
+
+
+def kazamata_tervek(kazamata_ids):
+    """
+    Több kazamata terve egyszerre.
+    
+    A verziók legfeljebb egy cache olvasással jönnek, a hiányzó vagy elavult
+    tervek pedig egyetlen lekérdezéssel töltődnek be.
+    
+    Visszatérés: dict kazamata id -> (verzió, terv)
+    """
+    kazamata_ids = list(kazamata_ids)
+    verziok = belyegek.belyegek([_verzio_kulcs(kazamata_id) for kazamata_id in kazamata_ids])
+    
+    tervek = {}
+    hianyzo = {}
+    for kazamata_id in kazamata_ids:
+        verzio = verziok[_verzio_kulcs(kazamata_id)]
+        tarolt = _TERVEK.get(kazamata_id)
+        if tarolt is not None and tarolt[0] == verzio:
+            tervek[kazamata_id] = tarolt
+        else:
+            hianyzo[kazamata_id] = verzio
+    
+    if hianyzo:
+        kartyak = {kazamata_id: [] for kazamata_id in hianyzo}
+        for kk in _kazamata_kartyak().filter(kazamata_id__in=hianyzo).order_by('kazamata_id', 'sorrend'):
+            kartyak[kk.kazamata_id].append(_harc_kartya(kk))
+        for kazamata_id, verzio in hianyzo.items():
+            _TERVEK[kazamata_id] = tervek[kazamata_id] = (verzio, tuple(kartyak[kazamata_id]))
+    
+    return tervek
+
+
+def kazamata_harc(pakli_kartyak, kazamata_id):
+    """
+    Lefuttatja a harcot a pakli és a kazamata aktuális terve között.
+    
+    Ugyanazokkal a pakli értékekkel és kazamata verzióval a kimenetel a
+    cache-ből jön, csak az eredmény objektumok épülnek fel újra a hívó
+    kártyáival.
+    
+    Visszatérés: HarcEredmeny
+    """
+    verzio, kazamata_kartyak = _verzios_terv(kazamata_id)
+    return _harc_eredmeny(pakli_kartyak, kazamata_id, verzio, kazamata_kartyak)
+
+
+def pakli_kimenetek(pakli_kartyak, kazamata_ids):
+    """
+    A pakli harca több kazamata ellen egy menetben.
+    
+    A tervek együtt töltődnek be, a kimenetelek a harc eredmény cache-ből
+    jönnek, így csak a megváltozott paklira vagy kazamatára számolódnak
+    újra. A pakliéval nem egyező méretű (vagy félkész) kazamatákat kihagyja.
+    
+    Visszatérés: dict kazamata id -> HarcEredmeny
+    """
+    return {
+        kazamata_id: _harc_eredmeny(pakli_kartyak, kazamata_id, verzio, kazamata_kartyak)
+        for kazamata_id, (verzio, kazamata_kartyak) in kazamata_tervek(kazamata_ids).items()
+        if len(kazamata_kartyak) == len(pakli_kartyak)
+    }
+
+
+def _harc_eredmeny(pakli_kartyak, kazamata_id, verzio, kazamata_kartyak):
+    kulcs = (
+        tuple((k.sebzes, k.eletero, k.tipus) for k in pakli_kartyak),
+        kazamata_id,
+        verzio
+    )
+    
+    with _eredmeny_zar:
+        tarolt = _EREDMENYEK.get(kulcs)
+        if tarolt is not None:
+            _EREDMENYEK.move_to_end(kulcs)
+            _eredmeny_stat['talalat'] += 1
+        else:
+            _eredmeny_stat['hiany'] += 1
+    
+    if tarolt is None:
+        eredmeny = harc_lefuttatasa(pakli_kartyak, kazamata_kartyak)
+        with _eredmeny_zar:
+            _EREDMENYEK[kulcs] = (
+                tuple((u.jatekos_nyert, u.ok) for u in eredmeny.utkozetek),
+                eredmeny.jatekos_gyozelmek,
+                eredmeny.jatekos_gyozott
+            )
+            while len(_EREDMENYEK) > EREDMENY_CACHE_MERET:
+                _EREDMENYEK.popitem(last=False)
+        return eredmeny
+    
+    kimenetek, jatekos_gyozelmek, jatekos_gyozott = tarolt
+    utkozetek = [
+        UtkozetEredmeny(i + 1, jatekos_k, kazamata_k, nyert, ok)
+        for i, (jatekos_k, kazamata_k, (nyert, ok))
+        in enumerate(zip(pakli_kartyak, kazamata_kartyak, kimenetek))
+    ]
+    return HarcEredmeny(utkozetek, jatekos_gyozelmek, jatekos_gyozott)
+
+
+def harc_cache_statisztika():
+    """A harc eredmény cache találatai ebben a processzben"""
+    with _eredmeny_zar:
+        talalat, hiany = _eredmeny_stat['talalat'], _eredmeny_stat['hiany']
+        meret = len(_EREDMENYEK)
+    osszes = talalat + hiany
+    return {
+        'talalat': talalat,
+        'hiany': hiany,
+        'arany': round(talalat / osszes * 100, 1) if osszes else 0,
+        'meret': meret,
+        'kapacitas': EREDMENY_CACHE_MERET,
+    }
+
+
+def kazamata_terv_ervenytelenites(kazamata_ids):
+    """Új verziót ad a kazamatáknak, így minden processz újratölti a tervüket"""
+    kazamata_ids = set(kazamata_ids)
+    belyegek.leptetes([_verzio_kulcs(kazamata_id) for kazamata_id in kazamata_ids])
+    for kazamata_id in kazamata_ids:
+        _TERVEK.pop(kazamata_id, None)
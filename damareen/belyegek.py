@@ -0,0 +1,77 @@
+"""
+Verzió bélyegek
+
+A processzen belül tartott adatok (kazamata tervek, achievement katalógus)
+egy véletlen verzió bélyeggel érvényesek. A bélyeg a közös cache-ben él
+(settings.CACHES), így egy processz léptetését a többi is látja; ha a cache
+kiürül, az új véletlen bélyeg a régi adattal sem egyezhet.
+
+Olvasáskor a processz a bélyeg helyi másolatát használja ELETTARTAM-ig, így
+egy harc nem jár cache lekérdezéssel. A léptető processz az új bélyeget
+azonnal látja, a többi legfeljebb ELETTARTAM késéssel.
+"""
+import time
+import uuid
+
+from django.core.cache import cache
+
+# A bélyeg helyi másolata legfeljebb ennyi ideig érvényes (másodperc)
+ELETTARTAM = 2.0
+
+# cache kulcs -> (bélyeg, kiolvasás ideje time.monotonic szerint)
+_helyi = {}
+
+
+def _uj():
+    return uuid.uuid4().hex
+
+
+def belyeg(kulcs):
+    """A kulcs aktuális bélyege"""
+    return belyegek([kulcs])[kulcs]
+
+
+def belyegek(kulcsok):
+    """
+    Több bélyeg egyszerre: a helyben elavultak egy cache olvasással jönnek.
+
+    Visszatérés: dict kulcs -> bélyeg
+    """
+    most = time.monotonic()
+    eredmeny = {}
+    elavult = []
+    for kulcs in kulcsok:
+        tarolt = _helyi.get(kulcs)
+        if tarolt is not None and most - tarolt[1] < ELETTARTAM:
+            eredmeny[kulcs] = tarolt[0]
+        else:
+            elavult.append(kulcs)
+
+    if elavult:
+        kozos = cache.get_many(elavult)
+        for kulcs in elavult:
+            verzio = kozos.get(kulcs)
+            if verzio is None:
+                # Még nincs bélyeg: az első processz írja be, a többi azt olvassa vissza
+                verzio = _uj()
+                if not cache.add(kulcs, verzio, None):
+                    verzio = cache.get(kulcs)
+            _helyi[kulcs] = (verzio, most)
+            eredmeny[kulcs] = verzio
+    return eredmeny
+
+
+def leptetes(kulcsok):
+    """Új bélyeg a kulcsoknak; ez a processz azonnal, a többi ELETTARTAM-on belül látja"""
+    uj = {kulcs: _uj() for kulcs in kulcsok}
+    if not uj:
+        return
+    cache.set_many(uj, None)
+    most = time.monotonic()
+    for kulcs, verzio in uj.items():
+        _helyi[kulcs] = (verzio, most)
+
+
+def helyi_torles():
+    """A helyi másolatok eldobása: a következő olvasás a közös cache-ből jön"""
+    _helyi.clear()
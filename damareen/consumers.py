@@ -1,326 +1,450 @@
-"""
-WebSocket consumers for real-time battle functionality
-"""
-import json
-import asyncio
-from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
-from django.contrib.auth.models import User
-
-from .models import (
-    Jatek, Harc, Utközet, Kazamata, Pakli, PakliKartya, Jatekoskartya,
-    ELEMENT_FIRE, ELEMENT_EARTH, ELEMENT_WATER, ELEMENT_AIR
-)
-from .game_logic import utközet_ertekeles
-
-
-class BattleConsumer(AsyncWebsocketConsumer):
-    """
-    WebSocket consumer for real-time battle animations and interactions
-    """
-    
-    async def connect(self):
-        """Handle WebSocket connection"""
-        self.user = self.scope["user"]
-        
-        if not self.user.is_authenticated:
-            await self.close()
-            return
-        
-        self.jatek_id = self.scope['url_route']['kwargs']['jatek_id']
-        self.kazamata_id = self.scope['url_route']['kwargs']['kazamata_id']
-        
-        # Create a unique room name for this battle
-        self.room_name = f'battle_{self.jatek_id}_{self.kazamata_id}'
-        self.room_group_name = f'battle_{self.room_name}'
-        
-        # Join room group
-        await self.channel_layer.group_add(
-            self.room_group_name,
-            self.channel_name
-        )
-        
-        await self.accept()
-        
-        # Send initial connection message
-        await self.send(text_data=json.dumps({
-            'type': 'connection',
-            'message': '✅ Kapcsolat létrejött! Kattints a HARC INDÍTÁSA gombra!'
-        }))
-    
-    async def disconnect(self, close_code):
-        """Handle WebSocket disconnection"""
-        # Leave room group
-        if hasattr(self, 'room_group_name'):
-            await self.channel_layer.group_discard(
-                self.room_group_name,
-                self.channel_name
-            )
-    
-    async def receive(self, text_data):
-        """Handle messages from WebSocket"""
-        data = json.loads(text_data)
-        action = data.get('action')
-        
-        if action == 'start_battle':
-            await self.start_battle()
-        elif action == 'auto_save':
-            await self.auto_save_game()
-    
-    async def start_battle(self):
-        """Start the battle and execute it step by step with animations"""
-        try:
-            # Verify game and kazamata
-            battle_data = await self.verify_and_create_battle()
-            
-            if 'error' in battle_data:
-                await self.send(text_data=json.dumps({
-                    'type': 'error',
-                    'message': battle_data['error']
-                }))
-                return
-            
-            harc = battle_data['harc']
-            pakli_kartyak = battle_data['pakli_kartyak']
-            kazamata_kartyak = battle_data['kazamata_kartyak']
-            
-            # Send battle start message
-            await self.send(text_data=json.dumps({
-                'type': 'battle_start',
-                'message': f'🏰 Harc kezdődik: {battle_data["kazamata_nev"]}!',
-                'total_rounds': len(pakli_kartyak)
-            }))
-            
-            await asyncio.sleep(1.5)
-            
-            # Execute each round
-            utközetek = []
-            jatekos_gyozelmek = 0
-            
-            for i, (pakli_kartya, kazamata_kartya) in enumerate(zip(pakli_kartyak, kazamata_kartyak)):
-                round_num = i + 1
-                
-                # Send round start
-                await self.send(text_data=json.dumps({
-                    'type': 'round_start',
-                    'round': round_num,
-                    'message': f'⚔️ {round_num}. ütközet kezdődik...'
-                }))
-                
-                await asyncio.sleep(1)
-                
-                # Send player card reveal
-                await self.send(text_data=json.dumps({
-                    'type': 'card_reveal',
-                    'side': 'player',
-                    'round': round_num,
-                    'card': {
-                        'name': pakli_kartya['name'],
-                        'damage': pakli_kartya['damage'],
-                        'hp': pakli_kartya['hp'],
-                        'element': pakli_kartya['element'],
-                        'element_display': pakli_kartya['element_display']
-                    }
-                }))
-                
-                await asyncio.sleep(1.2)
-                
-                # Send enemy card reveal
-                await self.send(text_data=json.dumps({
-                    'type': 'card_reveal',
-                    'side': 'enemy',
-                    'round': round_num,
-                    'card': {
-                        'name': kazamata_kartya['name'],
-                        'damage': kazamata_kartya['damage'],
-                        'hp': kazamata_kartya['hp'],
-                        'element': kazamata_kartya['element'],
-                        'element_display': kazamata_kartya['element_display'],
-                        'is_leader': kazamata_kartya['is_leader']
-                    }
-                }))
-                
-                await asyncio.sleep(1.2)
-                
-                # Calculate battle result
-                jatekos_nyert, ok = utközet_ertekeles(
-                    pakli_kartya['damage'], pakli_kartya['hp'], pakli_kartya['element'],
-                    kazamata_kartya['damage'], kazamata_kartya['hp'], kazamata_kartya['element']
-                )
-                
-                if jatekos_nyert:
-                    jatekos_gyozelmek += 1
-                
-                # Save battle round to database
-                utközet_data = await self.save_utközet(
-                    harc['id'], round_num, pakli_kartya, kazamata_kartya,
-                    jatekos_nyert, ok
-                )
-                utközetek.append(utközet_data)
-                
-                # Send battle animation
-                await self.send(text_data=json.dumps({
-                    'type': 'battle_animation',
-                    'round': round_num,
-                    'winner': 'player' if jatekos_nyert else 'enemy',
-                    'player_element': pakli_kartya['element'],
-                    'enemy_element': kazamata_kartya['element']
-                }))
-                
-                await asyncio.sleep(1.5)
-                
-                # Send round result
-                await self.send(text_data=json.dumps({
-                    'type': 'round_result',
-                    'round': round_num,
-                    'winner': 'player' if jatekos_nyert else 'enemy',
-                    'reason': ok,
-                    'player_wins': jatekos_gyozelmek
-                }))
-                
-                await asyncio.sleep(1.8)
-            
-            # Determine overall winner
-            szukseges_gyozelmek = (len(kazamata_kartyak) + 1) // 2
-            jatekos_gyozott = jatekos_gyozelmek >= szukseges_gyozelmek
-            
-            # Update battle in database
-            await self.complete_battle(harc['id'], jatekos_gyozott)
-            
-            # Auto-save after battle
-            await self.auto_save_game()
-            
-            # Send final result
-            await self.send(text_data=json.dumps({
-                'type': 'battle_end',
-                'winner': 'player' if jatekos_gyozott else 'enemy',
-                'player_wins': jatekos_gyozelmek,
-                'total_rounds': len(pakli_kartyak),
-                'message': '🎉 GYŐZELEM! 🎉' if jatekos_gyozott else '😞 VERESÉG 😞',
-                'harc_id': harc['id'],
-                'reward': battle_data['reward'] if jatekos_gyozott else None
-            }))
-            
-        except Exception as e:
-            await self.send(text_data=json.dumps({
-                'type': 'error',
-                'message': f'❌ Hiba történt: {str(e)}'
-            }))
-    
-    @database_sync_to_async
-    def verify_and_create_battle(self):
-        """Verify game state and create battle record"""
-        try:
-            jatek = Jatek.objects.get(id=self.jatek_id, jatekos=self.user)
-            kazamata = Kazamata.objects.get(id=self.kazamata_id)
-            
-            # Check if pakli exists
-            try:
-                pakli = jatek.pakli
-            except Pakli.DoesNotExist:
-                return {'error': '❌ Először állíts össze egy paklit!'}
-            
-            # Check card count match
-            pakli_meret = pakli.get_kartyak_szama()
-            kazamata_meret = kazamata.get_kartyak_szama()
-            
-            if pakli_meret != kazamata_meret:
-                return {'error': f'❌ A pakli ({pakli_meret}) és kazamata ({kazamata_meret}) kártyáinak száma nem egyezik!'}
-            
-            # Create battle
-            harc = Harc.objects.create(
-                jatek=jatek,
-                kazamata=kazamata
-            )
-            
-            # Get cards
-            pakli_kartyak = []
-            for pk in pakli.kartyak.all().order_by('sorrend'):
-                pakli_kartyak.append({
-                    'id': pk.kartya.id,
-                    'name': pk.kartya.eredeti_kartya.nev,
-                    'damage': pk.kartya.aktualis_sebzes,
-                    'hp': pk.kartya.aktualis_eletero,
-                    'element': pk.kartya.tipus,
-                    'element_display': pk.kartya.get_tipus_display()
-                })
-            
-            kazamata_kartyak = []
-            for kk in kazamata.kartyak.all().order_by('sorrend'):
-                kazamata_kartyak.append({
-                    'id': kk.id,
-                    'name': kk.kartya.nev,
-                    'damage': kk.get_sebzes(),
-                    'hp': kk.get_eletero(),
-                    'element': kk.get_tipus(),
-                    'element_display': dict([(ELEMENT_FIRE, 'Tűz'), (ELEMENT_EARTH, 'Föld'), 
-                                           (ELEMENT_WATER, 'Víz'), (ELEMENT_AIR, 'Levegő')]).get(kk.get_tipus(), ''),
-                    'is_leader': kk.is_vezer
-                })
-            
-            return {
-                'harc': {'id': harc.id},
-                'pakli_kartyak': pakli_kartyak,
-                'kazamata_kartyak': kazamata_kartyak,
-                'kazamata_nev': kazamata.nev,
-                'reward': kazamata.get_nyeremeny_leiras()
-            }
-            
-        except Jatek.DoesNotExist:
-            return {'error': '❌ Játék nem található!'}
-        except Kazamata.DoesNotExist:
-            return {'error': '❌ Kazamata nem található!'}
-    
-    @database_sync_to_async
-    def save_utközet(self, harc_id, sorrend, pakli_kartya, kazamata_kartya, jatekos_nyert, ok):
-        """Save battle round to database"""
-        harc = Harc.objects.get(id=harc_id)
-        jatekos_k = Jatekoskartya.objects.get(id=pakli_kartya['id'])
-        
-        # Get kazamata kartya reference
-        from .models import KazamataKartya
-        kazamata_kartya_ref = KazamataKartya.objects.get(id=kazamata_kartya['id'])
-        
-        utközet = Utközet.objects.create(
-            harc=harc,
-            sorrend=sorrend,
-            jatekos_kartya=jatekos_k,
-            jatekos_sebzes=pakli_kartya['damage'],
-            jatekos_eletero=pakli_kartya['hp'],
-            jatekos_tipus=pakli_kartya['element'],
-            kazamata_kartya_ref=kazamata_kartya_ref,
-            kazamata_sebzes=kazamata_kartya['damage'],
-            kazamata_eletero=kazamata_kartya['hp'],
-            kazamata_tipus=kazamata_kartya['element'],
-            jatekos_nyert=jatekos_nyert,
-            gyoztes_ok=ok
-        )
-        
-        return {'id': utközet.id}
-    
-    @database_sync_to_async
-    def complete_battle(self, harc_id, jatekos_gyozott):
-        """Mark battle as complete and update leaderboard"""
-        from .game_logic import frissit_rangsort
-        
-        harc = Harc.objects.get(id=harc_id)
-        harc.befejezve = True
-        harc.jatekos_gyozott = jatekos_gyozott
-        harc.save()
-        
-        # Rangsor és achievementek frissítése
-        if not harc.rangsor_frissitve:
-            frissit_rangsort(self.user, jatekos_gyozott)
-            harc.rangsor_frissitve = True
-            harc.save(update_fields=['rangsor_frissitve'])
-    
-    @database_sync_to_async
-    def auto_save_game(self):
-        """Auto-save game state"""
-        try:
-            jatek = Jatek.objects.get(id=self.jatek_id, jatekos=self.user)
-            # Save method automatically updates utolso_aktivitas
-            jatek.save()
-            return True
-        except:
-            return False
+"""
+WebSocket consumers for real-time battle functionality
+"""
+import json
+import asyncio
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import battle_events, leaderboard_index
+from .leaderboard_index import LEADERBOARD_GROUP
+from .models import Jatek, Harc, Utközet, Kazamata, Pakli
+from .battle_plan import kazamata_harc
+from .game_logic import harc_kartyak_betoltese, harc_eredmeny_metrikak, harc_elszamolasa, utkozet_rekord
+
+
+class BattleConsumer(AsyncWebsocketConsumer):
+    """
+    WebSocket consumer for real-time battle animations and interactions
+    """
+    
+    async def connect(self):
+        """Handle WebSocket connection"""
+        self.user = self.scope["user"]
+        
+        # The battle running on this connection (at most one) and its record
+        self.battle_task = None
+        self.harc_id = None
+        
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+        
+        # Post-battle bookkeeping runs on this event loop, see battle_events.py
+        battle_events.inditas()
+        
+        self.jatek_id = self.scope['url_route']['kwargs']['jatek_id']
+        self.kazamata_id = self.scope['url_route']['kwargs']['kazamata_id']
+        
+        # Create a unique room name for this battle
+        self.room_name = f'battle_{self.jatek_id}_{self.kazamata_id}'
+        self.room_group_name = f'battle_{self.room_name}'
+        
+        # Join room group
+        await self.channel_layer.group_add(
+            self.room_group_name,
+            self.channel_name
+        )
+        
+        await self.accept()
+        
+        # Send initial connection message
+        await self.send(text_data=json.dumps({
+            'type': 'connection',
+            'message': '✅ Kapcsolat létrejött! Kattints a HARC INDÍTÁSA gombra!'
+        }))
+    
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection"""
+        # Nobody is watching any more: stop animating and writing
+        battle_task = getattr(self, 'battle_task', None)
+        if battle_task is not None and not battle_task.done():
+            battle_task.cancel()
+            try:
+                await battle_task
+            except asyncio.CancelledError:
+                pass
+        
+        # A half battle is not kept: drop the unsaved rounds and the record,
+        # unless the result was already saved (then it is settled, once)
+        self.utkozet_puffer = []
+        if getattr(self, 'harc_id', None) is not None:
+            await self.discard_battle()
+        
+        # Leave room group
+        if hasattr(self, 'room_group_name'):
+            await self.channel_layer.group_discard(
+                self.room_group_name,
+                self.channel_name
+            )
+    
+    async def receive(self, text_data):
+        """Handle messages from WebSocket"""
+        data = json.loads(text_data)
+        action = data.get('action')
+        
+        if action == 'start_battle':
+            # Run the battle in the background so disconnects are handled
+            # while it is animating; one battle per connection at a time
+            if self.battle_task is not None and not self.battle_task.done():
+                await self.send(text_data=json.dumps({
+                    'type': 'error',
+                    'message': '❌ Már folyamatban van egy harc!'
+                }))
+                return
+            self.battle_task = asyncio.ensure_future(self.start_battle(data.get('mode')))
+        elif action == 'auto_save':
+            await self.auto_save_game()
+    
+    async def start_battle(self, mode=None):
+        """
+        Start the battle.
+        
+        By default the server animates it frame by frame with delays. In
+        'timeline' mode the whole battle is resolved and saved at once and
+        sent as one message with relative timestamps; the client plays it.
+        """
+        try:
+            # Verify game and kazamata
+            battle_data = await self.verify_and_create_battle()
+            
+            if 'error' in battle_data:
+                await self.send(text_data=json.dumps({
+                    'type': 'error',
+                    'message': battle_data['error']
+                }))
+                return
+            
+            # Write-behind: rounds are buffered while animating and written
+            # together with the result in flush_battle()
+            self.harc_metrikak = battle_data['metrikak']
+            self.utkozet_puffer = []
+            
+            # The outcome is computed up front by the shared engine,
+            # the rest only animates and persists it
+            eredmeny = battle_data['eredmeny']
+            frames = self.battle_frames(battle_data, eredmeny)
+            
+            if mode == 'timeline':
+                await self.send_timeline(frames, battle_data, eredmeny)
+            else:
+                await self.stream_frames(frames, battle_data, eredmeny)
+            
+        except Exception as e:
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'message': f'❌ Hiba történt: {str(e)}'
+            }))
+    
+    def battle_frames(self, battle_data, eredmeny):
+        """
+        Every frame of the battle animation up to the last round result.
+        
+        Returns (frame, delay after the frame in seconds, round to buffer
+        once the frame is sent) triples.
+        """
+        frames = [({
+            'type': 'battle_start',
+            'message': f'🏰 Harc kezdődik: {battle_data["kazamata_nev"]}!',
+            'total_rounds': len(eredmeny.utkozetek)
+        }, 1.5, None)]
+        
+        jatekos_gyozelmek = 0
+        for utkozet in eredmeny.utkozetek:
+            round_num = utkozet.sorrend
+            winner = 'player' if utkozet.jatekos_nyert else 'enemy'
+            if utkozet.jatekos_nyert:
+                jatekos_gyozelmek += 1
+            
+            enemy_card = self.card_payload(utkozet.kazamata)
+            enemy_card['is_leader'] = utkozet.kazamata.vezer
+            
+            frames += [
+                ({
+                    'type': 'round_start',
+                    'round': round_num,
+                    'message': f'⚔️ {round_num}. ütközet kezdődik...'
+                }, 1, None),
+                ({
+                    'type': 'card_reveal',
+                    'side': 'player',
+                    'round': round_num,
+                    'card': self.card_payload(utkozet.jatekos)
+                }, 1.2, None),
+                ({
+                    'type': 'card_reveal',
+                    'side': 'enemy',
+                    'round': round_num,
+                    'card': enemy_card
+                }, 1.2, None),
+                ({
+                    'type': 'battle_animation',
+                    'round': round_num,
+                    'winner': winner,
+                    'player_element': utkozet.jatekos.tipus,
+                    'enemy_element': utkozet.kazamata.tipus
+                }, 1.5, utkozet),
+                ({
+                    'type': 'round_result',
+                    'round': round_num,
+                    'winner': winner,
+                    'reason': utkozet.ok_szoveg,
+                    'reason_code': int(utkozet.ok),
+                    'player_wins': jatekos_gyozelmek
+                }, 1.8, None),
+            ]
+        return frames
+    
+    def battle_end_frame(self, battle_data, eredmeny):
+        """Final result frame"""
+        jatekos_gyozott = eredmeny.jatekos_gyozott
+        return {
+            'type': 'battle_end',
+            'winner': 'player' if jatekos_gyozott else 'enemy',
+            'player_wins': eredmeny.jatekos_gyozelmek,
+            'total_rounds': len(eredmeny.utkozetek),
+            'message': '🎉 GYŐZELEM! 🎉' if jatekos_gyozott else '😞 VERESÉG 😞',
+            'harc_id': self.harc_id,
+            'reward': battle_data['reward'] if jatekos_gyozott else None
+        }
+    
+    async def stream_frames(self, frames, battle_data, eredmeny):
+        """Animate the battle from the server, one frame at a time"""
+        for frame, delay, utkozet in frames:
+            # Buffer the round once its outcome is shown, it is saved when the battle ends
+            if utkozet is not None:
+                self.utkozet_puffer.append(utkozet)
+            await self.send(text_data=json.dumps(frame))
+            await asyncio.sleep(delay)
+        
+        # Save rounds and result in one transaction
+        await self.flush_battle(eredmeny.jatekos_gyozott)
+        
+        # Auto-save after battle
+        await self.auto_save_game()
+        
+        # Send final result
+        await self.send(text_data=json.dumps(self.battle_end_frame(battle_data, eredmeny)))
+    
+    async def send_timeline(self, frames, battle_data, eredmeny):
+        """Save the battle right away and send the whole animation as one timeline"""
+        self.utkozet_puffer = list(eredmeny.utkozetek)
+        await self.flush_battle(eredmeny.jatekos_gyozott)
+        await self.auto_save_game()
+        
+        # Relative timestamps in milliseconds, the same spacing as the streamed frames
+        events = []
+        ido = 0
+        for frame, delay, _ in frames:
+            events.append(dict(frame, t=round(ido * 1000)))
+            ido += delay
+        events.append(dict(self.battle_end_frame(battle_data, eredmeny), t=round(ido * 1000)))
+        
+        await self.send(text_data=json.dumps({
+            'type': 'battle_timeline',
+            'harc_id': self.harc_id,
+            'duration': round(ido * 1000),
+            'events': events
+        }))
+    
+    @staticmethod
+    def card_payload(kartya):
+        """JSON payload of an engine card"""
+        return {
+            'name': kartya.nev,
+            'damage': kartya.sebzes,
+            'hp': kartya.eletero,
+            'element': kartya.tipus,
+            'element_display': kartya.tipus_nev
+        }
+    
+    @database_sync_to_async
+    def verify_and_create_battle(self):
+        """Verify game state and create battle record"""
+        try:
+            jatek = Jatek.objects.get(id=self.jatek_id, jatekos=self.user)
+            kazamata = Kazamata.objects.get(id=self.kazamata_id)
+            
+            # Check if pakli exists
+            try:
+                pakli = jatek.pakli
+            except Pakli.DoesNotExist:
+                return {'error': '❌ Először állíts össze egy paklit!'}
+            
+            # Load every card the battle needs in one go
+            pakli_kartyak, kazamata_kartyak = harc_kartyak_betoltese(pakli, kazamata)
+            
+            # Check card count match
+            pakli_meret = len(pakli_kartyak)
+            kazamata_meret = kazamata.get_kartyak_szama()
+            
+            if pakli_meret != kazamata_meret:
+                return {'error': f'❌ A pakli ({pakli_meret}) és kazamata ({kazamata_meret}) kártyáinak száma nem egyezik!'}
+            
+            # Create battle
+            harc = Harc.objects.create(
+                jatek=jatek,
+                kazamata=kazamata
+            )
+            # Set here, so a disconnect while this is still running finds it too
+            self.harc_id = harc.id
+            
+            # Resolved here: on a result cache miss it may need the database
+            eredmeny = kazamata_harc(pakli_kartyak, kazamata.id)
+            
+            return {
+                'eredmeny': eredmeny,
+                # Achievement metrics, applied when the result is saved
+                'metrikak': harc_eredmeny_metrikak(kazamata, eredmeny),
+                'kazamata_nev': kazamata.nev,
+                'reward': kazamata.get_nyeremeny_leiras()
+            }
+            
+        except Jatek.DoesNotExist:
+            return {'error': '❌ Játék nem található!'}
+        except Kazamata.DoesNotExist:
+            return {'error': '❌ Kazamata nem található!'}
+    
+    async def flush_battle(self, jatekos_gyozott=None):
+        """Write the buffered rounds, and the result if the battle is over"""
+        puffer, self.utkozet_puffer = self.utkozet_puffer, []
+        if puffer or jatekos_gyozott is not None:
+            await self.save_battle(self.harc_id, puffer, jatekos_gyozott, self.harc_metrikak)
+    
+    @database_sync_to_async
+    def save_battle(self, harc_id, utkozetek, jatekos_gyozott, metrikak=None):
+        """Save rounds and complete the battle in a single transaction"""
+        with transaction.atomic():
+            Utközet.objects.bulk_create([utkozet_rekord(harc_id, utkozet) for utkozet in utkozetek])
+            
+            if jatekos_gyozott is None:
+                return
+            
+            # Only the first completion counts: the conditional UPDATE claims the battle
+            harc_elszamolasa(harc_id, self.user.id, jatekos_gyozott, metrikak or {})
+    
+    @database_sync_to_async
+    def discard_battle(self):
+        """Delete the battle of this connection if it was not completed"""
+        Harc.objects.filter(id=self.harc_id, befejezve=False).delete()
+    
+    @database_sync_to_async
+    def auto_save_game(self):
+        """Auto-save game state"""
+        try:
+            jatek = Jatek.objects.get(id=self.jatek_id, jatekos=self.user)
+            # Save method automatically updates utolso_aktivitas
+            jatek.save()
+            return True
+        except:
+            return False
+
+
+
+class LeaderboardConsumer(AsyncWebsocketConsumer):
+    """
+    Live leaderboard: the top N players and the viewer's own rank.
+    
+    The client gets a snapshot on connect, then only diffs. The diff of a
+    change is computed once, by the process that wrote it, and broadcast to
+    the group (see leaderboard_index.py). A viewer only folds it into its
+    state: top N rows by position, and its own rank moved by the players
+    that crossed it. The first diff schedules a send after UPDATE_INTERVAL
+    seconds, the ones arriving meanwhile are coalesced into it.
+    
+    Viewers in other processes only get the broadcast through a shared
+    channel layer, see CHANNEL_LAYERS in the settings.
+    """
+    UPDATE_INTERVAL = 2
+    
+    async def connect(self):
+        """Subscribe and send the current state"""
+        self.user = self.scope["user"]
+        self.update_task = None
+        self.update_scheduled = False
+        
+        await self.channel_layer.group_add(LEADERBOARD_GROUP, self.channel_name)
+        await self.accept()
+        
+        self.top, self.me, self.watermark = await self.current_state()
+        self.state_top, self.state_me = list(self.top), self.me
+        await self.send(text_data=json.dumps({
+            'type': 'snapshot',
+            'top': self.top,
+            'me': self.me
+        }))
+    
+    async def disconnect(self, close_code):
+        """Stop the pending update and unsubscribe"""
+        update_task = getattr(self, 'update_task', None)
+        if update_task is not None and not update_task.done():
+            update_task.cancel()
+        await self.channel_layer.group_discard(LEADERBOARD_GROUP, self.channel_name)
+    
+    async def leaderboard_diff(self, event):
+        """Group message: one ranking change, as computed by the writer"""
+        top = self.state_top[:event['size']]
+        top.extend([None] * (event['size'] - len(top)))
+        for position, row in event['top'].items():
+            top[int(position)] = row
+        self.state_top = top
+        
+        if event['players'] is None:
+            # The writer had nothing to compare with, so the own row is looked up once
+            _, self.state_me, self.watermark = await self.current_state()
+        else:
+            for player in event['players']:
+                self.apply_move(player)
+        
+        if not self.update_scheduled:
+            self.update_scheduled = True
+            self.update_task = asyncio.ensure_future(self.send_update())
+    
+    def apply_move(self, player):
+        """The viewer's own row after a player's change"""
+        if not self.user.is_authenticated:
+            return
+        if player['user_id'] == self.user.id:
+            self.state_me = player['row']
+            return
+        if self.state_me is None or player['id'] <= self.watermark:
+            # Already part of the snapshot
+            return
+        
+        # Rank is 1 + the players strictly ahead by (points, wins)
+        mine = [self.state_me['points'], self.state_me['wins']]
+        ahead = lambda key: key is not None and key > mine
+        moved = ahead(player['new']) - ahead(player['old'])
+        if moved:
+            self.state_me = dict(self.state_me, rank=self.state_me['rank'] + moved)
+    
+    async def send_update(self):
+        """Send what changed since the last message, if anything"""
+        await asyncio.sleep(self.UPDATE_INTERVAL)
+        # Changes from here on need a new update
+        self.update_scheduled = False
+        
+        top, me = self.state_top, self.state_me
+        diff = {}
+        
+        # Top N by position: only the rows that differ, plus the new length
+        changed = {
+            str(position): row for position, row in enumerate(top)
+            if position >= len(self.top) or self.top[position] != row
+        }
+        if changed or len(top) != len(self.top):
+            diff['top'] = changed
+            diff['size'] = len(top)
+        if me != self.me:
+            diff['me'] = me
+        
+        self.top, self.me = list(top), me
+        if diff:
+            await self.send(text_data=json.dumps(dict(diff, type='diff')))
+    
+    @database_sync_to_async
+    def current_state(self):
+        """Top N, the viewer's row with rank and the index watermark (the index loads itself on first use)"""
+        return leaderboard_index.pillanatkep(self.user.id if self.user.is_authenticated else None)
@@ -0,0 +1,154 @@
+"""
+Pakli sorrend optimalizáló
+
+Adott gyűjteményből és kazamatából megkeresi azt a paklit (kártyák és
+sorrend), amellyel a legtöbb ütközet nyerhető. Az ütközetek egymástól
+függetlenek, így ez egy hozzárendelési feladat: kazamata pozíciók bitmaszkján
+futó dinamikus programozással oldjuk meg, permutációk próbálgatása nélkül.
+"""
+from collections import Counter
+from functools import lru_cache
+
+from .battle_engine import tomeges_utközet_ertekeles
+
+
+def kartya_stat(kartya):
+    """A kártya harc szempontjából számító értékei"""
+    return (kartya.sebzes, kartya.eletero, kartya.tipus)
+
+
+def _bitek_szama(maszk):
+    return bin(maszk).count('1')
+
+
+def gyozelmi_maszkok(kartya_statok, kazamata_statok):
+    """
+    Minden kártya stathoz egy bitmaszk: az i. bit azt jelzi, hogy a kártya
+    megnyeri-e az ütközetet a kazamata i. kártyája ellen.
+    
+    Az összes (kártya, pozíció) párt egyetlen tömeges kiértékeléssel számolja.
+    """
+    n = len(kazamata_statok)
+    oszlopok = ([], [], [], [], [], [])
+    for j_sebzes, j_eletero, j_tipus in kartya_statok:
+        for k_sebzes, k_eletero, k_tipus in kazamata_statok:
+            for oszlop, ertek in zip(oszlopok, (j_sebzes, j_eletero, j_tipus,
+                                               k_sebzes, k_eletero, k_tipus)):
+                oszlop.append(ertek)
+    
+    nyertek, _ = tomeges_utközet_ertekeles(*oszlopok)
+    
+    maszkok = []
+    for i in range(len(kartya_statok)):
+        maszk = 0
+        for poz, nyert in enumerate(nyertek[i * n:(i + 1) * n]):
+            if nyert:
+                maszk |= 1 << poz
+        maszkok.append(maszk)
+    return maszkok
+
+
+@lru_cache(maxsize=4096)
+def _optimalis_kiosztas(kazamata_statok, kartya_keszlet):
+    """
+    A legtöbb győzelmet adó hozzárendelés, kártya statokra memoizálva.
+    
+    Args:
+        kazamata_statok: a kazamata kártyáinak statjai sorrendben
+        kartya_keszlet: rendezett (stat, darab) párok; a darab már a kazamata
+            méretére van vágva, mert ennél több azonos kártya nem kell
+    
+    Visszatérés: pozíciónként a nyerő kártya statja, vagy None, ha ott
+    nincs nyerő kártya (oda bármelyik maradék kártya mehet)
+    """
+    n = len(kazamata_statok)
+    statok = [stat for stat, _ in kartya_keszlet]
+    maszkok = gyozelmi_maszkok(statok, kazamata_statok)
+    
+    # Minden példány egy tétel; egy maszkból legfeljebb annyi kell, ahány bitje van
+    tetelek = []
+    for (stat, darab), maszk in zip(kartya_keszlet, maszkok):
+        if maszk:
+            tetelek.extend([(stat, maszk)] * min(darab, _bitek_szama(maszk)))
+    
+    # allapot: a már nyerő kártyával lefedett pozíciók maszkja
+    # elozmeny[allapot] = (előző állapot, tétel indexe, lefedett pozíció bitje)
+    teljes = (1 << n) - 1
+    elozmeny = {0: None}
+    for index, (_, maszk) in enumerate(tetelek):
+        for allapot in list(elozmeny):
+            szabad = maszk & ~allapot
+            while szabad:
+                bit = szabad & -szabad
+                szabad ^= bit
+                uj = allapot | bit
+                if uj not in elozmeny:
+                    elozmeny[uj] = (allapot, index, bit)
+        if teljes in elozmeny:
+            break
+    
+    legjobb = max(elozmeny, key=_bitek_szama)
+    kiosztas = [None] * n
+    allapot = legjobb
+    while elozmeny[allapot] is not None:
+        elozo, index, bit = elozmeny[allapot]
+        kiosztas[bit.bit_length() - 1] = tetelek[index][0]
+        allapot = elozo
+    return tuple(kiosztas)
+
+
+def _kartya_keszlet(kartya_statok, n):
+    """Rendezett (stat, darab) párok; n-nél több azonos kártya nem kell"""
+    darabok = Counter(kartya_statok)
+    return tuple(sorted((stat, min(darab, n)) for stat, darab in darabok.items()))
+
+
+def max_gyozelmek(kartya_statok, kazamata_statok):
+    """
+    Legfeljebb hány ütközet nyerhető a kártyákkal a kazamata ellen.
+    
+    Csak statokkal dolgozik, így a tervező közvetlenül hívhatja; az
+    eredmény ugyanúgy memoizált, mint a legjobb_pakli() esetén.
+    """
+    kazamata_statok = tuple(kazamata_statok)
+    kiosztas = _optimalis_kiosztas(kazamata_statok, _kartya_keszlet(kartya_statok, len(kazamata_statok)))
+    return sum(1 for stat in kiosztas if stat is not None)
+
+
+def legjobb_pakli(gyujtemeny, kazamata_kartyak):
+    """
+    A legtöbb ütközetet nyerő pakli a kazamata ellen.
+    
+    Args:
+        gyujtemeny: a játékos kártyái (HarcKartya lista)
+        kazamata_kartyak: a kazamata kártyái sorrendben (HarcKartya lista)
+    
+    Visszatérés: (pakli: list[HarcKartya], gyozelmek: int)
+    """
+    n = len(kazamata_kartyak)
+    if len(gyujtemeny) < n:
+        raise ValueError(f"A gyűjteményben nincs elég kártya ({len(gyujtemeny)}/{n})!")
+    
+    kartya_keszlet = _kartya_keszlet([kartya_stat(kartya) for kartya in gyujtemeny], n)
+    kazamata_statok = tuple(kartya_stat(kartya) for kartya in kazamata_kartyak)
+    
+    kiosztas = _optimalis_kiosztas(kazamata_statok, kartya_keszlet)
+    
+    # Statok visszafordítása konkrét kártyákra, a gyűjtemény sorrendjében
+    szabad_kartyak = {}
+    for kartya in gyujtemeny:
+        szabad_kartyak.setdefault(kartya_stat(kartya), []).append(kartya)
+    
+    pakli = [None] * n
+    for poz, stat in enumerate(kiosztas):
+        if stat is not None:
+            pakli[poz] = szabad_kartyak[stat].pop(0)
+    
+    # A vesztes pozíciókra a megmaradt kártyák kerülnek
+    maradek = iter([kartya for kartyak in szabad_kartyak.values() for kartya in kartyak])
+    for poz in range(n):
+        if pakli[poz] is None:
+            pakli[poz] = next(maradek)
+    
+    gyozelmek = sum(1 for stat in kiosztas if stat is not None)
+    return pakli, gyozelmek
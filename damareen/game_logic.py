@@ -1,382 +1,637 @@
-"""
-Damareen játék logika
-"""
-from django.contrib.auth.models import User
-from .models import (
-    ELEMENT_FIRE, ELEMENT_EARTH, ELEMENT_WATER, ELEMENT_AIR,
-    Harc, Utközet, Jatekoskartya, PakliKartya, 
-    Achievement, PlayerAchievement, UserProfile
-)
-
-
-def elem_legyozi(elem1, elem2):
-    """
-    Meghatározza, hogy elem1 legyőzi-e elem2-t.
-    Tűz > Föld > Víz > Levegő > Tűz
-    """
-    gyozelmek = {
-        ELEMENT_FIRE: ELEMENT_EARTH,      # Tűz > Föld
-        ELEMENT_EARTH: ELEMENT_WATER,     # Föld > Víz
-        ELEMENT_WATER: ELEMENT_AIR,       # Víz > Levegő
-        ELEMENT_AIR: ELEMENT_FIRE,        # Levegő > Tűz
-    }
-    
-    return gyozelmek.get(elem1) == elem2
-
-
-def utközet_ertekeles(jatekos_sebzes, jatekos_eletero, jatekos_tipus,
-                       kazamata_sebzes, kazamata_eletero, kazamata_tipus):
-    """
-    Kiértékel egy ütközetet és visszaadja, hogy a játékos nyert-e, és miért.
-    
-    Visszatérés: (jatekos_nyert: bool, ok: str)
-    """
-    
-    # 1. szabály: Sebzés vs életerő
-    jatekos_sebez = jatekos_sebzes > kazamata_eletero
-    kazamata_sebez = kazamata_sebzes > jatekos_eletero
-    
-    if jatekos_sebez and not kazamata_sebez:
-        return True, f"Játékos sebzése ({jatekos_sebzes}) > Kazamata életereje ({kazamata_eletero})"
-    
-    if kazamata_sebez and not jatekos_sebez:
-        return False, f"Kazamata sebzése ({kazamata_sebzes}) > Játékos életereje ({jatekos_eletero})"
-    
-    # 2. szabály: Típus alapján
-    if elem_legyozi(jatekos_tipus, kazamata_tipus):
-        jatekos_tipus_nev = dict([(ELEMENT_FIRE, 'Tűz'), (ELEMENT_EARTH, 'Föld'), 
-                                   (ELEMENT_WATER, 'Víz'), (ELEMENT_AIR, 'Levegő')]).get(jatekos_tipus, jatekos_tipus)
-        kazamata_tipus_nev = dict([(ELEMENT_FIRE, 'Tűz'), (ELEMENT_EARTH, 'Föld'), 
-                                    (ELEMENT_WATER, 'Víz'), (ELEMENT_AIR, 'Levegő')]).get(kazamata_tipus, kazamata_tipus)
-        return True, f"Típus előny: {jatekos_tipus_nev} > {kazamata_tipus_nev}"
-    
-    if elem_legyozi(kazamata_tipus, jatekos_tipus):
-        jatekos_tipus_nev = dict([(ELEMENT_FIRE, 'Tűz'), (ELEMENT_EARTH, 'Föld'), 
-                                   (ELEMENT_WATER, 'Víz'), (ELEMENT_AIR, 'Levegő')]).get(jatekos_tipus, jatekos_tipus)
-        kazamata_tipus_nev = dict([(ELEMENT_FIRE, 'Tűz'), (ELEMENT_EARTH, 'Föld'), 
-                                    (ELEMENT_WATER, 'Víz'), (ELEMENT_AIR, 'Levegő')]).get(kazamata_tipus, kazamata_tipus)
-        return False, f"Típus előny: {kazamata_tipus_nev} > {jatekos_tipus_nev}"
-    
-    # 3. szabály: Ha nincs egyértelmű győztes, a kazamata nyer
-    return False, "Döntetlen esetén a kazamata nyer"
-
-
-def harc_vegrehajtasa(harc):
-    """
-    Végrehajtja a harcot és elmenti az eredményeket.
-    
-    Visszatérés: (jatekos_gyozott: bool, utközetek: list)
-    """
-    pakli = harc.jatek.pakli
-    kazamata = harc.kazamata
-    
-    # Pakli kártyák lekérése
-    pakli_kartyak = list(pakli.kartyak.all().order_by('sorrend'))
-    kazamata_kartyak = list(kazamata.kartyak.all().order_by('sorrend'))
-    
-    if len(pakli_kartyak) != len(kazamata_kartyak):
-        raise ValueError("A pakli és a kazamata kártyáinak száma nem egyezik!")
-    
-    utközetek = []
-    jatekos_gyozelmek = 0
-    
-    # Végigmegyünk az ütközeteken
-    for i, (pakli_kartya, kazamata_kartya) in enumerate(zip(pakli_kartyak, kazamata_kartyak)):
-        jatekos_k = pakli_kartya.kartya
-        
-        # Játékos kártya adatai
-        j_sebzes = jatekos_k.aktualis_sebzes
-        j_eletero = jatekos_k.aktualis_eletero
-        j_tipus = jatekos_k.tipus
-        
-        # Kazamata kártya adatai
-        k_sebzes = kazamata_kartya.get_sebzes()
-        k_eletero = kazamata_kartya.get_eletero()
-        k_tipus = kazamata_kartya.get_tipus()
-        
-        # Ütközet kiértékelése
-        jatekos_nyert, ok = utközet_ertekeles(
-            j_sebzes, j_eletero, j_tipus,
-            k_sebzes, k_eletero, k_tipus
-        )
-        
-        if jatekos_nyert:
-            jatekos_gyozelmek += 1
-        
-        # Ütközet mentése
-        utközet = Utközet.objects.create(
-            harc=harc,
-            sorrend=i + 1,
-            jatekos_kartya=jatekos_k,
-            jatekos_sebzes=j_sebzes,
-            jatekos_eletero=j_eletero,
-            jatekos_tipus=j_tipus,
-            kazamata_kartya_ref=kazamata_kartya,
-            kazamata_sebzes=k_sebzes,
-            kazamata_eletero=k_eletero,
-            kazamata_tipus=k_tipus,
-            jatekos_nyert=jatekos_nyert,
-            gyoztes_ok=ok
-        )
-        utközetek.append(utközet)
-    
-    # Harc eredményének meghatározása
-    # A játékos akkor nyer, ha legalább annyi kártyája nyert, mint amennyi a kazamatának
-    szukseges_gyozelmek = (len(kazamata_kartyak) + 1) // 2  # Kerekítés felfelé
-    jatekos_gyozott = jatekos_gyozelmek >= szukseges_gyozelmek
-    
-    # Harc befejezése
-    harc.befejezve = True
-    harc.jatekos_gyozott = jatekos_gyozott
-    harc.save()
-    
-    return jatekos_gyozott, utközetek
-
-
-def jutalom_alkalmazasa(jatek, kazamata, valasztott_kartya_id):
-    """
-    Alkalmazza a kazamata legyőzésének jutalmát a kiválasztott kártyára.
-    
-    Args:
-        jatek: Jatek objektum
-        kazamata: Kazamata objektum
-        valasztott_kartya_id: A fejlesztendő Jatekoskartya id-ja
-    """
-    from .models import Kazamata
-    
-    try:
-        kartya = Jatekoskartya.objects.get(id=valasztott_kartya_id, jatek=jatek)
-    except Jatekoskartya.DoesNotExist:
-        raise ValueError("A kiválasztott kártya nem található a gyűjteményben!")
-    
-    # Jutalom alkalmazása típus szerint
-    if kazamata.tipus == Kazamata.TIPUS_EGYSZERU:
-        # +1 sebzés
-        kartya.aktualis_sebzes += 1
-        kartya.save()
-        return f"{kartya.eredeti_kartya.nev} +1 sebzést kapott!"
-    
-    elif kazamata.tipus == Kazamata.TIPUS_KIS:
-        # +2 életerő
-        kartya.aktualis_eletero += 2
-        kartya.save()
-        return f"{kartya.eredeti_kartya.nev} +2 életerőt kapott!"
-    
-    elif kazamata.tipus == Kazamata.TIPUS_NAGY:
-        # +3 sebzés
-        kartya.aktualis_sebzes += 3
-        kartya.save()
-        return f"{kartya.eredeti_kartya.nev} +3 sebzést kapott!"
-    
-    return "Ismeretlen jutalom típus!"
-
-
-def ellenorzi_es_ad_achievementet(user, tipus, ertek=1):
-    """
-    Ellenőrzi és frissíti a játékos achievementjeit.
-    
-    Args:
-        user: User objektum
-        tipus: Achievement típusa
-        ertek: Növekmény érték (alapértelmezetten 1)
-    """
-    try:
-        # Lekérjük az összes ilyen típusú achievementet
-        achievementek = Achievement.objects.filter(tipus=tipus)
-        
-        for achievement in achievementek:
-            # Lekérjük vagy létrehozzuk a játékos achievementjét
-            player_ach, created = PlayerAchievement.objects.get_or_create(
-                jatekos=user,
-                achievement=achievement,
-                defaults={'jelenlegi_haladás': 0}
-            )
-            
-            # Ha már teljesítve, nem módosítjuk
-            if player_ach.teljesitve:
-                continue
-            
-            # Frissítjük a haladást
-            player_ach.jelenlegi_haladás += ertek
-            
-            # Ellenőrizzük, hogy most teljesült-e
-            teljesult_most = player_ach.jelenlegi_haladás >= achievement.cel_ertek
-            
-            # Ha most teljesült, pontokat adunk
-            if teljesult_most:
-                try:
-                    profile = user.userprofile
-                    profile.osszes_pontszam += achievement.pontok
-                    profile.save()
-                except UserProfile.DoesNotExist:
-                    pass
-            
-            player_ach.save()
-            
-    except Exception as e:
-        # Hibák esetén csendesen továbblépünk
-        import traceback
-        print(f"Achievement hiba: {e}")
-        traceback.print_exc()
-
-
-def frissit_rangsort(user, gyozott):
-    """
-    Frissíti a játékos rangsor statisztikáit.
-    
-    Args:
-        user: User objektum
-        gyozott: Boolean - igaz, ha a játékos nyert
-    """
-    try:
-        profile = user.userprofile
-        
-        if gyozott:
-            profile.gyozelem_hozzaad()
-            # Achievementek ellenőrzése - győzelmek számolása
-            ellenorzi_es_ad_achievementet(user, 'gyozelem', 1)
-            
-            # Sorozat achievementek - újratöltjük a profilt a friss adatokért
-            profile.refresh_from_db()
-            
-            # 3-as sorozat ellenőrzése
-            if profile.jelenlegi_sorozat >= 3:
-                # Lekérjük vagy létrehozzuk a 3_sorozat achievement-et
-                try:
-                    achievement = Achievement.objects.get(tipus='3_sorozat')
-                    player_ach, created = PlayerAchievement.objects.get_or_create(
-                        jatekos=user,
-                        achievement=achievement,
-                        defaults={'jelenlegi_haladás': 0}
-                    )
-                    # Ha még nem teljesült, most teljesítjük
-                    if not player_ach.teljesitve:
-                        player_ach.jelenlegi_haladás = achievement.cel_ertek
-                        player_ach.save()
-                        # Pontok hozzáadása
-                        profile.osszes_pontszam += achievement.pontok
-                        profile.save()
-                except Achievement.DoesNotExist:
-                    pass
-            
-            # 5-ös sorozat ellenőrzése
-            if profile.jelenlegi_sorozat >= 5:
-                try:
-                    achievement = Achievement.objects.get(tipus='5_sorozat')
-                    player_ach, created = PlayerAchievement.objects.get_or_create(
-                        jatekos=user,
-                        achievement=achievement,
-                        defaults={'jelenlegi_haladás': 0}
-                    )
-                    if not player_ach.teljesitve:
-                        player_ach.jelenlegi_haladás = achievement.cel_ertek
-                        player_ach.save()
-                        profile.osszes_pontszam += achievement.pontok
-                        profile.save()
-                except Achievement.DoesNotExist:
-                    pass
-            
-            # 10-es sorozat ellenőrzése
-            if profile.jelenlegi_sorozat >= 10:
-                try:
-                    achievement = Achievement.objects.get(tipus='10_sorozat')
-                    player_ach, created = PlayerAchievement.objects.get_or_create(
-                        jatekos=user,
-                        achievement=achievement,
-                        defaults={'jelenlegi_haladás': 0}
-                    )
-                    if not player_ach.teljesitve:
-                        player_ach.jelenlegi_haladás = achievement.cel_ertek
-                        player_ach.save()
-                        profile.osszes_pontszam += achievement.pontok
-                        profile.save()
-                except Achievement.DoesNotExist:
-                    pass
-        else:
-            profile.vereseg_hozzaad()
-            ellenorzi_es_ad_achievementet(user, 'vereseg', 1)
-            
-    except UserProfile.DoesNotExist:
-        # Ha nincs profil, létrehozzuk
-        UserProfile.objects.create(user=user)
-
-
-def inicializal_achievementeket():
-    """
-    Létrehozza az alapértelmezett achievementeket, ha még nem léteznek.
-    """
-    alapertelmezett_achievementek = [
-        # Győzelmek
-        {
-            'nev': 'Első győzelem',
-            'leiras': 'Nyerd meg az első csatádat!',
-            'ikon': '🎯',
-            'tipus': 'gyozelem',
-            'cel_ertek': 1,
-            'pontok': 10
-        },
-        {
-            'nev': 'Veterán',
-            'leiras': 'Nyerj meg 10 csatát!',
-            'ikon': '⚔️',
-            'tipus': 'gyozelem',
-            'cel_ertek': 10,
-            'pontok': 50
-        },
-        {
-            'nev': 'Bajnok',
-            'leiras': 'Nyerj meg 50 csatát!',
-            'ikon': '👑',
-            'tipus': 'gyozelem',
-            'cel_ertek': 50,
-            'pontok': 200
-        },
-        {
-            'nev': 'Legenda',
-            'leiras': 'Nyerj meg 100 csatát!',
-            'ikon': '🏆',
-            'tipus': 'gyozelem',
-            'cel_ertek': 100,
-            'pontok': 500
-        },
-        # Sorozatok
-        {
-            'nev': 'Lendületben',
-            'leiras': 'Nyerj meg 3 csatát egymás után!',
-            'ikon': '🔥',
-            'tipus': '3_sorozat',
-            'cel_ertek': 1,
-            'pontok': 25
-        },
-        {
-            'nev': 'Legyőzhetetlen',
-            'leiras': 'Nyerj meg 5 csatát egymás után!',
-            'ikon': '💪',
-            'tipus': '5_sorozat',
-            'cel_ertek': 1,
-            'pontok': 75
-        },
-        {
-            'nev': 'Halhatatlan',
-            'leiras': 'Nyerj meg 10 csatát egymás után!',
-            'ikon': '⚡',
-            'tipus': '10_sorozat',
-            'cel_ertek': 1,
-            'pontok': 250
-        },
-        # Kitartás
-        {
-            'nev': 'Kitartó',
-            'leiras': 'Veszíts el 10 csatát (nem add fel!)',
-            'ikon': '💔',
-            'tipus': 'vereseg',
-            'cel_ertek': 10,
-            'pontok': 20
-        },
-    ]
-    
-    for ach_data in alapertelmezett_achievementek:
-        Achievement.objects.get_or_create(
-            nev=ach_data['nev'],
-            defaults=ach_data
+"""
+Damareen játék logika
+"""
+from django.db import transaction
+from .models import (
+    Harc, Utközet, Jatekoskartya, Kazamata, Pakli, KazamataKartya,
+    Achievement, UserProfile, HarcEsemeny
+)
+from .battle_engine import tomeges_utközet_ertekeles, HarcKartya, szukseges_gyozelmek
+from . import battle_events, leaderboard_index
+from .achievements import achievementek_frissitese, harc_metrikak
+from .battle_plan import kazamata_terv, kazamata_harc, pakli_kimenetek
+from .deck_solver import kartya_stat, legjobb_pakli
+from .planner import kampany_terv
+from .seasons import szezon_frissites
+
+
+def gyujtemeny_betoltese(jatek):
+    """A játékos teljes gyűjteménye HarcKartya listaként, egy lekérdezéssel"""
+    return [
+        HarcKartya(k.id, k.eredeti_kartya.nev, k.aktualis_sebzes, k.aktualis_eletero, k.eredeti_kartya.tipus)
+        for k in jatek.gyujtemeny.select_related('eredeti_kartya').order_by('id')
+    ]
+
+
+def kazamata_kartyak_betoltese(kazamata):
+    """A kazamata kártyái sorrendben, a cache-elt harc tervből"""
+    return kazamata_terv(kazamata.id)
+
+
+def harc_kartyak_betoltese(pakli, kazamata):
+    """
+    Betölti a pakli és a kazamata kártyáit a harc motor számára.
+    
+    Kártyánként nincs további lekérdezés: a pakli kapcsolódó kártyáit
+    select_related hozza, a kazamata a cache-elt tervéből jön, a motor
+    már csak HarcKartya objektumokat lát.
+    
+    Visszatérés: (pakli_kartyak: list[HarcKartya], kazamata_kartyak: tuple[HarcKartya])
+    """
+    return pakli_kartyak_betoltese(pakli), kazamata_kartyak_betoltese(kazamata)
+
+
+def pakli_kartyak_betoltese(pakli):
+    """A pakli kártyái sorrendben, HarcKartya listaként, egy lekérdezéssel"""
+    return [
+        HarcKartya(
+            pk.kartya.id,
+            pk.kartya.eredeti_kartya.nev,
+            pk.kartya.aktualis_sebzes,
+            pk.kartya.aktualis_eletero,
+            pk.kartya.eredeti_kartya.tipus
+        )
+        for pk in pakli.kartyak.select_related('kartya__eredeti_kartya').order_by('sorrend')
+    ]
+
+
+def kazamatak_betoltese():
+    """
+    Az összes teljes kazamata a kártyáival, egyetlen lekérdezéssel.
+    
+    A félkész (még nem teljesen feltöltött) kazamatákat kihagyja.
+    
+    Visszatérés: (Kazamata, list[HarcKartya]) párok listája
+    """
+    kazamatak = {}
+    kartyak = {}
+    for kk in KazamataKartya.objects.select_related(
+        'kazamata', 'vilag_kartya', 'vezer_kartya__eredeti_kartya'
+    ).order_by('kazamata_id', 'sorrend'):
+        kazamatak[kk.kazamata_id] = kk.kazamata
+        kartyak.setdefault(kk.kazamata_id, []).append(
+            HarcKartya(kk.id, kk.kartya.nev, kk.get_sebzes(), kk.get_eletero(), kk.get_tipus(), kk.is_vezer)
+        )
+    return [
+        (kazamata, kartyak[kazamata_id])
+        for kazamata_id, kazamata in kazamatak.items()
+        if len(kartyak[kazamata_id]) == kazamata.get_kartyak_szama()
+    ]
+
+
+def pakli_elorejelzes(pakli, kazamatak):
+    """
+    A pakli várható eredménye minden vele azonos méretű, teljes kazamata ellen.
+    
+    Egy menetben számol; pakli csere vagy kártya fejlesztés után a megváltozott
+    értékek miatt számolódik újra, egyébként a harc eredmény cache-ből jön.
+    
+    Args:
+        pakli: Pakli objektum
+        kazamatak: A vizsgálandó Kazamata objektumok
+    
+    Visszatérés: dict kazamata id -> {'gyozelmek', 'osszes', 'jatekos_gyozne'}
+    """
+    pakli_kartyak = pakli_kartyak_betoltese(pakli)
+    kazamata_ids = [
+        kazamata.id for kazamata in kazamatak
+        if kazamata.get_kartyak_szama() == len(pakli_kartyak)
+    ]
+    return {
+        kazamata_id: {
+            'gyozelmek': eredmeny.jatekos_gyozelmek,
+            'osszes': len(eredmeny.utkozetek),
+            'jatekos_gyozne': eredmeny.jatekos_gyozott,
+        }
+        for kazamata_id, eredmeny in pakli_kimenetek(pakli_kartyak, kazamata_ids).items()
+    }
+
+
+def jutalom_ajanlas(jatek, kazamata):
+    """
+    Hány újabb kazamatát győzne le a pakli, ha egy-egy kártyája kapná a jutalmat.
+    
+    Csak a pakli kártyái változtathatnak a pakli eredményén, és egy kártya
+    fejlesztése csak a saját ütközetét érinti. Ezért minden (pakli kártya,
+    kazamata) pár fejlesztett ütközete egyetlen tömeges kiértékelésben fut,
+    a többi ütközet a jelenlegi pakli (cache-elt) eredményéből jön.
+    
+    Args:
+        jatek: Jatek objektum
+        kazamata: A legyőzött Kazamata, ennek a jutalma számít
+    
+    Visszatérés: dict Jatekoskartya id -> újonnan legyőzhető kazamaták száma
+    """
+    try:
+        pakli = jatek.pakli
+    except Pakli.DoesNotExist:
+        return {}
+    
+    pakli_kartyak = pakli_kartyak_betoltese(pakli)
+    kazamata_ids = [
+        k.id for k in Kazamata.objects.all() if k.get_kartyak_szama() == len(pakli_kartyak)
+    ]
+    # Csak a most még nem legyőzhető kazamaták számítanak
+    vesztes = [e for e in pakli_kimenetek(pakli_kartyak, kazamata_ids).values() if not e.jatekos_gyozott]
+    if not vesztes:
+        return {}
+    
+    plusz_sebzes, plusz_eletero = kazamata.get_jutalom()
+    oszlopok = ([], [], [], [], [], [])
+    for eredmeny in vesztes:
+        for utkozet in eredmeny.utkozetek:
+            jatekos, ellenfel = utkozet.jatekos, utkozet.kazamata
+            for oszlop, ertek in zip(oszlopok, (
+                    jatekos.sebzes + plusz_sebzes, jatekos.eletero + plusz_eletero, jatekos.tipus,
+                    ellenfel.sebzes, ellenfel.eletero, ellenfel.tipus)):
+                oszlop.append(ertek)
+    nyertek, _ = tomeges_utközet_ertekeles(*oszlopok)
+    
+    szukseges = szukseges_gyozelmek(len(pakli_kartyak))
+    ajanlas = {kartya.id: 0 for kartya in pakli_kartyak}
+    i = 0
+    for eredmeny in vesztes:
+        for utkozet in eredmeny.utkozetek:
+            # A fejlesztés egyetlen, eddig elvesztett ütközetet fordíthat meg
+            if nyertek[i] and not utkozet.jatekos_nyert and eredmeny.jatekos_gyozelmek + 1 >= szukseges:
+                ajanlas[utkozet.jatekos.id] += 1
+            i += 1
+    return ajanlas
+
+
+def pakli_javaslat(jatek, kazamata):
+    """
+    A legtöbb ütközetet nyerő pakli javaslata a kazamata ellen.
+    
+    Visszatérés: dict a javasolt kártyákkal (sorrendben) és a várható eredménnyel
+    """
+    kazamata_kartyak = kazamata_kartyak_betoltese(kazamata)
+    pakli, gyozelmek = legjobb_pakli(gyujtemeny_betoltese(jatek), kazamata_kartyak)
+    szukseges = szukseges_gyozelmek(len(kazamata_kartyak))
+    
+    return {
+        'kazamata': kazamata,
+        'kartyak': pakli,
+        'gyozelmek': gyozelmek,
+        'osszes': len(kazamata_kartyak),
+        'jatekos_gyozne': gyozelmek >= szukseges,
+    }
+
+
+def utkozet_rekord(harc_id, utkozet):
+    """Menthető (még el nem mentett) Utközet a motor egy ütközetéből"""
+    return Utközet(
+        harc_id=harc_id,
+        sorrend=utkozet.sorrend,
+        jatekos_kartya_id=utkozet.jatekos.id,
+        jatekos_sebzes=utkozet.jatekos.sebzes,
+        jatekos_eletero=utkozet.jatekos.eletero,
+        jatekos_tipus=utkozet.jatekos.tipus,
+        kazamata_kartya_ref_id=utkozet.kazamata.id,
+        kazamata_sebzes=utkozet.kazamata.sebzes,
+        kazamata_eletero=utkozet.kazamata.eletero,
+        kazamata_tipus=utkozet.kazamata.tipus,
+        jatekos_nyert=utkozet.jatekos_nyert,
+        gyoztes_ok=utkozet.ok
+    )
+
+
+def harc_eredmeny_metrikak(kazamata, eredmeny):
+    """A motor egy harc kimenetelének achievement metrikái (lásd harc_metrikak)"""
+    return harc_metrikak(
+        kazamata, eredmeny.jatekos_gyozott,
+        ((utkozet.jatekos.tipus, utkozet.jatekos_nyert) for utkozet in eredmeny.utkozetek)
+    )
+
+
+def harc_elszamolasa(harc_id, jatekos_id, jatekos_gyozott, metrikak):
+    """
+    Egy befejezett harc rangsor elszámolása, pontosan egyszer.
+    
+    A harcot egyetlen feltételes UPDATE foglalja le (rangsor_frissitve = false
+    mellett), és csak sikeres foglaláskor kerül be a rangsor eseménye,
+    ugyanabban a rövid tranzakcióban. Az UPDATE a harcot lezártként is rögzíti.
+    
+    Args:
+        harc_id: A harc id-ja
+        jatekos_id: A harcot vívó játékos user id-ja
+        jatekos_gyozott: Boolean - igaz, ha a játékos nyert
+        metrikak: A harc achievement metrikái (lásd harc_metrikak)
+    
+    Visszatérés: True, ha ez a hívás számolta el a harcot
+    """
+    with transaction.atomic():
+        foglalt = Harc.objects.filter(id=harc_id, rangsor_frissitve=False).update(
+            befejezve=True,
+            jatekos_gyozott=jatekos_gyozott,
+            rangsor_frissitve=True
+        )
+        if foglalt:
+            battle_events.esemenyek_felvetele([HarcEsemeny(
+                harc_id=harc_id,
+                jatekos_id=jatekos_id,
+                jatekos_gyozott=jatekos_gyozott,
+                metrikak=metrikak
+            )])
+    return bool(foglalt)
+
+
+def harc_vegrehajtasa(harc):
+    """
+    Végrehajtja a harcot és elmenti az eredményeket.
+    
+    Visszatérés: (jatekos_gyozott: bool, utközetek: list)
+    """
+    pakli_kartyak, kazamata_kartyak = harc_kartyak_betoltese(harc.jatek.pakli, harc.kazamata)
+    
+    # Kiértékelés a motorral (vagy a cache-ből), mentés utána egyben
+    eredmeny = kazamata_harc(pakli_kartyak, harc.kazamata_id)
+    utközetek = Utközet.objects.bulk_create(
+        [utkozet_rekord(harc.id, utkozet) for utkozet in eredmeny.utkozetek]
+    )
+    
+    # Harc befejezése
+    harc.befejezve = True
+    harc.jatekos_gyozott = eredmeny.jatekos_gyozott
+    harc.save()
+    
+    return eredmeny.jatekos_gyozott, utközetek
+
+
+def _harc_kartyak_ellenorzese(jatek, kazamata):
+    """A harc kártyái, ValueError-ral, ha a pakli hiányzik vagy nem illik a kazamatához"""
+    try:
+        pakli = jatek.pakli
+    except Pakli.DoesNotExist:
+        raise ValueError("Először állíts össze egy paklit!")
+    
+    pakli_kartyak, kazamata_kartyak = harc_kartyak_betoltese(pakli, kazamata)
+    kazamata_meret = kazamata.get_kartyak_szama()
+    if len(pakli_kartyak) != kazamata_meret:
+        raise ValueError(
+            f"A paklidban {len(pakli_kartyak)} kártya van, de a kazamatához {kazamata_meret} kell!"
+        )
+    return pakli_kartyak, kazamata_kartyak
+
+
+def azonnali_harc(jatek, kazamata):
+    """
+    Lefuttat egy harcot animáció nélkül, és azonnal le is zárja (HTTP API).
+    
+    A harc, az ütközetek és a rangsor esemény (lásd battle_events.py)
+    egyszerre kerül mentésre, a hívó tranzakciójában.
+    
+    Visszatérés: (harc: Harc, eredmeny: HarcEredmeny)
+    """
+    pakli_kartyak, kazamata_kartyak = _harc_kartyak_ellenorzese(jatek, kazamata)
+    
+    eredmeny = kazamata_harc(pakli_kartyak, kazamata.id)
+    harc = Harc.objects.create(
+        jatek=jatek,
+        kazamata=kazamata,
+        befejezve=True,
+        jatekos_gyozott=eredmeny.jatekos_gyozott,
+        rangsor_frissitve=True
+    )
+    Utközet.objects.bulk_create(
+        [utkozet_rekord(harc.id, utkozet) for utkozet in eredmeny.utkozetek]
+    )
+    battle_events.esemenyek_felvetele([HarcEsemeny(
+        harc=harc,
+        jatekos_id=jatek.jatekos_id,
+        jatekos_gyozott=eredmeny.jatekos_gyozott,
+        metrikak=harc_eredmeny_metrikak(kazamata, eredmeny)
+    )])
+    
+    # Utolsó aktivitás frissítése, mint a WebSocket harc végén
+    jatek.save()
+    
+    return harc, eredmeny
+
+
+MAX_AUTOMATIKUS_HARC = 100
+
+
+def automatikus_harcok(jatek, kazamata, darab, jutalom_kartya_id=None):
+    """
+    Egymás után több harc ugyanazzal a kazamatával, egy menetben (farmolás).
+    
+    Győzelemkor a jutalom mindig a megadott gyűjteménybeli kártyát fejleszti;
+    ha az a pakliban van, a következő harcok már a fejlesztett értékkel futnak.
+    A harcok, ütközetek és rangsor események tömegesen, a kártya a végén
+    egyszer kerül mentésre a hívó tranzakciójában.
+    
+    Args:
+        jatek: Jatek objektum
+        kazamata: Kazamata objektum
+        darab: A harcok száma (1..MAX_AUTOMATIKUS_HARC)
+        jutalom_kartya_id: A fejlesztendő Jatekoskartya id-ja, None esetén nincs fejlesztés
+    
+    Visszatérés: dict (harcok, gyozelmek, veresegek, jutalom)
+    """
+    if not 1 <= darab <= MAX_AUTOMATIKUS_HARC:
+        raise ValueError(f"A harcok száma 1 és {MAX_AUTOMATIKUS_HARC} között lehet!")
+    
+    pakli_kartyak, kazamata_kartyak = _harc_kartyak_ellenorzese(jatek, kazamata)
+    
+    jutalom_kartya = None
+    if jutalom_kartya_id is not None:
+        try:
+            jutalom_kartya = Jatekoskartya.objects.select_related('eredeti_kartya').get(
+                id=jutalom_kartya_id, jatek=jatek
+            )
+        except Jatekoskartya.DoesNotExist:
+            raise ValueError("A kiválasztott kártya nem található a gyűjteményben!")
+    plusz_sebzes, plusz_eletero = kazamata.get_jutalom()
+    
+    eredmenyek = []
+    fejlesztesek = 0
+    for _ in range(darab):
+        eredmeny = kazamata_harc(pakli_kartyak, kazamata.id)
+        eredmenyek.append(eredmeny)
+        if eredmeny.jatekos_gyozott and jutalom_kartya is not None:
+            fejlesztesek += 1
+            # Új HarcKartya, hogy a korábbi ütközetek a régi értékeket mentsék
+            pakli_kartyak = [
+                HarcKartya(k.id, k.nev, k.sebzes + plusz_sebzes, k.eletero + plusz_eletero, k.tipus)
+                if k.id == jutalom_kartya.id else k
+                for k in pakli_kartyak
+            ]
+    
+    harcok = Harc.objects.bulk_create([
+        Harc(
+            jatek=jatek,
+            kazamata=kazamata,
+            befejezve=True,
+            jatekos_gyozott=eredmeny.jatekos_gyozott,
+            rangsor_frissitve=True
+        )
+        for eredmeny in eredmenyek
+    ])
+    Utközet.objects.bulk_create([
+        utkozet_rekord(harc.id, utkozet)
+        for harc, eredmeny in zip(harcok, eredmenyek)
+        for utkozet in eredmeny.utkozetek
+    ])
+    
+    jutalom = None
+    if fejlesztesek:
+        jutalom_kartya.aktualis_sebzes += plusz_sebzes * fejlesztesek
+        jutalom_kartya.aktualis_eletero += plusz_eletero * fejlesztesek
+        jutalom_kartya.save(update_fields=['aktualis_sebzes', 'aktualis_eletero'])
+        jutalom = (
+            f"{jutalom_kartya.eredeti_kartya.nev} {fejlesztesek}× fejlesztve: "
+            f"{jutalom_kartya.aktualis_sebzes}/{jutalom_kartya.aktualis_eletero}"
+        )
+    
+    gyozelmek = sum(1 for eredmeny in eredmenyek if eredmeny.jatekos_gyozott)
+    # A feldolgozó a játékos eseményeit úgyis egy körben, összevonva írja ki
+    battle_events.esemenyek_felvetele([
+        HarcEsemeny(
+            harc=harc,
+            jatekos_id=jatek.jatekos_id,
+            jatekos_gyozott=eredmeny.jatekos_gyozott,
+            metrikak=harc_eredmeny_metrikak(kazamata, eredmeny)
+        )
+        for harc, eredmeny in zip(harcok, eredmenyek)
+    ])
+    jatek.save()
+    
+    return {
+        'harcok': harcok,
+        'gyozelmek': gyozelmek,
+        'veresegek': darab - gyozelmek,
+        'jutalom': jutalom,
+    }
+
+
+def jutalom_alkalmazasa(jatek, kazamata, valasztott_kartya_id):
+    """
+    Alkalmazza a kazamata legyőzésének jutalmát a kiválasztott kártyára.
+    
+    Args:
+        jatek: Jatek objektum
+        kazamata: Kazamata objektum
+        valasztott_kartya_id: A fejlesztendő Jatekoskartya id-ja
+    """
+    try:
+        kartya = Jatekoskartya.objects.get(id=valasztott_kartya_id, jatek=jatek)
+    except Jatekoskartya.DoesNotExist:
+        raise ValueError("A kiválasztott kártya nem található a gyűjteményben!")
+    
+    # Jutalom alkalmazása típus szerint (Kazamata.JUTALMAK)
+    sebzes, eletero = kazamata.get_jutalom()
+    if not sebzes and not eletero:
+        return "Ismeretlen jutalom típus!"
+    
+    kartya.aktualis_sebzes += sebzes
+    kartya.aktualis_eletero += eletero
+    kartya.save()
+    
+    if sebzes:
+        return f"{kartya.eredeti_kartya.nev} +{sebzes} sebzést kapott!"
+    return f"{kartya.eredeti_kartya.nev} +{eletero} életerőt kapott!"
+
+
+def kampany_terv_keszitese(jatek, cel_kazamata):
+    """
+    Terv a cél kazamata legyőzhetővé tételéhez a legkevesebb harccal.
+    
+    Visszatérés: dict a lépésekkel, vagy None, ha nincs terv a kereső korlátain belül
+    """
+    gyujtemeny = gyujtemeny_betoltese(jatek)
+    betoltott = kazamatak_betoltese()
+    
+    cel_index = next(
+        (i for i, (kazamata, _) in enumerate(betoltott) if kazamata.id == cel_kazamata.id), None
+    )
+    if cel_index is None:
+        raise ValueError("A kazamata még nincs teljesen összeállítva!")
+    
+    lepesek = kampany_terv(
+        [kartya_stat(kartya) for kartya in gyujtemeny],
+        [([kartya_stat(k) for k in kartyak], kazamata.get_jutalom()) for kazamata, kartyak in betoltott],
+        cel_index
+    )
+    if lepesek is None:
+        return None
+    
+    # A lépések a gyűjtemény aktuális állapotán futnak végig
+    statok = [[kartya.sebzes, kartya.eletero] for kartya in gyujtemeny]
+    terv = []
+    for kazamata_index, kartya_index in lepesek:
+        kazamata = betoltott[kazamata_index][0]
+        plusz_sebzes, plusz_eletero = kazamata.get_jutalom()
+        statok[kartya_index][0] += plusz_sebzes
+        statok[kartya_index][1] += plusz_eletero
+        terv.append({
+            'kazamata': kazamata,
+            'kartya': gyujtemeny[kartya_index],
+            'jutalom': kazamata.get_nyeremeny_leiras(),
+            'uj_sebzes': statok[kartya_index][0],
+            'uj_eletero': statok[kartya_index][1],
+        })
+    
+    return {
+        'cel': cel_kazamata,
+        'lepesek': terv,
+        'csatak': len(terv),
+    }
+
+
+def ellenorzi_es_ad_achievementet(user, tipus, ertek=1, parameter=''):
+    """
+    Ellenőrzi és frissíti a játékos achievementjeit.
+    
+    Args:
+        user: User objektum
+        tipus: Achievement típusa
+        ertek: Növekmény (számlálónál) vagy elért érték (szintnél), alapértelmezetten 1
+        parameter: A paraméteres típusok paramétere
+    """
+    achievementek_frissitese(user, {Achievement.metrika_kulcs(tipus, parameter): ertek})
+
+
+def _eredmenyek_beirasa(user, profile, eredmenyek, metrikak):
+    """A harcok beírása a profilba (egy UPDATE), a rangsor indexbe és az achievementekbe"""
+    gyozelmek = sum(1 for gyozott in eredmenyek if gyozott)
+    veresegek = len(eredmenyek) - gyozelmek
+    
+    profile.eredmenyek_hozzaad(eredmenyek)
+    
+    # Az összes érintett achievement egy menetben; a sorozat szint metrika,
+    # így a leghosszabb elért sorozat számít
+    metrikak = dict(metrikak or {})
+    metrikak.update({
+        Achievement.TIPUS_GYOZELEM: gyozelmek,
+        Achievement.TIPUS_VERESEG: veresegek,
+        Achievement.TIPUS_SOROZAT: profile.legmagasabb_sorozat,
+    })
+    achievementek_frissitese(user, metrikak, profile=profile, rangsor_index=False)
+    
+    # Mentés nélkül nincs post_save: az index az új adatokat (az achievement
+    # pontokkal együtt, amiket a profile példány is megkapott) egy bejegyzésből kapja
+    leaderboard_index.valtozas(
+        [leaderboard_index.RangsorSor(
+            user.id, user.username, profile.osszes_pontszam, profile.osszes_gyozelem,
+            profile.osszes_vereseg, profile.legmagasabb_sorozat,
+        )],
+        jatekos=profile.user_type == UserProfile.PERMISSION_PLAYER,
+    )
+
+
+def frissit_rangsort(user, gyozott, metrikak=None):
+    """
+    Frissíti a játékos rangsor statisztikáit.
+    
+    Args:
+        user: User objektum
+        gyozott: Boolean - igaz, ha a játékos nyert
+        metrikak: A harc további achievement metrikái (lásd harc_metrikak)
+    """
+    try:
+        profile = user.userprofile
+    except UserProfile.DoesNotExist:
+        # Ha nincs profil, létrehozzuk
+        UserProfile.objects.create(user=user)
+    else:
+        _eredmenyek_beirasa(user, profile, [gyozott], metrikak)
+    
+    szezon_frissites(user, [gyozott])
+
+
+def frissit_rangsort_tomegesen(user, eredmenyek, metrikak=None, idopontok=None):
+    """
+    Több harc rangsor hatása egyetlen profil UPDATE-tel és achievement körrel.
+    
+    Args:
+        user: User objektum
+        eredmenyek: A harcok kimenetele időrendben (True = győzelem)
+        metrikak: A harcok további achievement metrikái összesítve
+        idopontok: A harcok indítási ideje, ez dönti el a szezont
+    """
+    profile, created = UserProfile.objects.get_or_create(user=user)
+    _eredmenyek_beirasa(user, profile, eredmenyek, metrikak)
+    
+    szezon_frissites(user, eredmenyek, idopontok)
+
+
+def inicializal_achievementeket():
+    """
+    Létrehozza az alapértelmezett achievementeket, ha még nem léteznek.
+    """
+    alapertelmezett_achievementek = [
+        # Győzelmek
+        {
+            'nev': 'Első győzelem',
+            'leiras': 'Nyerd meg az első csatádat!',
+            'ikon': '🎯',
+            'tipus': 'gyozelem',
+            'cel_ertek': 1,
+            'pontok': 10
+        },
+        {
+            'nev': 'Veterán',
+            'leiras': 'Nyerj meg 10 csatát!',
+            'ikon': '⚔️',
+            'tipus': 'gyozelem',
+            'cel_ertek': 10,
+            'pontok': 50
+        },
+        {
+            'nev': 'Bajnok',
+            'leiras': 'Nyerj meg 50 csatát!',
+            'ikon': '👑',
+            'tipus': 'gyozelem',
+            'cel_ertek': 50,
+            'pontok': 200
+        },
+        {
+            'nev': 'Legenda',
+            'leiras': 'Nyerj meg 100 csatát!',
+            'ikon': '🏆',
+            'tipus': 'gyozelem',
+            'cel_ertek': 100,
+            'pontok': 500
+        },
+        # Sorozatok
+        {
+            'nev': 'Lendületben',
+            'leiras': 'Nyerj meg 3 csatát egymás után!',
+            'ikon': '🔥',
+            'tipus': 'sorozat',
+            'cel_ertek': 3,
+            'pontok': 25
+        },
+        {
+            'nev': 'Legyőzhetetlen',
+            'leiras': 'Nyerj meg 5 csatát egymás után!',
+            'ikon': '💪',
+            'tipus': 'sorozat',
+            'cel_ertek': 5,
+            'pontok': 75
+        },
+        {
+            'nev': 'Halhatatlan',
+            'leiras': 'Nyerj meg 10 csatát egymás után!',
+            'ikon': '⚡',
+            'tipus': 'sorozat',
+            'cel_ertek': 10,
+            'pontok': 250
+        },
+        # Kitartás
+        {
+            'nev': 'Kitartó',
+            'leiras': 'Veszíts el 10 csatát (nem add fel!)',
+            'ikon': '💔',
+            'tipus': 'vereseg',
+            'cel_ertek': 10,
+            'pontok': 20
+        },
+    ]
+    
+    for ach_data in alapertelmezett_achievementek:
+        Achievement.objects.get_or_create(
+            nev=ach_data['nev'],
+            defaults=ach_data
         )
\ No newline at end of file
@@ -0,0 +1,505 @@
+"""
+Processzen belüli rangsor index
+
+A játékosok rangsor adatai rendezett listában (pontszám, majd győzelmek
+szerint csökkenően, holtversenyben user id szerint), így a helyezés és egy
+rangsor szelet lekérése bisect-tel, a UserProfile tábla nélkül megy. Az
+indexet az első használat tölti fel a UserProfile táblából.
+
+Minden processznek saját indexe van, ezért minden rangsor változás (profil
+mentés, harc eredmény, achievement pont, törlés) egy RangsorValtozas
+bejegyzést ír az író tranzakciójában, a játékos új, abszolút adataival. Az
+író processz commit után helyben is bevezeti; a többi processz olvasáskor,
+legfeljebb SZINKRON_IDOKOZ-onként, csak az új bejegyzéseket kéri le és
+vezeti be, újratöltés nélkül. A még nem commitolt (kihagyott id-jú)
+bejegyzéseket ATFEDES-ig újra keresi. Végső biztosítékként az index
+ELETTARTAM-nál régebben sosem töltődik újra; a MEGORZES-nél régebbi
+bejegyzések törlődnek.
+
+Az ellenőrzést (leaderboard_index command) is egy bejegyzés kéri: az ezt látó
+processzek a saját, meglévő indexüket vetik össze az adatbázis rangsorával, a
+jelentést a közös cache-be teszik, majd újratöltik az indexet.
+"""
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Max, Q, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from .models import RangsorValtozas, UserProfile
+
+LEADERBOARD_GROUP = 'leaderboard'
+
+# A többi processz változásai legfeljebb ennyi késéssel jutnak be (másodperc)
+SZINKRON_IDOKOZ = 1.0
+
+# Ennyi ideig várunk egy kihagyott id-jú (még nem commitolt) bejegyzésre (másodperc)
+ATFEDES = 30
+
+# Az index legfeljebb ennyi ideig szolgál ki újratöltés nélkül (másodperc)
+ELETTARTAM = 3600
+
+# A napló bejegyzései ennyi ideig maradnak meg (másodperc); nagyobb, mint ELETTARTAM + ATFEDES
+MEGORZES = 4 * 3600
+TAKARITAS_IDOKOZ = 600
+
+# Az ellenőrzési jelentések a közös cache-ben: bejegyzés id-nként és processzenként
+_JELENTES_KULCS = 'damareen:rangsor_ellenorzes:{}:{}'
+JELENTES_IDO = 3600
+
+
+# Az élő rangsor ennyi első helyezést mutat
+TOP_N = 50
+
+
+def notify_leaderboard_changed(diff):
+    """
+    Broadcast one ranking change to every live leaderboard viewer.
+
+    Only viewers on the same channel layer get it: with more than one server
+    process CHANNEL_LAYERS has to be a shared layer (e.g. Redis).
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)(LEADERBOARD_GROUP, dict(diff, type='leaderboard.diff'))
+
+
+class RangsorSor:
+    """Egy játékos a rangsorban, a megjelenítéshez szükséges adatokkal"""
+    __slots__ = ('user_id', 'username', 'osszes_pontszam', 'osszes_gyozelem',
+                 'osszes_vereseg', 'legmagasabb_sorozat')
+
+    def __init__(self, user_id, username, osszes_pontszam, osszes_gyozelem,
+                 osszes_vereseg, legmagasabb_sorozat):
+        self.user_id = user_id
+        self.username = username
+        self.osszes_pontszam = osszes_pontszam
+        self.osszes_gyozelem = osszes_gyozelem
+        self.osszes_vereseg = osszes_vereseg
+        self.legmagasabb_sorozat = legmagasabb_sorozat
+
+    @classmethod
+    def profilbol(cls, profile):
+        return cls(profile.user_id, profile.user.username, profile.osszes_pontszam,
+                   profile.osszes_gyozelem, profile.osszes_vereseg, profile.legmagasabb_sorozat)
+
+    @property
+    def kulcs(self):
+        return (-self.osszes_pontszam, -self.osszes_gyozelem, self.user_id)
+
+    def ertekek(self):
+        return (self.username, self.osszes_pontszam, self.osszes_gyozelem,
+                self.osszes_vereseg, self.legmagasabb_sorozat)
+
+    def uzenet(self):
+        """A sor a rangsor websocket üzeneteiben"""
+        return {
+            'user_id': self.user_id,
+            'username': self.username,
+            'points': self.osszes_pontszam,
+            'wins': self.osszes_gyozelem,
+            'losses': self.osszes_vereseg,
+            'best_streak': self.legmagasabb_sorozat,
+        }
+
+    def get_gyozelem_arany(self):
+        """Győzelmi arány százalékban, mint a UserProfile-on"""
+        osszes_harc = self.osszes_gyozelem + self.osszes_vereseg
+        if osszes_harc == 0:
+            return 0
+        return round((self.osszes_gyozelem / osszes_harc) * 100, 1)
+
+
+_zar = threading.RLock()
+_kulcsok = []       # RangsorSor.kulcs-ok rendezve
+_sorok = None       # user id -> RangsorSor, None amíg nincs feltöltve
+_alkalmazott = {}   # user id -> az utolsó bevezetett bejegyzés id-ja
+_utolso_id = 0      # eddig ez az id volt a legnagyobb a naplóban
+_toltes_id = 0      # a feltöltéskor legnagyobb id (a korábbi ellenőrzés kéréseket már nem ez az index látta)
+_hezagok = {}       # kihagyott bejegyzés id -> az észlelés ideje (time.monotonic)
+_toltve = 0.0       # az utolsó feltöltés ideje (time.monotonic)
+_szinkron = 0.0     # az utolsó szinkron ideje (time.monotonic)
+_takaritva = 0.0    # az utolsó napló takarítás ideje (time.monotonic)
+
+
+def helyi_torles():
+    """A helyi index eldobása: a következő olvasás újratölti"""
+    global _kulcsok, _sorok
+    with _zar:
+        _kulcsok = []
+        _sorok = None
+        _alkalmazott.clear()
+        _hezagok.clear()
+
+
+def _betoltes():
+    return {
+        profile.user_id: RangsorSor.profilbol(profile)
+        for profile in UserProfile.objects.filter(
+            user_type=UserProfile.PERMISSION_PLAYER
+        ).select_related('user')
+    }
+
+
+def _ujratoltes():
+    """
+    Teljes feltöltés a UserProfile táblából. Hívó tartja a zárat.
+
+    A betöltés minden addig commitolt bejegyzést tartalmaz; az utolsó
+    ATFEDES-ben kihagyott id-k (a még nem commitolt változások) hézagként
+    várnak a szinkronra.
+    """
+    global _kulcsok, _sorok, _utolso_id, _toltes_id, _toltve, _szinkron
+    most = time.monotonic()
+    hatar = timezone.now() - timedelta(seconds=ATFEDES)
+    idk = RangsorValtozas.objects.aggregate(
+        regi=Max('id', filter=Q(letrehozva__lt=hatar)), utolso=Max('id')
+    )
+    regi, utolso = idk['regi'] or 0, idk['utolso'] or 0
+    latott = set(RangsorValtozas.objects.filter(id__gt=regi).values_list('id', flat=True))
+    sorok = _betoltes()
+    _kulcsok = sorted(sor.kulcs for sor in sorok.values())
+    _sorok = sorok
+    _alkalmazott.clear()
+    _hezagok.clear()
+    _hezagok.update((bejegyzes_id, most) for bejegyzes_id in range(regi + 1, utolso) if bejegyzes_id not in latott)
+    _utolso_id = _toltes_id = utolso
+    _toltve = _szinkron = most
+
+
+def _bevezetes(bejegyzes_id, sor, jatekos):
+    """
+    Egy bejegyzés (abszolút adatok) bevezetése a helyi indexbe. Hívó tartja a zárat.
+
+    Visszatérés: True, ha a rangsor (sorrend vagy megjelenített adat) változott
+    """
+    if bejegyzes_id is not None:
+        if bejegyzes_id <= _alkalmazott.get(sor.user_id, 0):
+            return False
+        _alkalmazott[sor.user_id] = bejegyzes_id
+    regi = _sorok.get(sor.user_id)
+    if jatekos and regi is not None and regi.ertekek() == sor.ertekek():
+        return False
+    if not jatekos and regi is None:
+        return False
+    if regi is not None:
+        del _kulcsok[bisect_left(_kulcsok, regi.kulcs)]
+        del _sorok[sor.user_id]
+    if jatekos:
+        _sorok[sor.user_id] = sor
+        insort(_kulcsok, sor.kulcs)
+    return True
+
+
+def _szinkronizalas():
+    """A többi processz új bejegyzéseinek bevezetése. Hívó tartja a zárat."""
+    global _utolso_id, _szinkron, _takaritva
+    most = time.monotonic()
+    _szinkron = most
+    for bejegyzes_id, eszlelve in list(_hezagok.items()):
+        if most - eszlelve > ATFEDES:
+            del _hezagok[bejegyzes_id]
+
+    feltetel = Q(id__gt=_utolso_id)
+    if _hezagok:
+        feltetel |= Q(id__in=list(_hezagok))
+    bejegyzesek = list(RangsorValtozas.objects.filter(feltetel).order_by('id').values_list(
+        'id', 'user_id', 'username', 'osszes_pontszam', 'osszes_gyozelem', 'osszes_vereseg',
+        'legmagasabb_sorozat', 'jatekos', 'ellenorzes',
+    ))
+
+    ellenorzesek = []
+    for bejegyzes_id, *adatok, jatekos, ellenorzes in bejegyzesek:
+        _hezagok.pop(bejegyzes_id, None)
+        if ellenorzes:
+            if bejegyzes_id > _toltes_id:
+                ellenorzesek.append(bejegyzes_id)
+        else:
+            _bevezetes(bejegyzes_id, RangsorSor(*adatok), jatekos)
+    if bejegyzesek and bejegyzesek[-1][0] > _utolso_id:
+        latott = {bejegyzes[0] for bejegyzes in bejegyzesek}
+        for bejegyzes_id in range(_utolso_id + 1, bejegyzesek[-1][0]):
+            if bejegyzes_id not in latott:
+                _hezagok[bejegyzes_id] = most
+        _utolso_id = bejegyzesek[-1][0]
+
+    if ellenorzesek:
+        jelentes = _osszevetes()
+        for bejegyzes_id in ellenorzesek:
+            _jelentes_kozzetetele(bejegyzes_id, jelentes)
+        _ujratoltes()
+
+    if most - _takaritva > TAKARITAS_IDOKOZ:
+        _takaritva = most
+        RangsorValtozas.objects.filter(
+            letrehozva__lt=timezone.now() - timedelta(seconds=MEGORZES)
+        ).delete()
+
+
+def _feltoltve():
+    with _zar:
+        most = time.monotonic()
+        if _sorok is None or most - _toltve > ELETTARTAM:
+            _ujratoltes()
+        if most - _szinkron >= SZINKRON_IDOKOZ:
+            _szinkronizalas()
+        return _sorok
+
+
+def _naplozas(sorok, jatekos):
+    """
+    Bejegyzések a hívó tranzakciójában, commit után helyi bevezetéssel.
+
+    Visszatérés: a bejegyzések
+    """
+    bejegyzesek = RangsorValtozas.objects.bulk_create([
+        RangsorValtozas(
+            user_id=sor.user_id, username=sor.username,
+            osszes_pontszam=sor.osszes_pontszam, osszes_gyozelem=sor.osszes_gyozelem,
+            osszes_vereseg=sor.osszes_vereseg, legmagasabb_sorozat=sor.legmagasabb_sorozat,
+            jatekos=jatekos,
+        )
+        for sor in sorok
+    ])
+    transaction.on_commit(lambda: _helyi_bevezetes(
+        [(bejegyzes.id, sor) for bejegyzes, sor in zip(bejegyzesek, sorok)], jatekos
+    ))
+    return bejegyzesek
+
+
+def _helyi_bevezetes(bejegyzesek, jatekos):
+    """
+    Commit után: a bejegyzések bevezetése a helyi indexbe, és tényleges
+    változásnál egyetlen diff az élő rangsor nézőknek (lásd _diff).
+    """
+    with _zar:
+        if _sorok is None:
+            # Nincs mihez mérni: a betöltött index már a változás utáni, a nézők a teljes top N-et kapják
+            _feltoltve()
+            diff = {
+                'top': {str(pozicio): sor.uzenet() for pozicio, sor in enumerate(szelet(0, TOP_N))},
+                'size': min(len(_kulcsok), TOP_N),
+                'players': None,
+            }
+        else:
+            elotte = szelet(0, TOP_N)
+            regi = {sor.user_id: _sorok.get(sor.user_id) for _, sor in bejegyzesek}
+            _feltoltve()
+            for bejegyzes_id, sor in bejegyzesek:
+                _bevezetes(bejegyzes_id, sor, jatekos)
+            diff = _diff(elotte, regi, bejegyzesek)
+    if diff is not None:
+        notify_leaderboard_changed(diff)
+
+
+def _diff(elotte, regi, bejegyzesek):
+    """
+    A változás a nézőknek. Hívó tartja a zárat.
+
+    top: a top N megváltozott pozíciói (pozíció -> sor), size: a top N hossza,
+    players: a játékosok régi és új (pontszám, győzelmek) kulcsa és új sora a
+    helyezéssel, hogy a nézők a saját helyezésüket index nélkül igazíthassák.
+    None, ha semmi sem változott.
+    """
+    utana = szelet(0, TOP_N)
+    top = {
+        str(pozicio): sor.uzenet() for pozicio, sor in enumerate(utana)
+        if pozicio >= len(elotte) or elotte[pozicio] is not sor
+    }
+    jatekosok = []
+    for bejegyzes_id, sor in bejegyzesek:
+        elozo, uj = regi[sor.user_id], _sorok.get(sor.user_id)
+        if elozo is uj:
+            continue
+        jatekosok.append({
+            'id': bejegyzes_id,
+            'user_id': sor.user_id,
+            'old': None if elozo is None else [elozo.osszes_pontszam, elozo.osszes_gyozelem],
+            'new': None if uj is None else [uj.osszes_pontszam, uj.osszes_gyozelem],
+            'row': None if uj is None else dict(uj.uzenet(), rank=rang(sor.user_id)),
+        })
+    if not top and not jatekosok and len(utana) == len(elotte):
+        return None
+    return {'top': top, 'size': len(utana), 'players': jatekosok}
+
+
+def valtozas(sorok, jatekos=True):
+    """
+    Játékosok új adatainak rögzítése a naplóban (a hívó tranzakciójában).
+
+    Az író processz indexe commit után azonnal, a többié a következő
+    szinkronnál kapja meg; tényleges változásnál az élő rangsor nézők
+    értesítést kapnak.
+
+    Args:
+        sorok: RangsorSor lista a játékosok mentett (abszolút) adataival
+        jatekos: False esetén (pl. játékmester, törölt profil) a sorok kikerülnek a rangsorból
+    """
+    if sorok:
+        _naplozas(list(sorok), jatekos)
+
+
+def profilok_valtozasa(user_ids):
+    """A profilok aktuális adatainak rögzítése (pl. egy mentés nélküli UPDATE után)"""
+    valtozas([
+        RangsorSor.profilbol(profile)
+        for profile in UserProfile.objects.filter(
+            user_id__in=user_ids, user_type=UserProfile.PERMISSION_PLAYER
+        ).select_related('user')
+    ])
+
+
+def torles(user_id, username=''):
+    """A játékos eltávolítása a rangsorból (a hívó tranzakciójában)"""
+    valtozas([RangsorSor(user_id, username, 0, 0, 0, 0)], jatekos=False)
+
+
+def rang(user_id):
+    """A játékos helyezése (holtversenyben azonos), vagy None, ha nincs a rangsorban"""
+    with _zar:
+        sor = _feltoltve().get(user_id)
+        if sor is None:
+            return None
+        return bisect_left(_kulcsok, (-sor.osszes_pontszam, -sor.osszes_gyozelem)) + 1
+
+
+def sor(user_id):
+    """A játékos RangsorSor-a, vagy None"""
+    with _zar:
+        return _feltoltve().get(user_id)
+
+
+def szelet(tol=0, ig=50):
+    """A rangsor [tol, ig) szelete RangsorSor listaként"""
+    with _zar:
+        sorok = _feltoltve()
+        return [sorok[kulcs[2]] for kulcs in _kulcsok[tol:ig]]
+
+
+def _rangozott(tol, ig):
+    # Hívó tartja a zárat; a helyezés holtversenyben az első azonos kulcs pozíciója
+    return [
+        (bisect_left(_kulcsok, kulcs[:2]) + 1, _sorok[kulcs[2]])
+        for kulcs in _kulcsok[tol:ig]
+    ]
+
+
+def oldal(utan=None, darab=50):
+    """
+    A rangsor egy oldala kulcs alapú lapozással (OFFSET nélkül).
+
+    Args:
+        utan: Az előző oldal utolsó sorának (pontszám, győzelmek, user id) kulcsa, None az elejéhez
+        darab: A sorok száma
+
+    Visszatérés: ((helyezés, RangsorSor) lista, a következő oldal kulcsa vagy None)
+    """
+    with _zar:
+        _feltoltve()
+        tol = 0
+        if utan is not None:
+            pontszam, gyozelmek, user_id = utan
+            tol = bisect_left(_kulcsok, (-pontszam, -gyozelmek, user_id + 1))
+        sorok = _rangozott(tol, tol + darab)
+        kovetkezo = None
+        if tol + darab < len(_kulcsok) and sorok:
+            utolso = sorok[-1][1]
+            kovetkezo = (utolso.osszes_pontszam, utolso.osszes_gyozelem, utolso.user_id)
+        return sorok, kovetkezo
+
+
+def kornyezet(user_id, n=5):
+    """
+    A játékos körüli ablak: n sor előtte és n utána.
+
+    Visszatérés: (helyezés, RangsorSor) lista, vagy None, ha a játékos nincs a rangsorban
+    """
+    with _zar:
+        sor = _feltoltve().get(user_id)
+        if sor is None:
+            return None
+        pozicio = bisect_left(_kulcsok, sor.kulcs)
+        return _rangozott(max(0, pozicio - n), pozicio + n + 1)
+
+
+def pillanatkep(user_id=None):
+    """
+    Az élő rangsor kezdő állapota egy lépésben.
+
+    Visszatérés: (top N sor üzenetként, a néző sora helyezéssel vagy None,
+        a szinkronban utoljára látott napló id: az ennél nem nagyobb id-jú
+        változásokat a pillanatkép már tartalmazza)
+    """
+    with _zar:
+        top = [sor.uzenet() for sor in szelet(0, TOP_N)]
+        sajat = _sorok.get(user_id) if user_id is not None else None
+        if sajat is not None:
+            sajat = dict(sajat.uzenet(), rank=rang(user_id))
+        return top, sajat, _utolso_id
+
+
+def meret():
+    """A rangsorban szereplő játékosok száma"""
+    with _zar:
+        return len(_feltoltve())
+
+
+def _osszevetes():
+    """
+    A helyi index összevetése az adatbázis saját (RANK() ablakfüggvénnyel
+    számolt) rangsorával. Hívó tartja a zárat.
+
+    Visszatérés: dict (hianyzo, folosleges, elteres: user id listák, meret)
+    """
+    index_rangok = {sor.user_id: rang for rang, sor in _rangozott(0, len(_kulcsok))}
+    db_rangok = dict(
+        UserProfile.objects.filter(user_type=UserProfile.PERMISSION_PLAYER).annotate(
+            rang=Window(Rank(), order_by=[F('osszes_pontszam').desc(), F('osszes_gyozelem').desc()])
+        ).values_list('user_id', 'rang')
+    )
+    return {
+        'hianyzo': sorted(db_rangok.keys() - index_rangok.keys()),
+        'folosleges': sorted(index_rangok.keys() - db_rangok.keys()),
+        'elteres': sorted(
+            user_id for user_id in db_rangok.keys() & index_rangok.keys()
+            if db_rangok[user_id] != index_rangok[user_id]
+        ),
+        'meret': len(index_rangok),
+    }
+
+
+def _jelentes_kozzetetele(bejegyzes_id, jelentes):
+    # Processzenként egy szabad sorszám a bejegyzés alatt
+    jelentes = dict(jelentes, processz=f'{socket.gethostname()}:{os.getpid()}')
+    sorszam = 1
+    while not cache.add(_JELENTES_KULCS.format(bejegyzes_id, sorszam), jelentes, JELENTES_IDO):
+        sorszam += 1
+
+
+def ellenorzes_kerese():
+    """
+    Ellenőrzés kérése a futó processzektől: mindegyik, amelynek van indexe, a
+    következő szinkronnál összeveti azt az adatbázissal, jelent, és újratölti.
+
+    Visszatérés: a kérés azonosítója (ellenorzes_jelentesei-hez)
+    """
+    return RangsorValtozas.objects.create(user_id=0, jatekos=False, ellenorzes=True).id
+
+
+def ellenorzes_jelentesei(azonosito):
+    """Az ellenőrzési kérésre eddig beérkezett jelentések (processzenként egy dict)"""
+    jelentesek = []
+    while True:
+        jelentes = cache.get(_JELENTES_KULCS.format(azonosito, len(jelentesek) + 1))
+        if jelentes is None:
+            return jelentesek
+        jelentesek.append(jelentes)
@@ -0,0 +1,56 @@
+"""
+Management command a kártya-kazamata balansz mátrix kiszámolásához
+
+A műszerfal nem számol, csak ennek az eredményét mutatja. Időzítve (pl. cron)
+--ha-elavult kapcsolóval érdemes futtatni: akkor csak elavult vagy hiányzó
+mátrixot számol újra.
+"""
+import csv
+
+from django.core.management.base import BaseCommand
+from damareen.balance import balansz_frissites, balansz_matrix
+
+
+class Command(BaseCommand):
+    help = 'Kiszámolja a világkártyák és kazamata kártyák győzelmi mátrixát és a kazamaták nehézségét'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv', help='A teljes mátrix kiírása ebbe a CSV fájlba')
+        parser.add_argument(
+            '--ha-elavult',
+            action='store_true',
+            help='Csak akkor számol, ha a cache-elt mátrix hiányzik vagy elavult'
+        )
+
+    def handle(self, *args, **options):
+        if options['ha_elavult'] and not balansz_matrix()[1]:
+            self.stdout.write('A balansz mátrix friss, nincs mit számolni.')
+            return
+        
+        self.stdout.write('Balansz mátrix számítása...')
+        
+        balansz = balansz_frissites()
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {balansz["kartyak_szama"]} világkártya × {balansz["oszlopok_szama"]} kazamata kártya '
+            f'kiszámolva {balansz["ido_ms"]} ms alatt'
+        ))
+        
+        self.stdout.write('\nKazamaták nehézség szerint:')
+        for kazamata in balansz['kazamatak']:
+            self.stdout.write(
+                f'  {kazamata["nehezseg"]:5.1f}%  {kazamata["nev"]} ({kazamata["tipus"]}), '
+                f'legnehezebb: {kazamata["legnehezebb_kartya"]}'
+            )
+        
+        if options['csv']:
+            matrix = balansz['matrix']
+            nevek = {kartya['id']: kartya['nev'] for kartya in balansz['kartyak']}
+            with open(options['csv'], 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow([''] + [nev for _, _, nev in matrix['oszlopok']])
+                for kartya_id, maszk in zip(matrix['sorok'], matrix['gyozelmek']):
+                    writer.writerow([nevek[kartya_id]] + [
+                        1 if maszk >> oszlop & 1 else 0 for oszlop in range(len(matrix['oszlopok']))
+                    ])
+            self.stdout.write(self.style.SUCCESS(f'\n✅ Mátrix kiírva: {options["csv"]}'))
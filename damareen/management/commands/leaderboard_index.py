@@ -0,0 +1,46 @@
+"""
+Management command a futó processzek rangsor indexeinek ellenőrzéséhez
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from damareen import leaderboard_index
+
+
+class Command(BaseCommand):
+    help = ('A futó processzek a saját rangsor indexüket összevetik az adatbázis saját rangsorával, '
+            'jelentenek, majd újratöltik az indexet')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--varakozas', type=float, default=5 * leaderboard_index.SZINKRON_IDOKOZ,
+                            help='Ennyi ideig várunk a processzek jelentésére (másodperc)')
+
+    def handle(self, *args, **options):
+        azonosito = leaderboard_index.ellenorzes_kerese()
+        self.stdout.write(f'Ellenőrzés kérve (#{azonosito}), várakozás a processzekre...')
+        time.sleep(options['varakozas'])
+        jelentesek = leaderboard_index.ellenorzes_jelentesei(azonosito)
+        
+        if not jelentesek:
+            self.stdout.write(self.style.WARNING(
+                '⚠️ Egyik processz sem jelentett: a várakozás alatt egyik sem szolgált ki rangsort '
+                '(a következő olvasásnál jelentenek és újratöltenek)'
+            ))
+            return
+        
+        for jelentes in jelentesek:
+            elteres = len(jelentes['hianyzo']) + len(jelentes['folosleges']) + len(jelentes['elteres'])
+            for cim, kulcs in (('Hiányzó', 'hianyzo'), ('Fölösleges', 'folosleges'), ('Eltérő helyezésű', 'elteres')):
+                if jelentes[kulcs]:
+                    self.stdout.write(f'  {cim} játékosok (user id): {", ".join(map(str, jelentes[kulcs]))}')
+            
+            if elteres:
+                self.stdout.write(self.style.WARNING(
+                    f'⚠️ {jelentes["processz"]}: {elteres} eltérés az index és az adatbázis rangsora között '
+                    f'({jelentes["meret"]} játékos az indexben)'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'✅ {jelentes["processz"]}: az index egyezik az adatbázis rangsorával ({jelentes["meret"]} játékos)'
+                ))
+        self.stdout.write('A jelentő processzek újratöltötték az indexüket.')
@@ -0,0 +1,33 @@
+"""
+Management command a várakozó harc események feldolgozásához
+"""
+from django.core.management.base import BaseCommand
+from damareen.battle_events import FELDOLGOZASI_IDOKOZ, folyamatos_kiurites, kiurites
+from damareen.models import HarcEsemeny
+
+
+class Command(BaseCommand):
+    help = ('Feldolgozza a várakozó harc eseményeket (rangsor, sorozat, achievementek); '
+            '--folyamatos módban ez a dedikált feldolgozó')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--folyamatos', action='store_true',
+                            help='Leállításig fut, és rendszeresen kiüríti a táblát')
+        parser.add_argument('--idokoz', type=float, default=FELDOLGOZASI_IDOKOZ,
+                            help='Folyamatos módban a körök közötti szünet (másodperc)')
+
+    def handle(self, *args, **options):
+        if options['folyamatos']:
+            self.stdout.write(f'Harc esemény feldolgozó fut ({options["idokoz"]} mp-enként), leállítás: Ctrl+C')
+            try:
+                folyamatos_kiurites(options['idokoz'])
+            except KeyboardInterrupt:
+                pass
+            return
+
+        self.stdout.write(f'{HarcEsemeny.objects.count()} várakozó esemény...')
+        feldolgozott = kiurites()
+        maradt = HarcEsemeny.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'✅ {feldolgozott} esemény feldolgozva'))
+        if maradt:
+            self.stdout.write(self.style.WARNING(f'⚠️ {maradt} esemény sikertelen, a naplóban a részletek'))
@@ -0,0 +1,26 @@
+"""
+Management command egy szezon rangsorának újraszámolásához a harc előzményekből
+"""
+from django.core.management.base import BaseCommand, CommandError
+from damareen.models import Szezon
+from damareen.seasons import szezon_ujraszamolas
+
+
+class Command(BaseCommand):
+    help = 'Újraszámolja egy szezon rangsorát a befejezett harcokból'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--szezon', type=int, help='A szezon id-ja (alapértelmezés: az aktív szezon)')
+        parser.add_argument('--darab', type=int, default=2000, help='Egyszerre beolvasott harcok száma')
+
+    def handle(self, *args, **options):
+        if options['szezon']:
+            szezon = Szezon.objects.filter(id=options['szezon']).first()
+        else:
+            szezon = Szezon.aktualis()
+        if szezon is None:
+            raise CommandError('Nincs ilyen szezon!')
+        
+        self.stdout.write(f'{szezon.nev} újraszámolása...')
+        jatekosok = szezon_ujraszamolas(szezon, options['darab'])
+        self.stdout.write(self.style.SUCCESS(f'✅ {jatekosok} játékos eredménye újraszámolva'))
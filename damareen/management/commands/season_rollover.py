@@ -0,0 +1,21 @@
+"""
+Management command a szezon váltáshoz
+"""
+from django.core.management.base import BaseCommand
+from damareen.seasons import szezon_valtas
+
+
+class Command(BaseCommand):
+    help = 'Lezárja az aktív szezont a végső helyezésekkel, és új szezont indít'
+
+    def add_arguments(self, parser):
+        parser.add_argument('nev', help='Az új szezon neve')
+
+    def handle(self, *args, **options):
+        lezart, uj = szezon_valtas(options['nev'])
+        
+        if lezart is not None:
+            self.stdout.write(self.style.SUCCESS(
+                f'✅ {lezart.nev} lezárva ({lezart.eredmenyek.count()} játékos)'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'✅ {uj.nev} elindult'))
@@ -0,0 +1,93 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+# A régi szöveges okok kezdete -> ok kód (a típus előnynél a nyertes dönt)
+SEBZES_GYOZELEM = 1
+SEBZES_VERESEG = 2
+TIPUS_ELONY = 3
+TIPUS_HATRANY = 4
+DONTETLEN = 5
+
+ELEMENT_NEVEK = {'tuz': 'Tűz', 'fold': 'Föld', 'viz': 'Víz', 'levego': 'Levegő'}
+
+
+def szoveg_kodda(apps, schema_editor):
+    Utközet = apps.get_model('damareen', 'Utközet')
+    modositott = []
+    for utközet in Utközet.objects.only('id', 'jatekos_nyert', 'gyoztes_ok').iterator(chunk_size=2000):
+        ok = utközet.gyoztes_ok
+        if ok.startswith('Játékos sebzése'):
+            utközet.gyoztes_ok_kod = SEBZES_GYOZELEM
+        elif ok.startswith('Kazamata sebzése'):
+            utközet.gyoztes_ok_kod = SEBZES_VERESEG
+        elif ok.startswith('Típus előny'):
+            utközet.gyoztes_ok_kod = TIPUS_ELONY if utközet.jatekos_nyert else TIPUS_HATRANY
+        else:
+            utközet.gyoztes_ok_kod = DONTETLEN
+        modositott.append(utközet)
+        if len(modositott) >= 2000:
+            Utközet.objects.bulk_update(modositott, ['gyoztes_ok_kod'])
+            modositott = []
+    if modositott:
+        Utközet.objects.bulk_update(modositott, ['gyoztes_ok_kod'])
+
+
+def kod_szovegge(apps, schema_editor):
+    Utközet = apps.get_model('damareen', 'Utközet')
+    modositott = []
+    for u in Utközet.objects.iterator(chunk_size=2000):
+        j_nev = ELEMENT_NEVEK.get(u.jatekos_tipus, u.jatekos_tipus)
+        k_nev = ELEMENT_NEVEK.get(u.kazamata_tipus, u.kazamata_tipus)
+        if u.gyoztes_ok_kod == SEBZES_GYOZELEM:
+            u.gyoztes_ok = f"Játékos sebzése ({u.jatekos_sebzes}) > Kazamata életereje ({u.kazamata_eletero})"
+        elif u.gyoztes_ok_kod == SEBZES_VERESEG:
+            u.gyoztes_ok = f"Kazamata sebzése ({u.kazamata_sebzes}) > Játékos életereje ({u.jatekos_eletero})"
+        elif u.gyoztes_ok_kod == TIPUS_ELONY:
+            u.gyoztes_ok = f"Típus előny: {j_nev} > {k_nev}"
+        elif u.gyoztes_ok_kod == TIPUS_HATRANY:
+            u.gyoztes_ok = f"Típus előny: {k_nev} > {j_nev}"
+        else:
+            u.gyoztes_ok = "Döntetlen esetén a kazamata nyer"
+        modositott.append(u)
+        if len(modositott) >= 2000:
+            Utközet.objects.bulk_update(modositott, ['gyoztes_ok'])
+            modositott = []
+    if modositott:
+        Utközet.objects.bulk_update(modositott, ['gyoztes_ok'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('damareen', '0003_harc_rangsor_frissitve'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='utközet',
+            name='gyoztes_ok_kod',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='utközet',
+            name='gyoztes_ok',
+            field=models.TextField(blank=True, default='', verbose_name='Győztes oka'),
+        ),
+        migrations.RunPython(szoveg_kodda, kod_szovegge),
+        migrations.RemoveField(
+            model_name='utközet',
+            name='gyoztes_ok',
+        ),
+        migrations.RenameField(
+            model_name='utközet',
+            old_name='gyoztes_ok_kod',
+            new_name='gyoztes_ok',
+        ),
+        migrations.AlterField(
+            model_name='utközet',
+            name='gyoztes_ok',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Játékos sebzése nagyobb a kazamata életerejénél'), (2, 'Kazamata sebzése nagyobb a játékos életerejénél'), (3, 'Típus előny'), (4, 'Típus hátrány'), (5, 'Döntetlen esetén a kazamata nyer')], verbose_name='Győztes oka'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('damareen', '0004_utkozet_gyoztes_ok_kod'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['user_type', '-osszes_pontszam', '-osszes_gyozelem'], name='userprofile_rangsor_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('damareen', '0005_userprofile_rangsor_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Szezon',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nev', models.CharField(max_length=100, verbose_name='Név')),
+                ('kezdet', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Kezdet')),
+                ('veg', models.DateTimeField(blank=True, null=True, verbose_name='Vége')),
+            ],
+            options={
+                'verbose_name': 'Szezon',
+                'verbose_name_plural': 'Szezonok',
+                'ordering': ['-kezdet'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SzezonEredmeny',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pontszam', models.IntegerField(default=0, verbose_name='Pontszám')),
+                ('gyozelmek', models.IntegerField(default=0, verbose_name='Győzelmek')),
+                ('veresegek', models.IntegerField(default=0, verbose_name='Vereségek')),
+                ('jelenlegi_sorozat', models.IntegerField(default=0, verbose_name='Jelenlegi győzelmi sorozat')),
+                ('legmagasabb_sorozat', models.IntegerField(default=0, verbose_name='Leghosszabb győzelmi sorozat')),
+                ('helyezes', models.IntegerField(blank=True, null=True, verbose_name='Végső helyezés')),
+                ('jatekos', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='szezon_eredmenyek', to=settings.AUTH_USER_MODEL)),
+                ('szezon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eredmenyek', to='damareen.szezon')),
+            ],
+            options={
+                'verbose_name': 'Szezon eredmény',
+                'verbose_name_plural': 'Szezon eredmények',
+                'ordering': ['-pontszam', '-gyozelmek'],
+                'indexes': [models.Index(fields=['szezon', '-pontszam', '-gyozelmek'], name='szezoneredmeny_rangsor_idx')],
+                'unique_together': {('szezon', 'jatekos')},
+            },
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:22
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# A régi, szabályonként kódolt sorozat típusok: típus -> sorozat hossz
+REGI_SOROZATOK = {'3_sorozat': 3, '5_sorozat': 5, '10_sorozat': 10}
+
+
+def metrikak_feltoltese(apps, schema_editor):
+    Achievement = apps.get_model('damareen', 'Achievement')
+    PlayerAchievement = apps.get_model('damareen', 'PlayerAchievement')
+    JatekosMetrika = apps.get_model('damareen', 'JatekosMetrika')
+    UserProfile = apps.get_model('damareen', 'UserProfile')
+    Harc = apps.get_model('damareen', 'Harc')
+    Utközet = apps.get_model('damareen', 'Utközet')
+
+    # Sorozat achievementek: a cél érték a sorozat hossza, a haladás az elért sorozat
+    for tipus, hossz in REGI_SOROZATOK.items():
+        for achievement in Achievement.objects.filter(tipus=tipus):
+            PlayerAchievement.objects.filter(achievement=achievement, jelenlegi_haladás__gte=achievement.cel_ertek).update(
+                jelenlegi_haladás=hossz
+            )
+            PlayerAchievement.objects.filter(achievement=achievement, jelenlegi_haladás__lt=hossz).update(
+                jelenlegi_haladás=0
+            )
+            achievement.tipus = 'sorozat'
+            achievement.cel_ertek = hossz
+            achievement.save(update_fields=['tipus', 'cel_ertek'])
+
+    metrikak = []
+    for user_id, gyozelem, vereseg, sorozat in UserProfile.objects.values_list(
+            'user_id', 'osszes_gyozelem', 'osszes_vereseg', 'legmagasabb_sorozat'):
+        for kulcs, ertek in (('gyozelem', gyozelem), ('vereseg', vereseg), ('sorozat', sorozat)):
+            if ertek:
+                metrikak.append(JatekosMetrika(jatekos_id=user_id, kulcs=kulcs, ertek=ertek))
+
+    # A rangsorba már beszámított harcokból
+    gyozelmek = Harc.objects.filter(befejezve=True, rangsor_frissitve=True, jatekos_gyozott=True).order_by()
+    for user_id, kazamata_id, db in gyozelmek.values_list('jatek__jatekos_id', 'kazamata_id').annotate(db=Count('id')):
+        metrikak.append(JatekosMetrika(jatekos_id=user_id, kulcs=f'kazamata_gyozelem:{kazamata_id}', ertek=db))
+    for user_id, tipus, db in gyozelmek.values_list('jatek__jatekos_id', 'kazamata__tipus').annotate(db=Count('id')):
+        metrikak.append(JatekosMetrika(jatekos_id=user_id, kulcs=f'kazamata_tipus_gyozelem:{tipus}', ertek=db))
+    for user_id, elem, db in Utközet.objects.filter(
+            harc__befejezve=True, harc__rangsor_frissitve=True, jatekos_nyert=True
+    ).order_by().values_list('harc__jatek__jatekos_id', 'jatekos_tipus').annotate(db=Count('id')):
+        metrikak.append(JatekosMetrika(jatekos_id=user_id, kulcs=f'elem_utkozet:{elem}', ertek=db))
+
+    JatekosMetrika.objects.bulk_create(metrikak, batch_size=2000)
+
+
+def sorozatok_visszaallitasa(apps, schema_editor):
+    Achievement = apps.get_model('damareen', 'Achievement')
+    PlayerAchievement = apps.get_model('damareen', 'PlayerAchievement')
+    for tipus, hossz in REGI_SOROZATOK.items():
+        for achievement in Achievement.objects.filter(tipus='sorozat', cel_ertek=hossz, parameter=''):
+            PlayerAchievement.objects.filter(achievement=achievement, jelenlegi_haladás__gte=hossz).update(
+                jelenlegi_haladás=1
+            )
+            achievement.tipus = tipus
+            achievement.cel_ertek = 1
+            achievement.save(update_fields=['tipus', 'cel_ertek'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('damareen', '0006_szezonok'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievement',
+            name='parameter',
+            field=models.CharField(blank=True, max_length=50, verbose_name='Paraméter'),
+        ),
+        migrations.AlterField(
+            model_name='achievement',
+            name='cel_ertek',
+            field=models.IntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Cél érték'),
+        ),
+        migrations.AlterField(
+            model_name='achievement',
+            name='tipus',
+            field=models.CharField(choices=[('gyozelem', 'Győzelmek'), ('vereseg', 'Vereségek'), ('sorozat', 'Leghosszabb győzelmi sorozat'), ('kazamata_gyozelem', 'Győzelmek egy kazamatán (paraméter: kazamata id)'), ('kazamata_tipus_gyozelem', 'Győzelmek egy kazamata típuson (paraméter: kazamata típus)'), ('elem_utkozet', 'Megnyert ütközetek egy elemmel (paraméter: elem)')], max_length=50, verbose_name='Típus'),
+        ),
+        migrations.CreateModel(
+            name='JatekosMetrika',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kulcs', models.CharField(max_length=101, verbose_name='Kulcs')),
+                ('ertek', models.IntegerField(default=0, verbose_name='Érték')),
+                ('jatekos', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metrikak', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Játékos metrika',
+                'verbose_name_plural': 'Játékos metrikák',
+                'unique_together': {('jatekos', 'kulcs')},
+            },
+        ),
+        migrations.RunPython(metrikak_feltoltese, sorozatok_visszaallitasa),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('damareen', '0007_achievement_metrikak'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HarcEsemeny',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jatekos_gyozott', models.BooleanField(verbose_name='Játékos győzött')),
+                ('metrikak', models.JSONField(blank=True, default=dict, verbose_name='Achievement metrikák')),
+                ('letrehozva', models.DateTimeField(auto_now_add=True, verbose_name='Létrehozva')),
+                ('harc', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='esemeny', to='damareen.harc')),
+                ('jatekos', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='harc_esemenyek', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Harc esemény',
+                'verbose_name_plural': 'Harc események',
+                'ordering': ['id'],
+            },
+        ),
+    ]
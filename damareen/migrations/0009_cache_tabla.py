@@ -0,0 +1,19 @@
+from django.core.management import call_command
+from django.db import migrations
+
+
+def cache_tabla(apps, schema_editor):
+    # A settings.CACHES adatbázis cache táblája (lásd belyegek.py), így a
+    # migrate magában elég; a createcachetable a meglévő táblát kihagyja
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('damareen', '0008_harc_esemeny'),
+    ]
+
+    operations = [
+        migrations.RunPython(cache_tabla, migrations.RunPython.noop),
+    ]
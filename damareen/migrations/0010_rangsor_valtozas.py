@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('damareen', '0009_cache_tabla'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RangsorValtozas',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.IntegerField(verbose_name='User id')),
+                ('username', models.CharField(blank=True, max_length=150, verbose_name='Felhasználónév')),
+                ('osszes_pontszam', models.IntegerField(default=0, verbose_name='Összes pontszám')),
+                ('osszes_gyozelem', models.IntegerField(default=0, verbose_name='Összes győzelem')),
+                ('osszes_vereseg', models.IntegerField(default=0, verbose_name='Összes vereség')),
+                ('legmagasabb_sorozat', models.IntegerField(default=0, verbose_name='Leghosszabb győzelmi sorozat')),
+                ('jatekos', models.BooleanField(default=True, verbose_name='Játékos')),
+                ('ellenorzes', models.BooleanField(default=False, verbose_name='Ellenőrzés')),
+                ('letrehozva', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Létrehozva')),
+            ],
+            options={
+                'verbose_name': 'Rangsor változás',
+                'verbose_name_plural': 'Rangsor változások',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+"""
+Kampány tervező
+
+Megkeresi, hogy mely kazamatákat kell legyőzni és melyik kártyát kell
+fejleszteni a jutalmakkal ahhoz, hogy egy cél kazamata legyőzhető legyen,
+a lehető legkevesebb harccal. Best-first keresés a gyűjtemény stat
+vektorain; az azonos stat multihalmazú állapotokat csak egyszer bontjuk ki,
+a legyőzhetőség pedig a pakli optimalizáló memoizált eredményéből jön.
+"""
+import heapq
+from itertools import count
+
+from .battle_engine import szukseges_gyozelmek
+from .deck_solver import max_gyozelmek
+
+
+def legyozheto(kartya_statok, kazamata_statok):
+    """Igaz, ha a kártyákból összerakható olyan pakli, ami legyőzi a kazamatát"""
+    if len(kartya_statok) < len(kazamata_statok):
+        return False
+    return max_gyozelmek(kartya_statok, kazamata_statok) >= szukseges_gyozelmek(len(kazamata_statok))
+
+
+def kampany_terv(kartya_statok, kazamatak, cel_index, max_csatak=10, max_allapot=20000):
+    """
+    A legkevesebb harcból álló terv a cél kazamata legyőzhetővé tételéhez.
+    
+    Args:
+        kartya_statok: a gyűjtemény kártyáinak (sebzés, életerő, típus) statjai
+        kazamatak: (kazamata statok, (+sebzés, +életerő) jutalom) párok listája
+        cel_index: a cél kazamata indexe a kazamatak listában
+        max_csatak: ennél hosszabb terveket nem keresünk
+        max_allapot: legfeljebb ennyi különböző gyűjtemény állapotot bontunk ki
+    
+    Visszatérés: (kazamata index, fejlesztett kártya index) lépések listája,
+    üres lista, ha a cél már most legyőzhető, vagy None, ha nincs terv a korlátokon belül
+    """
+    cel_statok = kazamatak[cel_index][0]
+    szukseges = szukseges_gyozelmek(len(cel_statok))
+    kezdo = tuple(kartya_statok)
+    if legyozheto(kezdo, cel_statok):
+        return []
+    
+    def kulcs(allapot):
+        # Az azonos statú kártyák felcserélhetők
+        return tuple(sorted(allapot))
+    
+    def haladas(allapot):
+        # Minél több ütközet nyerhető a cél ellen, annál előbb bontjuk ki
+        return min(max_gyozelmek(allapot, cel_statok), szukseges)
+    
+    sorszam = count()
+    kezdo_kulcs = kulcs(kezdo)
+    # kulcs -> (konkrét állapot, előző kulcs, lépés)
+    latott = {kezdo_kulcs: (kezdo, None, None)}
+    sor = [(0, -haladas(kezdo), next(sorszam), kezdo_kulcs)]
+    
+    while sor and len(latott) < max_allapot:
+        csatak, _, _, allapot_kulcs = heapq.heappop(sor)
+        if csatak >= max_csatak:
+            continue
+        allapot = latott[allapot_kulcs][0]
+        
+        # Jutalmanként elég egy legyőzhető kazamata
+        jutalmak = {}
+        for index, (kazamata_statok, jutalom) in enumerate(kazamatak):
+            if jutalom not in jutalmak and jutalom != (0, 0) and legyozheto(allapot, kazamata_statok):
+                jutalmak[jutalom] = index
+        
+        # Statonként elég egy kártyát fejleszteni
+        kartyak = {}
+        for index, stat in enumerate(allapot):
+            kartyak.setdefault(stat, index)
+        
+        for (plusz_sebzes, plusz_eletero), kazamata_index in jutalmak.items():
+            for (sebzes, eletero, tipus), kartya_index in kartyak.items():
+                uj = list(allapot)
+                uj[kartya_index] = (sebzes + plusz_sebzes, eletero + plusz_eletero, tipus)
+                uj = tuple(uj)
+                uj_kulcs = kulcs(uj)
+                if uj_kulcs in latott:
+                    continue
+                latott[uj_kulcs] = (uj, allapot_kulcs, (kazamata_index, kartya_index))
+                
+                if legyozheto(uj, cel_statok):
+                    return _lepesek(latott, uj_kulcs)
+                heapq.heappush(sor, (csatak + 1, -haladas(uj), next(sorszam), uj_kulcs))
+    
+    return None
+
+
+def _lepesek(latott, kulcs):
+    lepesek = []
+    while latott[kulcs][1] is not None:
+        _, elozo, lepes = latott[kulcs]
+        lepesek.append(lepes)
+        kulcs = elozo
+    lepesek.reverse()
+    return lepesek
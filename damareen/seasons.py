@@ -0,0 +1,162 @@
+"""
+Szezonok
+
+A szezon rangsora a SzezonEredmeny táblában él, játékosonként egy sorral,
+amit minden befejezett harc azonnal, egyetlen F() UPDATE-tel frissít, így a
+szezon rangsor egy indexelt lekérdezés. A harc az indítása szerinti szezonba
+számít. Lezáráskor a végső helyezések egyetlen UPDATE-tel rögzülnek; az új
+szezon saját, kezdetben üres sorokkal indul, így a régi sorokat nem kell
+nullázni. A harc előzményekből egy szezon
+bármikor újraszámolható, darabokban olvasva.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Harc, Szezon, SzezonEredmeny, sorozat_frissites
+
+SZEZON_GYOZELEM_PONT = 10
+
+
+def _alkalmaz(sor, eredmenyek):
+    # Harcok kimenetele időrendben, ugyanúgy, mint a profil számlálóinál
+    for gyozott in eredmenyek:
+        if gyozott:
+            sor.gyozelmek += 1
+            sor.pontszam += SZEZON_GYOZELEM_PONT
+            sor.jelenlegi_sorozat += 1
+            sor.legmagasabb_sorozat = max(sor.legmagasabb_sorozat, sor.jelenlegi_sorozat)
+        else:
+            sor.veresegek += 1
+            sor.jelenlegi_sorozat = 0
+
+
+def _szezonok_idorendben(idopontok):
+    """A harcok indítási idejét tartalmazó szezonok, időpontonként (None, ha nincs)"""
+    szezonok = list(
+        Szezon.objects.filter(kezdet__lte=max(idopontok))
+        .filter(Q(veg__isnull=True) | Q(veg__gt=min(idopontok)))
+        .order_by('-kezdet')
+    )
+    return [
+        next((szezon for szezon in szezonok
+              if szezon.kezdet <= idopont and (szezon.veg is None or idopont < szezon.veg)), None)
+        for idopont in idopontok
+    ]
+
+
+def szezon_frissites(user, eredmenyek, idopontok=None):
+    """
+    Befejezett harcok beírása annak a szezonnak a rangsorába, amelyben indultak.
+
+    A sorban álló harcok így a szezon váltás után is a régi szezonba
+    kerülnek; egy már lezárt szezon végső helyezései ilyenkor újra rögzülnek.
+
+    Args:
+        user: User objektum
+        eredmenyek: A harcok kimenetele időrendben (True = győzelem)
+        idopontok: A harcok indítási ideje (Harc.inditas); None esetén most
+    """
+    if not eredmenyek:
+        return
+    if idopontok is None:
+        szezon = Szezon.aktualis()
+        if szezon is not None:
+            _szezon_eredmenyek_beirasa(szezon, user, eredmenyek)
+        return
+
+    szezononkent = {}
+    for szezon, gyozott in zip(_szezonok_idorendben(idopontok), eredmenyek):
+        if szezon is not None:
+            szezononkent.setdefault(szezon.id, (szezon, []))[1].append(gyozott)
+    for szezon, sajat in szezononkent.values():
+        _szezon_eredmenyek_beirasa(szezon, user, sajat)
+        if not szezon.aktiv:
+            _helyezesek_rogzitese(szezon)
+
+
+def _szezon_eredmenyek_beirasa(szezon, user, eredmenyek):
+    # Ugyanazok az F() kifejezések, mint a profil számlálóinál: egy UPDATE, zárolás nélkül
+    gyozelmek, veresegek, sorozat_mezok = sorozat_frissites(eredmenyek)
+    sorok = SzezonEredmeny.objects.filter(szezon=szezon, jatekos=user)
+    modositas = dict(
+        sorozat_mezok,
+        gyozelmek=F('gyozelmek') + gyozelmek,
+        veresegek=F('veresegek') + veresegek,
+        pontszam=F('pontszam') + SZEZON_GYOZELEM_PONT * gyozelmek,
+    )
+    if sorok.update(**modositas):
+        return
+
+    # A játékos első harca a szezonban
+    sor = SzezonEredmeny(szezon=szezon, jatekos=user)
+    _alkalmaz(sor, eredmenyek)
+    try:
+        with transaction.atomic():
+            sor.save(force_insert=True)
+    except IntegrityError:
+        # Közben egy másik harc létrehozta a sort
+        sorok.update(**modositas)
+
+
+def _helyezesek_rogzitese(szezon):
+    """A végső helyezések beírása egyetlen UPDATE-tel (holtversenyben azonos helyezés)"""
+    elotte = SzezonEredmeny.objects.filter(szezon=szezon).filter(
+        Q(pontszam__gt=OuterRef('pontszam')) |
+        Q(pontszam=OuterRef('pontszam'), gyozelmek__gt=OuterRef('gyozelmek'))
+    ).order_by().values('szezon').annotate(db=Count('id')).values('db')
+    SzezonEredmeny.objects.filter(szezon=szezon).update(
+        helyezes=Coalesce(Subquery(elotte), Value(0)) + 1
+    )
+
+
+@transaction.atomic
+def szezon_valtas(uj_nev):
+    """
+    Lezárja az aktív szezont (végső helyezésekkel), és újat indít.
+
+    Visszatérés: (lezart: Szezon vagy None, uj: Szezon)
+    """
+    most = timezone.now()
+    lezart = Szezon.objects.select_for_update().filter(veg__isnull=True).order_by('-kezdet').first()
+    if lezart is not None:
+        lezart.veg = most
+        lezart.save(update_fields=['veg'])
+        _helyezesek_rogzitese(lezart)
+
+    uj = Szezon.objects.create(nev=uj_nev, kezdet=most)
+    return lezart, uj
+
+
+def szezon_ujraszamolas(szezon, darab=2000):
+    """
+    A szezon rangsorának újraszámolása a harc előzményekből.
+
+    A harcokat időrendben, darabonként olvassa (nem tölti be egyszerre), és
+    csak a játékosonkénti összesítőket tartja memóriában; a végén egy
+    tranzakcióban cseréli le a szezon sorait.
+
+    Visszatérés: a játékosok száma a szezonban
+    """
+    harcok = Harc.objects.filter(
+        befejezve=True, jatekos_gyozott__isnull=False, inditas__gte=szezon.kezdet
+    )
+    if szezon.veg is not None:
+        harcok = harcok.filter(inditas__lt=szezon.veg)
+
+    sorok = {}
+    for jatekos_id, gyozott in harcok.order_by('inditas', 'id').values_list(
+            'jatek__jatekos_id', 'jatekos_gyozott').iterator(chunk_size=darab):
+        sor = sorok.get(jatekos_id)
+        if sor is None:
+            sor = sorok[jatekos_id] = SzezonEredmeny(szezon=szezon, jatekos_id=jatekos_id)
+        _alkalmaz(sor, [gyozott])
+
+    with transaction.atomic():
+        SzezonEredmeny.objects.filter(szezon=szezon).delete()
+        SzezonEredmeny.objects.bulk_create(sorok.values(), batch_size=darab)
+        if not szezon.aktiv:
+            _helyezesek_rogzitese(szezon)
+
+    return len(sorok)
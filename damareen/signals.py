@@ -0,0 +1,88 @@
+"""
+Signal kezelők a cache-elt kazamata tervek, balansz mátrix és achievement
+katalógus érvénytelenítéséhez, és a rangsor index frissítéséhez
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from . import leaderboard_index
+from .achievements import achievement_katalogus_ervenytelenites, achievement_visszamenoleg
+from .balance import balansz_ervenytelenites
+from .battle_plan import kazamata_terv_ervenytelenites
+from .models import Achievement, Kazamata, KazamataKartya, Vezerkartya, Vilagkartya, UserProfile
+
+
+def _ervenytelenites_commit_utan(kazamata_ids, balansz=False):
+    # Commit előtt léptetve egy másik processz még a régi adatot töltené be az új verzióval
+    kazamata_ids = set(kazamata_ids)
+    if kazamata_ids:
+        transaction.on_commit(lambda: kazamata_terv_ervenytelenites(kazamata_ids))
+    if kazamata_ids or balansz:
+        transaction.on_commit(balansz_ervenytelenites)
+
+
+@receiver([post_save, post_delete], sender=Kazamata)
+def kazamata_valtozott(sender, instance, **kwargs):
+    _ervenytelenites_commit_utan([instance.id])
+
+
+@receiver([post_save, post_delete], sender=KazamataKartya)
+def kazamata_kartya_valtozott(sender, instance, **kwargs):
+    _ervenytelenites_commit_utan([instance.kazamata_id])
+
+
+@receiver([post_save, post_delete], sender=Vezerkartya)
+def vezerkartya_valtozott(sender, instance, **kwargs):
+    _ervenytelenites_commit_utan(
+        KazamataKartya.objects.filter(vezer_kartya_id=instance.id).values_list('kazamata_id', flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=Vilagkartya)
+def vilagkartya_valtozott(sender, instance, **kwargs):
+    # A világkártyák a balansz mátrix sorai, így az akkor is változik, ha egyik kazamatában sincs
+    _ervenytelenites_commit_utan(
+        KazamataKartya.objects.filter(
+            Q(vilag_kartya_id=instance.id) | Q(vezer_kartya__eredeti_kartya_id=instance.id)
+        ).values_list('kazamata_id', flat=True),
+        balansz=True
+    )
+
+
+@receiver([post_save, post_delete], sender=Achievement)
+def achievement_valtozott(sender, instance, **kwargs):
+    transaction.on_commit(achievement_katalogus_ervenytelenites)
+
+
+@receiver(pre_save, sender=Achievement)
+def achievement_mentes_elott(sender, instance, **kwargs):
+    # A mentés előtti metrika kulcs és cél érték, hogy a post_save lássa, változott-e
+    instance._regi_feltetel = None
+    if instance.pk is not None:
+        instance._regi_feltetel = Achievement.objects.filter(pk=instance.pk).values_list(
+            'tipus', 'parameter', 'cel_ertek'
+        ).first()
+
+
+@receiver(post_save, sender=Achievement)
+def achievement_mentve(sender, instance, created, **kwargs):
+    # Akik az (új) küszöböt már korábban átlépték, most kapják meg
+    regi = getattr(instance, '_regi_feltetel', None)
+    if created or regi != (instance.tipus, instance.parameter, instance.cel_ertek):
+        achievement_visszamenoleg(instance)
+
+
+@receiver(post_save, sender=UserProfile)
+def profil_mentve(sender, instance, **kwargs):
+    # A mentéskori állapot a mentés tranzakciójában kerül a rangsor naplóba
+    leaderboard_index.valtozas(
+        [leaderboard_index.RangsorSor.profilbol(instance)],
+        jatekos=instance.user_type == UserProfile.PERMISSION_PLAYER,
+    )
+
+
+@receiver(post_delete, sender=UserProfile)
+def profil_torolve(sender, instance, **kwargs):
+    leaderboard_index.torles(instance.user_id)
@@ -1,3 +1,1413 @@
-from django.test import TestCase
-
-# Create your tests here.
+import asyncio
+import random
+from collections import OrderedDict
+from functools import lru_cache
+from io import StringIO
+from itertools import permutations
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from . import balance, battle_events, battle_plan, belyegek, game_logic, leaderboard_index
+from .consumers import LeaderboardConsumer
+from .routing import websocket_urlpatterns
+from .battle_engine import (
+    HarcKartya, UtkozetOk, szukseges_gyozelmek, harc_lefuttatasa, utkozet_ok_szoveg, utközet_ertekeles, tomeges_utközet_ertekeles,
+)
+from .deck_solver import legjobb_pakli, max_gyozelmek, kartya_stat
+from .planner import kampany_terv
+from .achievements import achievementek_frissitese
+from .game_logic import harc_elszamolasa
+from .seasons import szezon_valtas
+from .models import (
+    ELEMENT_CHOICES, Achievement, PlayerAchievement, UserProfile, Vilagkartya, Vezerkartya, JatekKornyezet, Kazamata, KazamataKartya, Jatek,
+    Jatekoskartya, Pakli, PakliKartya, Harc, HarcEsemeny, Utközet, RangsorValtozas, SzezonEredmeny,
+)
+
+ELEMEK = [elem for elem, _ in ELEMENT_CHOICES]
+
+
+class AlapTestCase(TestCase):
+    """A processzen belüli másolatok nem élik túl a teszt visszagörgetett adatait"""
+    def setUp(self):
+        super().setUp()
+        belyegek.helyi_torles()
+        leaderboard_index.helyi_torles()
+
+
+def veletlen_utkozetek(rnd, darab):
+    """(játékos sebzés, életerő, típus, kazamata sebzés, életerő, típus) sorok, sok holtversennyel"""
+    return [
+        (rnd.randint(0, 10), rnd.randint(1, 10), rnd.choice(ELEMEK),
+         rnd.randint(0, 10), rnd.randint(1, 10), rnd.choice(ELEMEK))
+        for _ in range(darab)
+    ]
+
+
+class TomegesUtkozetErtekelesTest(SimpleTestCase):
+    def test_egyezik_a_soronkenti_ertekelessel(self):
+        sorok = veletlen_utkozetek(random.Random(2025), 20000)
+        
+        nyertek, okok = tomeges_utközet_ertekeles(*(list(oszlop) for oszlop in zip(*sorok)))
+        
+        self.assertEqual(list(zip(nyertek, okok)), [utközet_ertekeles(*sor) for sor in sorok])
+    
+    def test_ures_bemenet(self):
+        self.assertEqual(tomeges_utközet_ertekeles([], [], [], [], [], []), ([], []))
+    
+    def test_eltero_hosszu_oszlopok(self):
+        with self.assertRaises(ValueError):
+            tomeges_utközet_ertekeles([1, 2], [1], ['tuz'], [1], [1], ['viz'])
+
+
+def nyert_utkozetek(pakli, kazamata):
+    return sum(
+        1 for jatekos, ellenfel in zip(pakli, kazamata)
+        if utközet_ertekeles(*kartya_stat(jatekos), *kartya_stat(ellenfel))[0]
+    )
+
+
+def veletlen_kartyak(rnd, darab, kezdo_id=1):
+    # Kis értékkészlet, hogy legyenek azonos statú kártyák is
+    return [
+        HarcKartya(kezdo_id + i, f'K{kezdo_id + i}', rnd.randint(1, 6), rnd.randint(1, 6), rnd.choice(ELEMEK))
+        for i in range(darab)
+    ]
+
+
+# A 0004 előtti szöveges okok, ahogy a régi kiértékelés írta őket
+# ((játékos sebzés, életerő, típus), (kazamata sebzés, életerő, típus), régi szöveg, ok kód)
+REGI_OKOK = [
+    ((7, 5, 'tuz'), (2, 4, 'viz'), 'Játékos sebzése (7) > Kazamata életereje (4)', UtkozetOk.SEBZES_GYOZELEM),
+    ((2, 3, 'tuz'), (5, 9, 'fold'), 'Kazamata sebzése (5) > Játékos életereje (3)', UtkozetOk.SEBZES_VERESEG),
+    ((3, 3, 'tuz'), (3, 3, 'fold'), 'Típus előny: Tűz > Föld', UtkozetOk.TIPUS_ELONY),
+    ((3, 3, 'tuz'), (3, 3, 'levego'), 'Típus előny: Levegő > Tűz', UtkozetOk.TIPUS_HATRANY),
+    ((3, 3, 'tuz'), (3, 3, 'viz'), 'Döntetlen esetén a kazamata nyer', UtkozetOk.DONTETLEN),
+]
+
+
+class UtkozetOkSzovegTest(SimpleTestCase):
+    def test_regi_szovegek_a_kodbol(self):
+        for jatekos, kazamata, szoveg, ok in REGI_OKOK:
+            with self.subTest(ok=ok):
+                self.assertEqual(utközet_ertekeles(*jatekos, *kazamata)[1], ok)
+                self.assertEqual(utkozet_ok_szoveg(ok, *jatekos, *kazamata), szoveg)
+    
+    def test_motor_kartyak_szovege(self):
+        harc = harc_lefuttatasa(
+            [HarcKartya(1, 'Lap', 3, 3, 'fold')], [HarcKartya(2, 'Ellenfél', 3, 3, 'tuz')]
+        )
+        self.assertEqual(harc.utkozetek[0].ok_szoveg, 'Típus előny: Tűz > Föld')
+
+
+class PakliOptimalizaloTest(SimpleTestCase):
+    def test_optimum_kis_eseteken_nyers_erovel(self):
+        rnd = random.Random(4)
+        for _ in range(150):
+            kazamata = veletlen_kartyak(rnd, rnd.randint(1, 4), kezdo_id=100)
+            gyujtemeny = veletlen_kartyak(rnd, rnd.randint(len(kazamata), 6))
+            
+            optimum = max(
+                nyert_utkozetek(pakli, kazamata)
+                for pakli in permutations(gyujtemeny, len(kazamata))
+            )
+            pakli, gyozelmek = legjobb_pakli(gyujtemeny, kazamata)
+            
+            self.assertEqual(gyozelmek, optimum)
+            self.assertEqual(nyert_utkozetek(pakli, kazamata), optimum)
+            self.assertEqual(len(pakli), len(kazamata))
+            self.assertEqual(len({kartya.id for kartya in pakli}), len(pakli))
+            self.assertLessEqual({kartya.id for kartya in pakli}, {kartya.id for kartya in gyujtemeny})
+            self.assertEqual(
+                max_gyozelmek([kartya_stat(k) for k in gyujtemeny], [kartya_stat(k) for k in kazamata]),
+                optimum
+            )
+    
+    def test_keves_kartya(self):
+        rnd = random.Random(5)
+        with self.assertRaises(ValueError):
+            legjobb_pakli(veletlen_kartyak(rnd, 2), veletlen_kartyak(rnd, 3, kezdo_id=100))
+
+
+@lru_cache(maxsize=None)
+def legyozheto_nyers_erovel(statok, kazamata):
+    """Van-e a statokból nyerő pakli a kazamata ellen, minden sorrend kipróbálásával"""
+    if len(statok) < len(kazamata):
+        return False
+    return max(
+        sum(utközet_ertekeles(*jatekos, *ellenfel)[0] for jatekos, ellenfel in zip(pakli, kazamata))
+        for pakli in permutations(statok, len(kazamata))
+    ) >= szukseges_gyozelmek(len(kazamata))
+
+
+def legrovidebb_terv(statok, kazamatak, cel, max_csatak):
+    """A legkevesebb harc a cél legyőzéséig, szélességi kereséssel minden jutalom és kártya kipróbálásával"""
+    szint = {tuple(sorted(statok))}
+    for csatak in range(max_csatak + 1):
+        if any(legyozheto_nyers_erovel(allapot, cel) for allapot in szint):
+            return csatak
+        kovetkezo = set()
+        for allapot in szint:
+            for kazamata, (plusz_sebzes, plusz_eletero) in kazamatak:
+                if (plusz_sebzes, plusz_eletero) == (0, 0) or not legyozheto_nyers_erovel(allapot, kazamata):
+                    continue
+                for i, (sebzes, eletero, tipus) in enumerate(allapot):
+                    uj = allapot[:i] + ((sebzes + plusz_sebzes, eletero + plusz_eletero, tipus),) + allapot[i + 1:]
+                    kovetkezo.add(tuple(sorted(uj)))
+        szint = kovetkezo
+    return None
+
+
+class KampanyTervTest(SimpleTestCase):
+    @staticmethod
+    def veletlen_kampany(rnd):
+        """Gyűjtemény statok és három kazamata a szabályok jutalmaival; az utolsó a cél"""
+        stat = lambda erosseg: (rnd.randint(1, erosseg), rnd.randint(1, erosseg), rnd.choice(ELEMEK))
+        kartyak = [stat(5) for _ in range(rnd.randint(3, 4))]
+        kazamatak = [
+            (tuple(stat(4) for _ in range(1)), Kazamata.JUTALMAK[Kazamata.TIPUS_EGYSZERU]),
+            (tuple(stat(5) for _ in range(2)), Kazamata.JUTALMAK[Kazamata.TIPUS_KIS]),
+            (tuple(stat(8) for _ in range(3)), Kazamata.JUTALMAK[Kazamata.TIPUS_NAGY]),
+        ]
+        return kartyak, kazamatak
+    
+    def test_legrovidebb_terv_nyers_erovel(self):
+        rnd = random.Random(8)
+        hosszak = []
+        for _ in range(60):
+            kartyak, kazamatak = self.veletlen_kampany(rnd)
+            cel = kazamatak[-1][0]
+            
+            terv = kampany_terv(kartyak, kazamatak, len(kazamatak) - 1, max_csatak=4)
+            vart = legrovidebb_terv(kartyak, kazamatak, cel, max_csatak=4)
+            self.assertEqual(None if terv is None else len(terv), vart)
+            if terv is None:
+                continue
+            hosszak.append(len(terv))
+            
+            # A terv végigjátszható: minden lépés kazamatája legyőzhető, a végén a cél is
+            allapot = list(kartyak)
+            for kazamata_index, kartya_index in terv:
+                kazamata, (plusz_sebzes, plusz_eletero) = kazamatak[kazamata_index]
+                self.assertTrue(legyozheto_nyers_erovel(tuple(sorted(allapot)), kazamata))
+                sebzes, eletero, tipus = allapot[kartya_index]
+                allapot[kartya_index] = (sebzes + plusz_sebzes, eletero + plusz_eletero, tipus)
+            self.assertTrue(legyozheto_nyers_erovel(tuple(sorted(allapot)), cel))
+        
+        # Legyenek valódi, több lépéses tervek is
+        self.assertGreaterEqual(sum(1 for hossz in hosszak if hossz >= 2), 5)
+    
+    def test_allapot_korlat(self):
+        rnd = random.Random(9)
+        while True:
+            kartyak, kazamatak = self.veletlen_kampany(rnd)
+            terv = kampany_terv(kartyak, kazamatak, len(kazamatak) - 1, max_csatak=4)
+            if terv is not None and len(terv) >= 2:
+                break
+        
+        # A korlát alatt a kereső feladja, fölötte ugyanazt a legrövidebb tervet adja: nem optimális tervet sosem
+        tervek = [
+            kampany_terv(kartyak, kazamatak, len(kazamatak) - 1, max_csatak=4, max_allapot=korlat)
+            for korlat in range(1, 300)
+        ]
+        elso = next(i for i, korlatos in enumerate(tervek) if korlatos is not None)
+        self.assertGreater(elso, 0)
+        self.assertEqual(tervek[elso:], [terv] * len(tervek[elso:]))
+
+
+class ProfilEredmenyekTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.profile = UserProfile.objects.create(user=User.objects.create(username='jatekos'))
+    
+    def assertStatok(self, gyozelmek, veresegek, jelenlegi, legmagasabb):
+        self.profile.refresh_from_db()
+        self.assertEqual(
+            (self.profile.osszes_gyozelem, self.profile.osszes_vereseg, self.profile.osszes_pontszam,
+             self.profile.jelenlegi_sorozat, self.profile.legmagasabb_sorozat),
+            (gyozelmek, veresegek, UserProfile.GYOZELEM_PONT * gyozelmek, jelenlegi, legmagasabb)
+        )
+    
+    def test_sorozat_folytatodik_es_nullazodik(self):
+        self.profile.eredmenyek_hozzaad([True, True])
+        self.assertStatok(2, 0, 2, 2)
+        self.profile.eredmenyek_hozzaad([True])
+        self.assertStatok(3, 0, 3, 3)
+        self.profile.eredmenyek_hozzaad([True, False, True])
+        self.assertStatok(5, 1, 1, 4)
+    
+    def test_korabbi_csucs_megmarad(self):
+        UserProfile.objects.filter(pk=self.profile.pk).update(legmagasabb_sorozat=7, jelenlegi_sorozat=2)
+        self.profile.eredmenyek_hozzaad([True, True, False, True, True, True])
+        self.assertStatok(5, 1, 3, 7)
+        self.profile.eredmenyek_hozzaad([True] * 5)
+        self.assertStatok(10, 1, 8, 8)
+    
+    def test_elavult_peldany_nem_ir_felul(self):
+        # Egy másik harc közben beírt eredménye nem vész el
+        masik = UserProfile.objects.get(pk=self.profile.pk)
+        masik.eredmenyek_hozzaad([True, True, True])
+        self.profile.eredmenyek_hozzaad([True])
+        self.assertStatok(4, 0, 4, 4)
+    
+    def test_egyezik_a_harconkenti_beirassal(self):
+        rnd = random.Random(23)
+        gyozelmek = veresegek = jelenlegi = legmagasabb = 0
+        for _ in range(300):
+            eredmenyek = [rnd.random() < 0.6 for _ in range(rnd.randint(0, 8))]
+            for gyozott in eredmenyek:
+                if gyozott:
+                    gyozelmek += 1
+                    jelenlegi += 1
+                    legmagasabb = max(legmagasabb, jelenlegi)
+                else:
+                    veresegek += 1
+                    jelenlegi = 0
+            self.profile.eredmenyek_hozzaad(eredmenyek)
+            self.assertStatok(gyozelmek, veresegek, jelenlegi, legmagasabb)
+
+
+def jatekos_letrehozasa(nev):
+    user = User.objects.create(username=nev)
+    UserProfile.objects.create(user=user)
+    return user
+
+
+def harcok_letrehozasa(jatekos, darab=1):
+    """Befejezett, még el nem számolt harcok a játékosnak"""
+    mester = User.objects.get_or_create(username='mester')[0]
+    kornyezet = JatekKornyezet.objects.get_or_create(nev='Teszt világ', keszitette=mester)[0]
+    kazamata = Kazamata.objects.get_or_create(nev='Teszt kazamata', tipus=Kazamata.TIPUS_EGYSZERU)[0]
+    jatek = Jatek.objects.get_or_create(jatekos=jatekos, kornyezet=kornyezet)[0]
+    return [Harc.objects.create(jatek=jatek, kazamata=kazamata, befejezve=True) for _ in range(darab)]
+
+
+def harc_vilag(jatekos):
+    """Egy kis kazamata (3 sima kártya + 1 vezér) és a játékos 4 lapos paklija, 6 lapos gyűjteményből"""
+    rnd = random.Random(11)
+    vilag = [
+        Vilagkartya.objects.create(nev=f'Lap {i}', sebzes=rnd.randint(2, 9), eletero=rnd.randint(1, 9),
+                                   tipus=ELEMEK[i % len(ELEMEK)])
+        for i in range(8)
+    ]
+    vezer = Vezerkartya.objects.create(nev='Vezér', eredeti_kartya=vilag[7],
+                                       duplazas_tipusa=Vezerkartya.DUPLICATION_DAMAGE)
+    kazamata = Kazamata.objects.create(nev='Kis kazamata', tipus=Kazamata.TIPUS_KIS)
+    KazamataKartya.objects.bulk_create(
+        [KazamataKartya(kazamata=kazamata, sorrend=i, vilag_kartya=vilag[5 + i]) for i in (1, 2)] +
+        [KazamataKartya(kazamata=kazamata, sorrend=3, vilag_kartya=vilag[0]),
+         KazamataKartya(kazamata=kazamata, sorrend=4, vezer_kartya=vezer)]
+    )
+    
+    mester = User.objects.get_or_create(username='mester')[0]
+    kornyezet = JatekKornyezet.objects.get_or_create(nev='Teszt világ', keszitette=mester)[0]
+    jatek = Jatek.objects.get_or_create(jatekos=jatekos, kornyezet=kornyezet)[0]
+    gyujtemeny = [
+        Jatekoskartya.objects.create(jatek=jatek, eredeti_kartya=kartya,
+                                     aktualis_sebzes=kartya.sebzes, aktualis_eletero=kartya.eletero)
+        for kartya in vilag[:6]
+    ]
+    pakli = Pakli.objects.create(jatek=jatek)
+    PakliKartya.objects.bulk_create(
+        [PakliKartya(pakli=pakli, kartya=kartya, sorrend=i) for i, kartya in enumerate(gyujtemeny[:4], 1)]
+    )
+    return jatek, kazamata
+
+
+def tovabbi_kazamatak(rnd, darab, tipus=Kazamata.TIPUS_KIS):
+    """Véletlen kazamaták a harc_vilag lapjaiból, a vezérrel a végén"""
+    lapok = list(Vilagkartya.objects.order_by('id'))
+    vezer = Vezerkartya.objects.get()
+    kazamatak = []
+    for i in range(darab):
+        kazamata = Kazamata.objects.create(nev=f'{tipus} kazamata {i}', tipus=tipus)
+        sima = kazamata.get_kartyak_szama() - 1
+        KazamataKartya.objects.bulk_create(
+            [KazamataKartya(kazamata=kazamata, sorrend=sorrend, vilag_kartya=lap)
+             for sorrend, lap in enumerate(rnd.sample(lapok, sima), 1)] +
+            [KazamataKartya(kazamata=kazamata, sorrend=sima + 1, vezer_kartya=vezer)]
+        )
+        kazamatak.append(kazamata)
+    return kazamatak
+
+
+class HarcElszamolasTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        self.harc = harcok_letrehozasa(self.jatekos)[0]
+    
+    def test_ketszer_hivva_egyszer_szamol_el(self):
+        self.assertTrue(harc_elszamolasa(self.harc.id, self.jatekos.id, True, {}))
+        self.assertFalse(harc_elszamolasa(self.harc.id, self.jatekos.id, True, {}))
+        
+        self.assertEqual(HarcEsemeny.objects.filter(harc=self.harc).count(), 1)
+        self.harc.refresh_from_db()
+        self.assertTrue(self.harc.rangsor_frissitve)
+        self.assertTrue(self.harc.jatekos_gyozott)
+    
+    def test_feldolgozas_utan_sem_szamol_ujra(self):
+        harc_elszamolasa(self.harc.id, self.jatekos.id, True, {})
+        battle_events.kiurites()
+        self.assertFalse(harc_elszamolasa(self.harc.id, self.jatekos.id, True, {}))
+        battle_events.kiurites()
+        
+        profile = UserProfile.objects.get(user=self.jatekos)
+        self.assertEqual((profile.osszes_gyozelem, profile.osszes_vereseg), (1, 0))
+        self.assertFalse(HarcEsemeny.objects.exists())
+
+
+class HarcEsemenyFeldolgozasTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.elso = jatekos_letrehozasa('elso')
+        self.masodik = jatekos_letrehozasa('masodik')
+    
+    def esemenyek(self, jatekos, eredmenyek):
+        HarcEsemeny.objects.bulk_create([
+            HarcEsemeny(harc=harc, jatekos=jatekos, jatekos_gyozott=gyozott)
+            for harc, gyozott in zip(harcok_letrehozasa(jatekos, len(eredmenyek)), eredmenyek)
+        ])
+    
+    def statok(self, jatekos):
+        profile = UserProfile.objects.get(user=jatekos)
+        return (profile.osszes_gyozelem, profile.osszes_vereseg,
+                profile.jelenlegi_sorozat, profile.legmagasabb_sorozat)
+    
+    def test_feldolgozo_nelkul_a_keres_nem_konyvel(self):
+        harc = harcok_letrehozasa(self.elso)[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            harc_elszamolasa(harc.id, self.elso.id, True, {})
+        
+        self.assertEqual(HarcEsemeny.objects.count(), 1)
+        self.assertEqual(self.statok(self.elso), (0, 0, 0, 0))
+        
+        call_command('process_battle_events', stdout=StringIO())
+        self.assertFalse(HarcEsemeny.objects.exists())
+        self.assertEqual(self.statok(self.elso), (1, 0, 1, 1))
+    
+    def test_folyamatos_feldolgozo(self):
+        self.esemenyek(self.elso, [True, False])
+        with mock.patch.object(battle_events.time, 'sleep') as alvas:
+            battle_events.folyamatos_kiurites(korok=2)
+        
+        self.assertEqual(alvas.call_count, 2)
+        self.assertFalse(HarcEsemeny.objects.exists())
+        self.assertEqual(self.statok(self.elso), (1, 1, 0, 1))
+    
+    def test_kiurites_jatekosonkent_idorendben(self):
+        self.esemenyek(self.elso, [True, True, False, True])
+        self.esemenyek(self.masodik, [False, True])
+        
+        self.assertEqual(battle_events.kiurites(), 6)
+        
+        self.assertFalse(HarcEsemeny.objects.exists())
+        self.assertEqual(self.statok(self.elso), (3, 1, 1, 2))
+        self.assertEqual(self.statok(self.masodik), (1, 1, 1, 1))
+    
+    def test_kiurites_tobb_korben(self):
+        self.esemenyek(self.elso, [True] * 5)
+        with mock.patch.object(battle_events, 'DARAB', 2):
+            self.assertEqual(battle_events.kiurites(), 5)
+        self.assertEqual(self.statok(self.elso), (5, 0, 5, 5))
+    
+    def test_sikertelen_esemeny_a_tablaban_marad(self):
+        self.esemenyek(self.elso, [True])
+        self.esemenyek(self.masodik, [True])
+        eredeti = game_logic.frissit_rangsort_tomegesen
+        
+        def hibas(user, *args, **kwargs):
+            if user.id == self.elso.id:
+                raise RuntimeError('hiba')
+            return eredeti(user, *args, **kwargs)
+        
+        with mock.patch.object(game_logic, 'frissit_rangsort_tomegesen', hibas):
+            with self.assertLogs('damareen.battle_events', 'ERROR'):
+                self.assertEqual(battle_events.kiurites(), 1)
+        
+        self.assertEqual(list(HarcEsemeny.objects.values_list('jatekos_id', flat=True)), [self.elso.id])
+        self.assertEqual(self.statok(self.elso), (0, 0, 0, 0))
+        self.assertEqual(self.statok(self.masodik), (1, 0, 1, 1))
+        
+        # A következő kör újrapróbálja
+        self.assertEqual(battle_events.kiurites(), 1)
+        self.assertEqual(self.statok(self.elso), (1, 0, 1, 1))
+
+
+class SzezonTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.elso = jatekos_letrehozasa('elso')
+        self.masodik = jatekos_letrehozasa('masodik')
+        self.regi = szezon_valtas('Régi')[1]
+    
+    def elszamolas(self, jatekos, gyozott):
+        harc = harcok_letrehozasa(jatekos)[-1]
+        harc_elszamolasa(harc.id, jatekos.id, gyozott, {})
+    
+    def sorok(self, szezon):
+        return {
+            sor.jatekos_id: (sor.gyozelmek, sor.veresegek, sor.pontszam, sor.helyezes)
+            for sor in SzezonEredmeny.objects.filter(szezon=szezon)
+        }
+    
+    def test_varakozo_harc_az_inditas_szezonjaba_szamit(self):
+        self.elszamolas(self.elso, False)
+        self.elszamolas(self.masodik, True)
+        lezart, uj = szezon_valtas('Új')
+        self.assertEqual(lezart, self.regi)
+        self.assertEqual(self.sorok(self.regi), {})
+        
+        # A váltás előtt indult harcok a lezárt szezonba kerülnek, helyezéssel
+        battle_events.kiurites()
+        self.assertEqual(self.sorok(self.regi), {
+            self.elso.id: (0, 1, 0, 2),
+            self.masodik.id: (1, 0, 10, 1),
+        })
+        
+        # Az új szezon üresen indul, a később indult harc oda számít
+        self.assertEqual(self.sorok(uj), {})
+        self.elszamolas(self.elso, True)
+        battle_events.kiurites()
+        self.assertEqual(self.sorok(uj), {self.elso.id: (1, 0, 10, None)})
+        self.assertEqual(self.sorok(self.regi)[self.elso.id], (0, 1, 0, 2))
+
+
+class AchievementTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        self.harom = Achievement.objects.create(nev='3 győzelem', leiras='', tipus=Achievement.TIPUS_GYOZELEM,
+                                                cel_ertek=3, pontok=50)
+        self.ot = Achievement.objects.create(nev='5 győzelem', leiras='', tipus=Achievement.TIPUS_GYOZELEM,
+                                             cel_ertek=5, pontok=100)
+        self.sorozat = Achievement.objects.create(nev='2-es sorozat', leiras='', tipus=Achievement.TIPUS_SOROZAT,
+                                                  cel_ertek=2, pontok=30)
+    
+    def megszerzett(self):
+        return set(PlayerAchievement.objects.filter(jatekos=self.jatekos).values_list('achievement_id', flat=True))
+    
+    def pontszam(self):
+        return UserProfile.objects.get(user=self.jatekos).osszes_pontszam
+    
+    def test_kuszob_atlepese(self):
+        frissites = lambda metrikak: achievementek_frissitese(self.jatekos, metrikak)
+        
+        self.assertEqual(frissites({Achievement.TIPUS_GYOZELEM: 2}), 0)
+        self.assertEqual(self.megszerzett(), set())
+        self.assertEqual(frissites({Achievement.TIPUS_GYOZELEM: 1}), 50)
+        self.assertEqual(self.megszerzett(), {self.harom.id})
+        # Egy lépésben több küszöb is, a már megszerzett nem számít újra
+        self.assertEqual(frissites({Achievement.TIPUS_GYOZELEM: 3}), 100)
+        self.assertEqual(frissites({Achievement.TIPUS_GYOZELEM: 4}), 0)
+        
+        # Szint metrika: az elért legnagyobb érték számít, nem az összeg
+        self.assertEqual(frissites({Achievement.TIPUS_SOROZAT: 1}), 0)
+        self.assertEqual(frissites({Achievement.TIPUS_SOROZAT: 1}), 0)
+        self.assertEqual(frissites({Achievement.TIPUS_SOROZAT: 2}), 30)
+        
+        self.assertEqual(self.megszerzett(), {self.harom.id, self.ot.id, self.sorozat.id})
+        self.assertEqual(self.pontszam(), 180)
+        self.assertEqual(RangsorValtozas.objects.filter(user_id=self.jatekos.id).last().osszes_pontszam, 180)
+    
+    def test_egy_lepesben_tobb_kuszob(self):
+        self.assertEqual(achievementek_frissitese(self.jatekos, {Achievement.TIPUS_GYOZELEM: 6}), 150)
+        self.assertEqual(self.megszerzett(), {self.harom.id, self.ot.id})
+    
+    def test_visszamenoleges_jovairas(self):
+        achievementek_frissitese(self.jatekos, {Achievement.TIPUS_GYOZELEM: 4})
+        self.assertEqual(self.megszerzett(), {self.harom.id})
+        
+        # Új achievement: aki már túl van a célon, azonnal megkapja
+        negy = Achievement.objects.create(nev='4 győzelem', leiras='', tipus=Achievement.TIPUS_GYOZELEM,
+                                          cel_ertek=4, pontok=20)
+        self.assertEqual(self.megszerzett(), {self.harom.id, negy.id})
+        
+        # A cél érték csökkentése is jóváír
+        self.ot.cel_ertek = 4
+        self.ot.save()
+        self.assertEqual(self.megszerzett(), {self.harom.id, negy.id, self.ot.id})
+        self.assertEqual(self.pontszam(), 170)
+        
+        # A kulcs váltása is: a vereség metrika még nincs meg, a győzelemé igen
+        self.sorozat.cel_ertek = 1
+        self.sorozat.tipus = Achievement.TIPUS_VERESEG
+        self.sorozat.save()
+        self.assertNotIn(self.sorozat.id, self.megszerzett())
+        self.sorozat.tipus = Achievement.TIPUS_GYOZELEM
+        self.sorozat.save()
+        self.assertIn(self.sorozat.id, self.megszerzett())
+        
+        # Más mező változása nem jár visszamenőleges körrel
+        with mock.patch('damareen.signals.achievement_visszamenoleg') as visszamenoleg:
+            self.ot.pontok = 200
+            self.ot.save()
+        visszamenoleg.assert_not_called()
+
+
+class MigracioTestCase(TransactionTestCase):
+    """Adatmigrációk oda-vissza, a régi sémán létrehozott adatokkal"""
+    def migralas(self, cel):
+        """Migrálás a damareen cel migrációjáig; visszatérés: az akkori modellek (apps)"""
+        executor = MigrationExecutor(connection)
+        executor.migrate([('damareen', cel)])
+        return executor.loader.project_state([('damareen', cel)]).apps
+    
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+
+class UtkozetOkMigracioTest(MigracioTestCase):
+    def test_regi_okok_oda_vissza(self):
+        apps = self.migralas('0003_harc_rangsor_frissitve')
+        m = lambda nev: apps.get_model('damareen', nev)
+        
+        jatekos = apps.get_model('auth', 'User').objects.create(username='jatekos')
+        kornyezet = m('JatekKornyezet').objects.create(nev='Világ', keszitette=jatekos)
+        jatek = m('Jatek').objects.create(jatekos=jatekos, kornyezet=kornyezet)
+        kazamata = m('Kazamata').objects.create(nev='Kazamata', tipus='egyszeru')
+        lap = m('Vilagkartya').objects.create(nev='Lap', sebzes=5, eletero=5, tipus='tuz')
+        jatekos_lap = m('Jatekoskartya').objects.create(jatek=jatek, eredeti_kartya=lap, aktualis_sebzes=5,
+                                                        aktualis_eletero=5)
+        kazamata_lap = m('KazamataKartya').objects.create(kazamata=kazamata, sorrend=1, vilag_kartya=lap)
+        harc = m('Harc').objects.create(jatek=jatek, kazamata=kazamata, befejezve=True, jatekos_gyozott=False)
+        for sorrend, ((j_sebzes, j_eletero, j_tipus), (k_sebzes, k_eletero, k_tipus), szoveg, ok) in enumerate(REGI_OKOK, 1):
+            m('Utközet').objects.create(
+                harc=harc, sorrend=sorrend, jatekos_kartya=jatekos_lap, jatekos_sebzes=j_sebzes,
+                jatekos_eletero=j_eletero, jatekos_tipus=j_tipus, kazamata_kartya_ref=kazamata_lap,
+                kazamata_sebzes=k_sebzes, kazamata_eletero=k_eletero, kazamata_tipus=k_tipus,
+                jatekos_nyert=ok in (UtkozetOk.SEBZES_GYOZELEM, UtkozetOk.TIPUS_ELONY), gyoztes_ok=szoveg,
+            )
+        
+        apps = self.migralas('0004_utkozet_gyoztes_ok_kod')
+        okok = apps.get_model('damareen', 'Utközet').objects.order_by('sorrend').values_list('gyoztes_ok', flat=True)
+        self.assertEqual(list(okok), [ok for _, _, _, ok in REGI_OKOK])
+        
+        apps = self.migralas('0003_harc_rangsor_frissitve')
+        szovegek = apps.get_model('damareen', 'Utközet').objects.order_by('sorrend').values_list('gyoztes_ok', flat=True)
+        self.assertEqual(list(szovegek), [szoveg for _, _, szoveg, _ in REGI_OKOK])
+
+
+class AchievementMetrikaMigracioTest(MigracioTestCase):
+    def test_metrikak_feltoltese_es_visszaallitas(self):
+        apps = self.migralas('0006_szezonok')
+        User_ = apps.get_model('auth', 'User')
+        m = lambda nev: apps.get_model('damareen', nev)
+        
+        jatekos = User_.objects.create(username='jatekos')
+        masik = User_.objects.create(username='masik')
+        m('UserProfile').objects.create(user=jatekos, osszes_gyozelem=4, osszes_vereseg=2, legmagasabb_sorozat=3)
+        m('UserProfile').objects.create(user=masik)
+        
+        kornyezet = m('JatekKornyezet').objects.create(nev='Világ', keszitette=masik)
+        jatek = m('Jatek').objects.create(jatekos=jatekos, kornyezet=kornyezet)
+        kazamata = m('Kazamata').objects.create(nev='Kazamata', tipus='kis')
+        lap = m('Vilagkartya').objects.create(nev='Lap', sebzes=5, eletero=5, tipus='tuz')
+        jatekos_lap = m('Jatekoskartya').objects.create(jatek=jatek, eredeti_kartya=lap, aktualis_sebzes=5,
+                                                        aktualis_eletero=5)
+        kazamata_lap = m('KazamataKartya').objects.create(kazamata=kazamata, sorrend=1, vilag_kartya=lap)
+        
+        def harc(gyozott, beszamitva, utkozetek):
+            h = m('Harc').objects.create(jatek=jatek, kazamata=kazamata, befejezve=True,
+                                         jatekos_gyozott=gyozott, rangsor_frissitve=beszamitva)
+            for sorrend, (elem, nyert) in enumerate(utkozetek, 1):
+                m('Utközet').objects.create(
+                    harc=h, sorrend=sorrend, jatekos_kartya=jatekos_lap, jatekos_sebzes=5, jatekos_eletero=5,
+                    jatekos_tipus=elem, kazamata_kartya_ref=kazamata_lap, kazamata_sebzes=5, kazamata_eletero=5,
+                    kazamata_tipus='viz', jatekos_nyert=nyert, gyoztes_ok=1,
+                )
+        harc(True, True, [('tuz', True), ('viz', False)])
+        harc(True, True, [('tuz', True)])
+        harc(False, True, [('fold', False)])
+        harc(True, False, [('tuz', True)])  # még nincs a rangsorban: nem számít
+        
+        regi = m('Achievement').objects.create(nev='3-as sorozat', leiras='', tipus='3_sorozat', cel_ertek=1)
+        m('PlayerAchievement').objects.create(jatekos=jatekos, achievement=regi, jelenlegi_haladás=1)
+        m('PlayerAchievement').objects.create(jatekos=masik, achievement=regi, jelenlegi_haladás=0)
+        
+        apps = self.migralas('0007_achievement_metrikak')
+        metrikak = dict(apps.get_model('damareen', 'JatekosMetrika').objects.filter(
+            jatekos_id=jatekos.id).values_list('kulcs', 'ertek'))
+        self.assertEqual(metrikak, {
+            'gyozelem': 4, 'vereseg': 2, 'sorozat': 3,
+            f'kazamata_gyozelem:{kazamata.id}': 2, 'kazamata_tipus_gyozelem:kis': 2, 'elem_utkozet:tuz': 2,
+        })
+        self.assertFalse(apps.get_model('damareen', 'JatekosMetrika').objects.filter(jatekos_id=masik.id).exists())
+        achievement = apps.get_model('damareen', 'Achievement').objects.get(id=regi.id)
+        self.assertEqual((achievement.tipus, achievement.cel_ertek), ('sorozat', 3))
+        haladas = dict(apps.get_model('damareen', 'PlayerAchievement').objects.values_list(
+            'jatekos_id', 'jelenlegi_haladás'))
+        self.assertEqual(haladas, {jatekos.id: 3, masik.id: 0})
+        
+        apps = self.migralas('0006_szezonok')
+        achievement = apps.get_model('damareen', 'Achievement').objects.get(id=regi.id)
+        self.assertEqual((achievement.tipus, achievement.cel_ertek), ('3_sorozat', 1))
+        haladas = dict(apps.get_model('damareen', 'PlayerAchievement').objects.values_list(
+            'jatekos_id', 'jelenlegi_haladás'))
+        self.assertEqual(haladas, {jatekos.id: 1, masik.id: 0})
+
+
+class RangsorTestAlap(AlapTestCase):
+    """Játékosok véletlen, sok holtversenyes pontszámmal és egy játékmester"""
+    JATEKOSOK = 40
+    
+    def setUp(self):
+        super().setUp()
+        rnd = random.Random(17)
+        for i in range(self.JATEKOSOK):
+            UserProfile.objects.create(
+                user=User.objects.create(username=f'j{i}'),
+                osszes_pontszam=rnd.randint(0, 5) * 10,
+                osszes_gyozelem=rnd.randint(0, 3),
+            )
+        UserProfile.objects.create(
+            user=User.objects.create(username='mester'),
+            user_type=UserProfile.PERMISSION_MASTER,
+            osszes_pontszam=1000,
+        )
+    
+    def vart_sorrend(self):
+        profilok = UserProfile.objects.filter(user_type=UserProfile.PERMISSION_PLAYER)
+        return sorted(profilok, key=lambda p: (-p.osszes_pontszam, -p.osszes_gyozelem, p.user_id))
+    
+    def vart_rang(self, profile, sorrend):
+        # Holtversenyben azonos helyezés: az előtte állók száma + 1
+        return 1 + sum(
+            1 for p in sorrend
+            if (p.osszes_pontszam, p.osszes_gyozelem) > (profile.osszes_pontszam, profile.osszes_gyozelem)
+        )
+    
+    def modositas(self, profile, pontszam):
+        # Mint egy harc elszámolása: mentés nélküli UPDATE és egy napló bejegyzés
+        UserProfile.objects.filter(pk=profile.pk).update(osszes_pontszam=pontszam)
+        profile.refresh_from_db()
+        leaderboard_index.valtozas([leaderboard_index.RangsorSor.profilbol(profile)])
+
+
+class RangsorIndexTest(RangsorTestAlap):
+    def test_helyezes_es_szelet(self):
+        sorrend = self.vart_sorrend()
+        
+        self.assertEqual(leaderboard_index.meret(), self.JATEKOSOK)
+        self.assertEqual([sor.user_id for sor in leaderboard_index.szelet(0, 100)], [p.user_id for p in sorrend])
+        for profile in sorrend:
+            self.assertEqual(leaderboard_index.rang(profile.user_id), self.vart_rang(profile, sorrend))
+        self.assertIsNone(leaderboard_index.rang(User.objects.get(username='mester').id))
+    
+    def test_sajat_valtozas_azonnal_lekerdezes_nelkul(self):
+        leaderboard_index.meret()
+        profile = self.vart_sorrend()[-1]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.modositas(profile, 500)
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(leaderboard_index.rang(profile.user_id), 1)
+    
+    def test_masik_processz_valtozasa_novekmenyesen(self):
+        leaderboard_index.meret()
+        profile = self.vart_sorrend()[-1]
+        
+        # Egy másik processz változása: a napló bejegyzés megvan, a helyi bevezetés (on_commit) nem fut
+        self.modositas(profile, 500)
+        with self.assertNumQueries(0):
+            self.assertNotEqual(leaderboard_index.rang(profile.user_id), 1)
+        
+        # A szinkron csak az új bejegyzéseket olvassa, a UserProfile táblát nem
+        with mock.patch.object(leaderboard_index, 'SZINKRON_IDOKOZ', 0):
+            with self.assertNumQueries(1):
+                self.assertEqual(leaderboard_index.rang(profile.user_id), 1)
+        self.assertEqual(leaderboard_index.szelet(0, 1)[0].user_id, profile.user_id)
+    
+    def test_kesve_commitolt_bejegyzes(self):
+        leaderboard_index.meret()
+        elso, masodik = self.vart_sorrend()[-2:]
+        self.modositas(elso, 500)
+        self.modositas(masodik, 600)
+        
+        # A kisebb id-jú bejegyzés még nem commitolt, amikor a nagyobbat már látjuk
+        korai = RangsorValtozas.objects.order_by('id').last().id - 1
+        eredeti = RangsorValtozas.objects.filter
+        with mock.patch.object(leaderboard_index, 'SZINKRON_IDOKOZ', 0):
+            with mock.patch.object(RangsorValtozas.objects, 'filter',
+                                   lambda *args, **kwargs: eredeti(*args, **kwargs).exclude(id=korai)):
+                self.assertEqual(leaderboard_index.rang(masodik.user_id), 1)
+                self.assertNotEqual(leaderboard_index.rang(elso.user_id), 2)
+            self.assertEqual(leaderboard_index.rang(elso.user_id), 2)
+    
+    def test_torles_es_jatekmester(self):
+        leaderboard_index.meret()
+        profile = self.vart_sorrend()[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.user_type = UserProfile.PERMISSION_MASTER
+            profile.save()
+        self.assertIsNone(leaderboard_index.rang(profile.user_id))
+        self.assertEqual(leaderboard_index.meret(), self.JATEKOSOK - 1)
+        
+        masik = self.vart_sorrend()[0]
+        with mock.patch.object(leaderboard_index, 'SZINKRON_IDOKOZ', 0):
+            masik.user.delete()
+            self.assertIsNone(leaderboard_index.rang(masik.user_id))
+        self.assertEqual(leaderboard_index.meret(), self.JATEKOSOK - 2)
+    
+    def test_ellenorzo_parancs_a_meglevo_indexet_veti_ossze(self):
+        leaderboard_index.meret()
+        profile = self.vart_sorrend()[-1]
+        # Napló bejegyzés nélküli írás: az index eltér az adatbázistól
+        UserProfile.objects.filter(pk=profile.pk).update(osszes_pontszam=500)
+        
+        def kiszolgalas(_):
+            # A várakozás alatt a processz rangsort szolgál ki
+            with mock.patch.object(leaderboard_index, 'SZINKRON_IDOKOZ', 0):
+                leaderboard_index.meret()
+        
+        kimenet = StringIO()
+        with mock.patch('damareen.management.commands.leaderboard_index.time.sleep', kiszolgalas):
+            call_command('leaderboard_index', stdout=kimenet)
+        self.assertIn(f'eltérés az index és az adatbázis rangsora között ({self.JATEKOSOK} játékos', kimenet.getvalue())
+        self.assertEqual(leaderboard_index.rang(profile.user_id), 1)
+        
+        # Az újratöltött indexen a következő ellenőrzés már egyezést talál
+        kimenet = StringIO()
+        with mock.patch('damareen.management.commands.leaderboard_index.time.sleep', kiszolgalas):
+            call_command('leaderboard_index', stdout=kimenet)
+        self.assertIn(f'egyezik az adatbázis rangsorával ({self.JATEKOSOK} játékos)', kimenet.getvalue())
+    
+    def test_ellenorzo_parancs_jelentes_nelkul(self):
+        kimenet = StringIO()
+        call_command('leaderboard_index', varakozas=0, stdout=kimenet)
+        self.assertIn('Egyik processz sem jelentett', kimenet.getvalue())
+
+
+class EloRangsorTest(RangsorTestAlap):
+    def test_pillanatkep_es_osszevont_diff(self):
+        sorrend = self.vart_sorrend()
+        nezo = sorrend[len(sorrend) // 2]
+        nezo_user = nezo.user
+        elotte_rang = self.vart_rang(nezo, sorrend)
+        elotte = [sor.uzenet() for sor in leaderboard_index.szelet(0, leaderboard_index.TOP_N)]
+        
+        def ket_valtozas():
+            # Két külön commit, egy frissítési időközön belül
+            for profile, pontszam in ((sorrend[-1], 500), (sorrend[-2], 600)):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.modositas(profile, pontszam)
+        
+        async def forgatokonyv():
+            kommunikator = WebsocketCommunicator(LeaderboardConsumer.as_asgi(), '/ws/leaderboard/')
+            kommunikator.scope['user'] = nezo_user
+            csatlakozott, _ = await kommunikator.connect()
+            self.assertTrue(csatlakozott)
+            pillanatkep = await kommunikator.receive_json_from()
+            await database_sync_to_async(ket_valtozas)()
+            diff = await kommunikator.receive_json_from(timeout=2)
+            self.assertTrue(await kommunikator.receive_nothing(timeout=0.2))
+            await kommunikator.disconnect()
+            return pillanatkep, diff
+        
+        with mock.patch.object(LeaderboardConsumer, 'UPDATE_INTERVAL', 0.05):
+            pillanatkep, diff = async_to_sync(forgatokonyv)()
+        
+        self.assertEqual(pillanatkep['type'], 'snapshot')
+        self.assertEqual(pillanatkep['top'], elotte)
+        self.assertEqual(pillanatkep['me'], dict(leaderboard_index.sor(nezo.user_id).uzenet(), rank=elotte_rang))
+        
+        # A pillanatkép és az egyetlen diff együtt a változás utáni rangsort adja
+        self.assertEqual(diff['type'], 'diff')
+        top = pillanatkep['top'][:diff['size']]
+        for pozicio, sor in diff['top'].items():
+            top[int(pozicio)] = sor
+        uj_sorrend = self.vart_sorrend()
+        self.assertEqual([sor['user_id'] for sor in top], [p.user_id for p in uj_sorrend])
+        self.assertEqual(top[0]['points'], 600)
+        self.assertEqual(diff['me']['rank'], self.vart_rang(nezo, uj_sorrend))
+        self.assertEqual(diff['me']['rank'], pillanatkep['me']['rank'] + 2)
+
+
+class RangsorApiTest(RangsorTestAlap):
+    def test_kulcs_alapu_lapozas(self):
+        sorrend = self.vart_sorrend()
+        sorok = []
+        url = '/api/rangsor/?darab=7'
+        while url:
+            valasz = self.client.get(url).json()
+            self.assertEqual(valasz['osszes'], self.JATEKOSOK)
+            self.assertLessEqual(len(valasz['jatekosok']), 7)
+            sorok += valasz['jatekosok']
+            url = valasz['kovetkezo'] and f"/api/rangsor/?darab=7&utan={valasz['kovetkezo']}"
+        
+        self.assertEqual([sor['user_id'] for sor in sorok], [p.user_id for p in sorrend])
+        for sor, profile in zip(sorok, sorrend):
+            self.assertEqual(sor['rang'], self.vart_rang(profile, sorrend))
+    
+    def test_oldal_egy_kulcs_utan(self):
+        sorrend = self.vart_sorrend()
+        elozo = sorrend[19]
+        valasz = self.client.get(
+            f'/api/rangsor/?darab=5&utan={elozo.osszes_pontszam}.{elozo.osszes_gyozelem}.{elozo.user_id}'
+        ).json()
+        self.assertEqual([sor['user_id'] for sor in valasz['jatekosok']], [p.user_id for p in sorrend[20:25]])
+    
+    def test_kornyezet(self):
+        sorrend = self.vart_sorrend()
+        
+        valasz = self.client.get(f'/api/rangsor/{sorrend[10].user_id}/kornyezet/?n=3').json()
+        self.assertEqual([sor['user_id'] for sor in valasz['jatekosok']], [p.user_id for p in sorrend[7:14]])
+        self.assertEqual(valasz['rang'], self.vart_rang(sorrend[10], sorrend))
+        
+        # Az elején a hiányzó sorok nélkül
+        valasz = self.client.get(f'/api/rangsor/{sorrend[0].user_id}/kornyezet/?n=3').json()
+        self.assertEqual([sor['user_id'] for sor in valasz['jatekosok']], [p.user_id for p in sorrend[:4]])
+    
+    def test_hibas_parameterek(self):
+        self.assertEqual(self.client.get('/api/rangsor/?utan=x').status_code, 400)
+        self.assertEqual(self.client.get('/api/rangsor/?darab=sok').status_code, 400)
+        mester = User.objects.get(username='mester')
+        self.assertEqual(self.client.get(f'/api/rangsor/{mester.id}/kornyezet/').status_code, 404)
+
+
+class AutomatikusHarcTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        self.jatek, self.kazamata = harc_vilag(self.jatekos)
+        self.pakli = self.jatek.pakli
+    
+    def test_darab_korlat(self):
+        for darab in (0, game_logic.MAX_AUTOMATIKUS_HARC + 1):
+            with self.assertRaises(ValueError):
+                game_logic.automatikus_harcok(self.jatek, self.kazamata, darab)
+        self.assertFalse(Harc.objects.exists())
+        
+        eredmeny = game_logic.automatikus_harcok(self.jatek, self.kazamata, game_logic.MAX_AUTOMATIKUS_HARC)
+        self.assertEqual(len(eredmeny['harcok']), game_logic.MAX_AUTOMATIKUS_HARC)
+        self.assertEqual(Harc.objects.count(), game_logic.MAX_AUTOMATIKUS_HARC)
+    
+    def test_tomeges_sorok_es_esemenyek(self):
+        # Erős pakli: minden harcot megnyer, így a jutalom harcról harcra halmozódik
+        Jatekoskartya.objects.filter(jatek=self.jatek).update(aktualis_sebzes=20, aktualis_eletero=20)
+        pakli_kartyak, kazamata_kartyak = game_logic.harc_kartyak_betoltese(self.pakli, self.kazamata)
+        fejlesztett = pakli_kartyak[0].id
+        plusz_sebzes, plusz_eletero = self.kazamata.get_jutalom()
+        
+        eredmeny = game_logic.automatikus_harcok(self.jatek, self.kazamata, 8, jutalom_kartya_id=fejlesztett)
+        
+        # Harconként a motor eredménye, győzelem után már a fejlesztett kártyával
+        vart = []
+        for _ in range(8):
+            harc = harc_lefuttatasa(pakli_kartyak, kazamata_kartyak)
+            vart.append(harc)
+            if harc.jatekos_gyozott:
+                pakli_kartyak = [
+                    HarcKartya(k.id, k.nev, k.sebzes + plusz_sebzes, k.eletero + plusz_eletero, k.tipus)
+                    if k.id == fejlesztett else k
+                    for k in pakli_kartyak
+                ]
+        gyozelmek = sum(harc.jatekos_gyozott for harc in vart)
+        self.assertEqual(gyozelmek, 8)
+        self.assertEqual((eredmeny['gyozelmek'], eredmeny['veresegek']), (gyozelmek, 8 - gyozelmek))
+        
+        harcok = list(Harc.objects.order_by('id'))
+        self.assertEqual([harc.id for harc in harcok], [harc.id for harc in eredmeny['harcok']])
+        for harc, motor in zip(harcok, vart):
+            self.assertTrue(harc.befejezve and harc.rangsor_frissitve)
+            self.assertEqual(harc.jatekos_gyozott, motor.jatekos_gyozott)
+            self.assertEqual(
+                [(u.jatekos_kartya_id, u.jatekos_sebzes, u.jatekos_eletero, u.jatekos_nyert, u.gyoztes_ok)
+                 for u in harc.utközetek.order_by('sorrend')],
+                [(u.jatekos.id, u.jatekos.sebzes, u.jatekos.eletero, u.jatekos_nyert, u.ok) for u in motor.utkozetek],
+            )
+        
+        kartya = Jatekoskartya.objects.get(id=fejlesztett)
+        self.assertEqual((kartya.aktualis_sebzes, kartya.aktualis_eletero), (pakli_kartyak[0].sebzes, pakli_kartyak[0].eletero))
+        
+        # Harconként egy rangsor esemény; a feldolgozó összevonva könyveli
+        self.assertEqual(
+            list(HarcEsemeny.objects.order_by('harc_id').values_list('harc_id', 'jatekos_gyozott')),
+            [(harc.id, harc.jatekos_gyozott) for harc in harcok],
+        )
+        self.assertEqual(battle_events.kiurites(), 8)
+        profile = UserProfile.objects.get(user=self.jatekos)
+        self.assertEqual((profile.osszes_gyozelem, profile.osszes_vereseg), (gyozelmek, 8 - gyozelmek))
+    
+    def test_lekerdezesek_szama_nem_fugg_a_darabtol(self):
+        game_logic.automatikus_harcok(self.jatek, self.kazamata, 1)
+        lekerdezesek = []
+        for darab in (2, 40):
+            with CaptureQueriesContext(connection) as kontextus:
+                game_logic.automatikus_harcok(self.jatek, self.kazamata, darab)
+            lekerdezesek.append([lekerdezes['sql'].split()[0] for lekerdezes in kontextus.captured_queries])
+        
+        # Ugyanazok a lekérdezések, csak a tömeges INSERT-eket darabolja az SQLite paraméter korlátja
+        egyeb = [[sql for sql in kor if sql != 'INSERT'] for kor in lekerdezesek]
+        self.assertEqual(egyeb[0], egyeb[1])
+        self.assertEqual(lekerdezesek[0].count('INSERT'), 3)
+        self.assertLessEqual(lekerdezesek[1].count('INSERT'), 5)
+
+
+class HarcEredmenyCacheTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        _, self.kazamata = harc_vilag(self.jatekos)
+        # Üres, kétférőhelyes cache saját számlálókkal
+        for javitas in (
+            mock.patch.object(battle_plan, '_EREDMENYEK', OrderedDict()),
+            mock.patch.dict(battle_plan._eredmeny_stat, {'talalat': 0, 'hiany': 0}),
+            mock.patch.object(battle_plan, 'EREDMENY_CACHE_MERET', 2),
+        ):
+            javitas.start()
+            self.addCleanup(javitas.stop)
+    
+    @staticmethod
+    def pakli(sebzes):
+        return [HarcKartya(i, f'Lap {i}', sebzes, 3 + i, ELEMEK[i % len(ELEMEK)]) for i in range(4)]
+    
+    def assertMotorEredmeny(self, eredmeny, pakli_kartyak):
+        vart = harc_lefuttatasa(pakli_kartyak, list(battle_plan.kazamata_terv(self.kazamata.id)))
+        self.assertEqual(
+            [(u.sorrend, u.jatekos, u.kazamata.id, u.jatekos_nyert, u.ok) for u in eredmeny.utkozetek],
+            [(u.sorrend, u.jatekos, u.kazamata.id, u.jatekos_nyert, u.ok) for u in vart.utkozetek],
+        )
+        self.assertEqual((eredmeny.jatekos_gyozelmek, eredmeny.jatekos_gyozott),
+                         (vart.jatekos_gyozelmek, vart.jatekos_gyozott))
+    
+    def test_lru_kiszoritas_es_szamlalok(self):
+        a, b, c = self.pakli(2), self.pakli(5), self.pakli(9)
+        for pakli_kartyak, talalat in ((a, False), (b, False), (a, True), (c, False), (a, True), (b, False)):
+            # Azonos statú, de új kártya objektumokkal is ugyanaz a kulcs
+            pakli_kartyak = [HarcKartya(k.id, k.nev, k.sebzes, k.eletero, k.tipus) for k in pakli_kartyak]
+            elotte = dict(battle_plan._eredmeny_stat)
+            eredmeny = battle_plan.kazamata_harc(pakli_kartyak, self.kazamata.id)
+            self.assertEqual(battle_plan._eredmeny_stat['talalat'] - elotte['talalat'], int(talalat))
+            self.assertMotorEredmeny(eredmeny, pakli_kartyak)
+        
+        # A c betétele a legrégebben használt b-t szorította ki, az utolsó b pedig c-t
+        statisztika = battle_plan.harc_cache_statisztika()
+        self.assertEqual(
+            (statisztika['talalat'], statisztika['hiany'], statisztika['meret'], statisztika['kapacitas']),
+            (2, 4, 2, 2)
+        )
+        self.assertEqual(statisztika['arany'], 33.3)
+        self.assertEqual([kulcs[0][0][0] for kulcs in battle_plan._EREDMENYEK], [2, 5])
+    
+    def test_kazamata_kartya_mentese_uj_tervet_ad(self):
+        pakli_kartyak = self.pakli(5)
+        battle_plan.kazamata_harc(pakli_kartyak, self.kazamata.id)
+        regi_verzio = battle_plan.kazamata_verzio(self.kazamata.id)
+        with self.assertNumQueries(0):
+            battle_plan.kazamata_harc(pakli_kartyak, self.kazamata.id)
+        
+        kazamata_kartya = self.kazamata.kartyak.get(sorrend=1)
+        kazamata_kartya.vilag_kartya = Vilagkartya.objects.create(nev='Csere', sebzes=1, eletero=1, tipus=ELEMEK[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            kazamata_kartya.save()
+        
+        self.assertNotEqual(battle_plan.kazamata_verzio(self.kazamata.id), regi_verzio)
+        terv = battle_plan.kazamata_terv(self.kazamata.id)
+        self.assertEqual((terv[0].id, terv[0].nev, terv[0].sebzes, terv[0].eletero), (kazamata_kartya.id, 'Csere', 1, 1))
+        
+        # Az új verzió új kulcs: újraszámol, nem a régi kimenetelt adja
+        hiany = battle_plan._eredmeny_stat['hiany']
+        eredmeny = battle_plan.kazamata_harc(pakli_kartyak, self.kazamata.id)
+        self.assertEqual(battle_plan._eredmeny_stat['hiany'], hiany + 1)
+        self.assertMotorEredmeny(eredmeny, pakli_kartyak)
+
+
+class ElorejelzesTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        self.jatek, kazamata = harc_vilag(self.jatekos)
+        rnd = random.Random(12)
+        self.kis = [kazamata] + tovabbi_kazamatak(rnd, 5)
+        # Az eltérő méretű kazamatákra nincs előrejelzés
+        self.egyszeru = Kazamata.objects.create(nev='Egyszerű', tipus=Kazamata.TIPUS_EGYSZERU)
+        KazamataKartya.objects.create(kazamata=self.egyszeru, sorrend=1, vilag_kartya=Vilagkartya.objects.first())
+        self.pakli = self.jatek.pakli
+    
+    def assertMotorral(self, elorejelzes):
+        pakli_kartyak = game_logic.pakli_kartyak_betoltese(self.pakli)
+        vart = {}
+        for kazamata, kazamata_kartyak in game_logic.kazamatak_betoltese():
+            if len(kazamata_kartyak) == len(pakli_kartyak):
+                harc = harc_lefuttatasa(pakli_kartyak, kazamata_kartyak)
+                vart[kazamata.id] = {
+                    'gyozelmek': harc.jatekos_gyozelmek,
+                    'osszes': len(harc.utkozetek),
+                    'jatekos_gyozne': harc.jatekos_gyozott,
+                }
+        self.assertEqual(elorejelzes, vart)
+        self.assertEqual(set(elorejelzes), {kazamata.id for kazamata in self.kis})
+    
+    def test_egyezik_a_harc_motorral_es_csak_valtozaskor_szamol(self):
+        kazamatak = list(Kazamata.objects.all())
+        self.assertMotorral(game_logic.pakli_elorejelzes(self.pakli, kazamatak))
+        
+        # Változatlan paklira minden kimenetel a cache-ből jön, egyetlen lekérdezéssel
+        hiany = battle_plan._eredmeny_stat['hiany']
+        with self.assertNumQueries(1):
+            elorejelzes = game_logic.pakli_elorejelzes(self.pakli, kazamatak)
+        self.assertEqual(battle_plan._eredmeny_stat['hiany'], hiany)
+        self.assertMotorral(elorejelzes)
+        
+        # A jutalom megváltoztatja a pakli statjait: minden kazamatára újraszámol
+        game_logic.jutalom_alkalmazasa(self.jatek, self.kis[0], self.pakli.kartyak.get(sorrend=2).kartya_id)
+        elorejelzes = game_logic.pakli_elorejelzes(self.pakli, kazamatak)
+        self.assertEqual(battle_plan._eredmeny_stat['hiany'], hiany + len(self.kis))
+        self.assertMotorral(elorejelzes)
+    
+    def test_jatek_nezet(self):
+        self.client.force_login(self.jatekos)
+        valasz = self.client.get(f'/player/jatek/{self.jatek.id}/')
+        
+        elorejelzes = game_logic.pakli_elorejelzes(self.pakli, self.kis)
+        kazamatak = {kazamata.id: kazamata for kazamata in valasz.context['kazamatak']}
+        for kazamata in self.kis:
+            self.assertEqual(kazamatak[kazamata.id].elorejelzes, elorejelzes[kazamata.id])
+        self.assertIsNone(kazamatak[self.egyszeru.id].elorejelzes)
+        self.assertContains(valasz, 'Várható')
+
+
+class JutalomAjanlasTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        self.jatek, kazamata = harc_vilag(self.jatekos)
+        self.kis = [kazamata] + tovabbi_kazamatak(random.Random(15), 30)
+    
+    def nyers_erovel(self, jutalom):
+        """Kártyánként: a fejlesztett paklival hány eddig vesztes kazamata nyerhető, külön szimulációkkal"""
+        pakli_kartyak = game_logic.pakli_kartyak_betoltese(self.jatek.pakli)
+        kazamatak = [kartyak for _, kartyak in game_logic.kazamatak_betoltese() if len(kartyak) == len(pakli_kartyak)]
+        vesztes = [kartyak for kartyak in kazamatak if not harc_lefuttatasa(pakli_kartyak, kartyak).jatekos_gyozott]
+        plusz_sebzes, plusz_eletero = jutalom
+        ajanlas = {}
+        for fejlesztett in pakli_kartyak:
+            pakli = [
+                HarcKartya(k.id, k.nev, k.sebzes + plusz_sebzes, k.eletero + plusz_eletero, k.tipus)
+                if k is fejlesztett else k
+                for k in pakli_kartyak
+            ]
+            ajanlas[fejlesztett.id] = sum(harc_lefuttatasa(pakli, kartyak).jatekos_gyozott for kartyak in vesztes)
+        return ajanlas
+    
+    def test_egyezik_a_kulon_szimulaciokkal(self):
+        for tipus in (Kazamata.TIPUS_EGYSZERU, Kazamata.TIPUS_KIS, Kazamata.TIPUS_NAGY):
+            with self.subTest(tipus=tipus):
+                jutalom_kazamata = Kazamata(nev=tipus, tipus=tipus)
+                vart = self.nyers_erovel(jutalom_kazamata.get_jutalom())
+                self.assertEqual(game_logic.jutalom_ajanlas(self.jatek, jutalom_kazamata), vart)
+                # Legyen különbség a kártyák között
+                self.assertGreater(len(set(vart.values())), 1)
+    
+    def test_jutalom_oldal(self):
+        harc = Harc.objects.create(jatek=self.jatek, kazamata=self.kis[0], befejezve=True, jatekos_gyozott=True)
+        vart = self.nyers_erovel(self.kis[0].get_jutalom())
+        
+        self.client.force_login(self.jatekos)
+        valasz = self.client.get(f'/player/game/{self.jatek.id}/harc/{harc.id}/jutalom/')
+        
+        kartyak = {kartya.id: kartya for kartya in valasz.context['gyujtemeny']}
+        self.assertEqual(len(kartyak), 6)
+        for kartya_id, kartya in kartyak.items():
+            self.assertEqual(kartya.uj_kazamatak, vart.get(kartya_id))
+            self.assertEqual(kartya.ajanlott, kartya_id in vart and vart[kartya_id] == max(vart.values()))
+
+
+class HarcApiHibakTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        harc = harcok_letrehozasa(self.jatekos)[0]
+        self.api = f'/player/jatek/{harc.jatek_id}/harc/{harc.kazamata_id}/api/'
+        self.auto = f'/player/jatek/{harc.jatek_id}/harc/{harc.kazamata_id}/auto/'
+        self.kliens = Client(enforce_csrf_checks=True)
+    
+    def bejelentkezve(self):
+        """Bejelentkezés egy érvényes CSRF tokennel (a login oldal teszi sütibe)"""
+        self.kliens.get('/login/')
+        self.kliens.force_login(self.jatekos)
+        return {'HTTP_X_CSRFTOKEN': self.kliens.cookies['csrftoken'].value}
+    
+    def assertJsonHiba(self, valasz, statusz):
+        self.assertEqual(valasz.status_code, statusz)
+        self.assertIn('error', valasz.json())
+    
+    def test_bejelentkezes_nelkul(self):
+        self.assertJsonHiba(self.kliens.post(self.api), 401)
+        self.assertJsonHiba(self.kliens.post(self.auto, HTTP_ACCEPT='application/json'), 401)
+    
+    def test_metodus_es_csrf(self):
+        self.kliens.force_login(self.jatekos)
+        self.assertJsonHiba(self.kliens.get(self.api), 405)
+        self.assertJsonHiba(self.kliens.post(self.api), 403)
+        self.assertJsonHiba(self.kliens.post(self.auto, HTTP_ACCEPT='application/json'), 403)
+        
+        # Böngészős űrlapnak a Django saját CSRF hiba oldala
+        valasz = self.kliens.post(self.auto)
+        self.assertEqual(valasz.status_code, 403)
+        self.assertTrue(valasz['Content-Type'].startswith('text/html'))
+    
+    def test_sikeres_harc(self):
+        jatek, kazamata = harc_vilag(self.jatekos)
+        valasz = self.kliens.post(f'/player/jatek/{jatek.id}/harc/{kazamata.id}/api/', **self.bejelentkezve())
+        
+        self.assertEqual(valasz.status_code, 200)
+        adat = valasz.json()
+        harc = Harc.objects.get(id=adat['harc_id'])
+        self.assertTrue(harc.befejezve)
+        self.assertEqual(harc.jatekos_gyozott, adat['jatekos_gyozott'])
+        self.assertEqual(adat['kazamata'], kazamata.nev)
+        self.assertEqual(adat['osszes_utkozet'], 4)
+        self.assertEqual(adat['jatekos_gyozelmek'], sum(utkozet['jatekos_nyert'] for utkozet in adat['utkozetek']))
+        self.assertEqual(
+            [(u.sorrend, u.jatekos_kartya_id, u.jatekos_nyert, u.gyoztes_ok) for u in harc.utközetek.order_by('sorrend')],
+            [(u['sorrend'], u['jatekos_kartya']['id'], u['jatekos_nyert'], u['ok']) for u in adat['utkozetek']],
+        )
+        
+        # A könyvelés a feldolgozóé: a kérés után még vár, kiürítés után rendezett
+        profile = UserProfile.objects.get(user=self.jatekos)
+        self.assertEqual((profile.osszes_gyozelem, profile.osszes_vereseg), (0, 0))
+        self.assertEqual(battle_events.kiurites(), 1)
+        profile.refresh_from_db()
+        gyozott = int(adat['jatekos_gyozott'])
+        self.assertEqual((profile.osszes_gyozelem, profile.osszes_vereseg, profile.jelenlegi_sorozat),
+                         (gyozott, 1 - gyozott, gyozott))
+        self.assertGreaterEqual(profile.osszes_pontszam, UserProfile.GYOZELEM_PONT * gyozott)
+    
+    def test_hibas_parameterek(self):
+        kliens = Client()
+        kliens.force_login(self.jatekos)
+        json = {'HTTP_ACCEPT': 'application/json'}
+        self.assertJsonHiba(kliens.post(self.auto, {'darab': 'abc'}, **json), 400)
+        self.assertJsonHiba(kliens.post(self.auto, {'darab': '2', 'kartya_id': '999999'}, **json), 400)
+        self.assertJsonHiba(kliens.post(self.api.replace('/harc/', '/harc/9'), **json), 404)
+    
+    def test_urlap_tovabbra_is_atiranyit(self):
+        kliens = Client()
+        kliens.force_login(self.jatekos)
+        valasz = kliens.post(self.auto, {'darab': 'abc'})
+        self.assertEqual(valasz.status_code, 302)
+
+
+class HarcConsumerTest(AlapTestCase):
+    """A harc websocket: a várakozások helyett csak az event loop-ot engedi tovább"""
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        self.jatek, self.kazamata = harc_vilag(self.jatekos)
+        # A könyvelés a dedikált feldolgozóé, itt csak az outbox számít
+        inditas = mock.patch.object(battle_events, 'inditas')
+        inditas.start()
+        self.addCleanup(inditas.stop)
+    
+    def harc(self, forgatokonyv, gyors_varakozasok=None):
+        """
+        A forgatókönyv egy csatlakozott kommunikátorral; az első gyors_varakozasok
+        várakozás után a harc megáll (None: egyik sem áll meg).
+        """
+        eredeti = asyncio.sleep
+        varakozasok = []
+        
+        async def varakozas(ido, *args, **kwargs):
+            varakozasok.append(ido)
+            if gyors_varakozasok is not None and len(varakozasok) > gyors_varakozasok:
+                await asyncio.Event().wait()
+            await eredeti(0)
+        
+        async def futtatas():
+            kommunikator = WebsocketCommunicator(
+                URLRouter(websocket_urlpatterns), f'/ws/battle/{self.jatek.id}/{self.kazamata.id}/'
+            )
+            kommunikator.scope['user'] = self.jatekos
+            csatlakozott, _ = await kommunikator.connect()
+            self.assertTrue(csatlakozott)
+            self.assertEqual((await kommunikator.receive_json_from())['type'], 'connection')
+            try:
+                return await forgatokonyv(kommunikator)
+            finally:
+                await kommunikator.disconnect()
+        
+        with mock.patch('damareen.consumers.asyncio.sleep', varakozas):
+            return async_to_sync(futtatas)()
+    
+    @staticmethod
+    async def keretek(kommunikator, utolso):
+        """Üzenetek az első 'utolso' típusúig"""
+        keretek = []
+        while not keretek or keretek[-1]['type'] != utolso:
+            keretek.append(await kommunikator.receive_json_from())
+        return keretek
+    
+    def test_megszakadt_harc_nem_marad_meg(self):
+        async def forgatokonyv(kommunikator):
+            await kommunikator.send_json_to({'action': 'start_battle'})
+            # Az első ütközet már pufferben van, amikor a harc megáll
+            return await self.keretek(kommunikator, 'battle_animation')
+        
+        keretek = self.harc(forgatokonyv, gyors_varakozasok=4)
+        
+        self.assertEqual([keret['type'] for keret in keretek],
+                         ['battle_start', 'round_start', 'card_reveal', 'card_reveal', 'battle_animation'])
+        self.assertFalse(Harc.objects.exists())
+        self.assertFalse(Utközet.objects.exists())
+        self.assertFalse(HarcEsemeny.objects.exists())
+    
+    def test_vegigjatszott_harc_egyszer_szamol_el(self):
+        async def forgatokonyv(kommunikator):
+            await kommunikator.send_json_to({'action': 'start_battle'})
+            return await self.keretek(kommunikator, 'battle_end')
+        
+        vege = self.harc(forgatokonyv)[-1]
+        
+        # A lecsatlakozás a befejezett harcot nem törli és nem számolja el újra
+        harc = Harc.objects.get()
+        self.assertEqual(vege['harc_id'], harc.id)
+        self.assertTrue(harc.befejezve)
+        self.assertEqual(harc.jatekos_gyozott, vege['winner'] == 'player')
+        self.assertEqual(harc.utközetek.count(), 4)
+        esemeny = HarcEsemeny.objects.get()
+        self.assertEqual((esemeny.harc_id, esemeny.jatekos_gyozott), (harc.id, harc.jatekos_gyozott))
+    
+    def test_masodik_inditas_elutasitva(self):
+        async def forgatokonyv(kommunikator):
+            await kommunikator.send_json_to({'action': 'start_battle'})
+            await kommunikator.send_json_to({'action': 'start_battle'})
+            keretek = await self.keretek(kommunikator, 'error')
+            harcok = await database_sync_to_async(Harc.objects.count)()
+            return keretek, harcok
+        
+        keretek, harcok = self.harc(forgatokonyv, gyors_varakozasok=0)
+        
+        self.assertEqual(keretek[-1]['message'], '❌ Már folyamatban van egy harc!')
+        self.assertEqual(harcok, 1)
+        self.assertFalse(Harc.objects.exists())
+    
+    def test_idovonal_egyezik_a_mentett_utkozetekkel(self):
+        async def forgatokonyv(kommunikator):
+            await kommunikator.send_json_to({'action': 'start_battle', 'mode': 'timeline'})
+            return await kommunikator.receive_json_from()
+        
+        idovonal = self.harc(forgatokonyv)
+        
+        self.assertEqual(idovonal['type'], 'battle_timeline')
+        harc = Harc.objects.get(id=idovonal['harc_id'])
+        esemenyek = idovonal['events']
+        self.assertEqual([esemeny['t'] for esemeny in esemenyek], sorted(esemeny['t'] for esemeny in esemenyek))
+        self.assertEqual(esemenyek[-1]['t'], idovonal['duration'])
+        self.assertEqual(esemenyek[-1]['harc_id'], harc.id)
+        self.assertEqual(esemenyek[-1]['winner'], 'player' if harc.jatekos_gyozott else 'enemy')
+        
+        kartyak = {}
+        eredmenyek = []
+        for esemeny in esemenyek:
+            if esemeny['type'] == 'card_reveal':
+                kartya = esemeny['card']
+                kartyak[esemeny['round'], esemeny['side']] = (kartya['damage'], kartya['hp'], kartya['element'])
+            elif esemeny['type'] == 'round_result':
+                eredmenyek.append((esemeny['round'], esemeny['winner'] == 'player', esemeny['reason_code']))
+        
+        utkozetek = list(harc.utközetek.order_by('sorrend'))
+        self.assertEqual(eredmenyek, [(u.sorrend, u.jatekos_nyert, u.gyoztes_ok) for u in utkozetek])
+        self.assertEqual(kartyak, {
+            kulcs: ertek
+            for u in utkozetek
+            for kulcs, ertek in (
+                ((u.sorrend, 'player'), (u.jatekos_sebzes, u.jatekos_eletero, u.jatekos_tipus)),
+                ((u.sorrend, 'enemy'), (u.kazamata_sebzes, u.kazamata_eletero, u.kazamata_tipus)),
+            )
+        })
+        self.assertEqual(HarcEsemeny.objects.filter(harc=harc).count(), 1)
+
+
+class BalanszTest(AlapTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jatekos = jatekos_letrehozasa('jatekos')
+        _, self.kazamata = harc_vilag(self.jatekos)
+    
+    def test_matrix_egyezik_a_harc_motorral(self):
+        matrix = balance.balansz_frissites()['matrix']
+        
+        # Minden világkártya alap statokkal, a kazamata minden kártyája ellen egy harcban
+        (kazamata, kazamata_kartyak), = game_logic.kazamatak_betoltese()
+        self.assertEqual(kazamata, self.kazamata)
+        self.assertEqual([oszlop[0] for oszlop in matrix['oszlopok']], [kartya.id for kartya in kazamata_kartyak])
+        for kartya_id, maszk in zip(matrix['sorok'], matrix['gyozelmek']):
+            kartya = Vilagkartya.objects.get(id=kartya_id)
+            jatekos = HarcKartya(kartya.id, kartya.nev, kartya.sebzes, kartya.eletero, kartya.tipus)
+            harc = harc_lefuttatasa([jatekos] * len(kazamata_kartyak), kazamata_kartyak)
+            self.assertEqual(
+                [bool(maszk >> oszlop & 1) for oszlop in range(len(kazamata_kartyak))],
+                [utkozet.jatekos_nyert for utkozet in harc.utkozetek],
+                kartya.nev
+            )
+    
+    def test_szerkesztes_elavultnak_jeloli(self):
+        self.assertEqual(balance.balansz_matrix(), (None, True))
+        balansz = balance.balansz_frissites()
+        self.assertEqual(balance.balansz_matrix(), (balansz, False))
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            Vilagkartya.objects.create(nev='Új lap', sebzes=3, eletero=3, tipus=ELEMEK[0])
+        self.assertEqual(balance.balansz_matrix(), (balansz, True))
+        
+        with mock.patch.object(balance, 'BALANSZ_FRISSESSEG', -1):
+            balance.balansz_frissites()
+            self.assertTrue(balance.balansz_matrix()[1])
+    
+    def test_muszerfal_nem_szamol(self):
+        kliens = Client()
+        kliens.force_login(jatekos_letrehozasa('mester2'))
+        with mock.patch.object(balance, 'balansz_szamitas', side_effect=AssertionError('számolt')):
+            valasz = kliens.get('/master/')
+            self.assertContains(valasz, 'python manage.py balance_matrix')
+        
+        balance.balansz_frissites()
+        with mock.patch.object(balance, 'balansz_szamitas', side_effect=AssertionError('számolt')):
+            valasz = kliens.get('/master/')
+            self.assertContains(valasz, self.kazamata.nev)
+            self.assertNotContains(valasz, 'python manage.py balance_matrix')
+    
+    def test_command_csak_elavultat_szamol(self):
+        call_command('balance_matrix', '--ha-elavult', stdout=StringIO())
+        balansz = balance.balansz_matrix()[0]
+        self.assertIsNotNone(balansz)
+        
+        with mock.patch.object(balance, 'balansz_szamitas', side_effect=AssertionError('számolt')):
+            call_command('balance_matrix', '--ha-elavult', stdout=StringIO())
+        self.assertEqual(balance.balansz_matrix(), (balansz, False))
+
+
+class VerzioBelyegTest(AlapTestCase):
+    def test_friss_belyeg_lekerdezes_nelkul(self):
+        belyeg = belyegek.belyeg('teszt')
+        with self.assertNumQueries(0):
+            self.assertEqual(belyegek.belyeg('teszt'), belyeg)
+    
+    def test_masik_processz_leptetese_az_elettartam_utan_latszik(self):
+        regi = belyegek.belyeg('teszt')
+        cache.set('teszt', 'masik processz', None)
+        self.assertEqual(belyegek.belyeg('teszt'), regi)
+        with mock.patch.object(belyegek, 'ELETTARTAM', 0):
+            self.assertEqual(belyegek.belyeg('teszt'), 'masik processz')
+    
+    def test_sajat_leptetes_azonnal_latszik(self):
+        regi = belyegek.belyeg('teszt')
+        belyegek.leptetes(['teszt'])
+        with self.assertNumQueries(0):
+            uj = belyegek.belyeg('teszt')
+        self.assertNotEqual(uj, regi)
+        self.assertEqual(cache.get('teszt'), uj)
@@ -1,676 +1,952 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import authenticate, login, logout
-from django.contrib.auth.decorators import login_required
-from django.contrib.auth.models import User
-from django.contrib import messages
-from django.db import transaction
-from django.db.models import Max
-
-from .models import (
-    UserProfile, JatekKornyezet, Jatek, Jatekoskartya,
-    Pakli, PakliKartya, Kazamata, Harc, Vilagkartya,
-    Vezerkartya, GyujtemenyKartya, KazamataKartya,
-    Achievement, PlayerAchievement,
-    ELEMENT_FIRE, ELEMENT_EARTH, ELEMENT_WATER, ELEMENT_AIR
-)
-from .game_logic import harc_vegrehajtasa, jutalom_alkalmazasa, frissit_rangsort
-from .forms import KazamataForm, VilagkartyaForm, VezerkartyaForm
-
-
-def index(request):
-    """Főoldal"""
-    return render(request, 'damareen/index.html')
-
-
-def user_login(request):
-    """Bejelentkezés"""
-    if request.method == 'POST':
-        username = request.POST.get('username')
-        password = request.POST.get('password')
-        user = authenticate(request, username=username, password=password)
-        
-        if user is not None:
-            login(request, user)
-            messages.success(request, f'Üdvözöl a Damareen, {user.username}!')
-            return redirect('damareen:index')
-        else:
-            messages.error(request, 'Hibás felhasználónév vagy jelszó!')
-    
-    return render(request, 'damareen/login.html')
-
-
-def user_logout(request):
-    """Kijelentkezés"""
-    logout(request)
-    messages.info(request, 'Sikeresen kijelentkeztél!')
-    return redirect('damareen:index')
-
-
-def user_register(request):
-    """Regisztráció"""
-    if request.method == 'POST':
-        username = request.POST.get('username')
-        password = request.POST.get('password')
-        password2 = request.POST.get('password2')
-        user_type = request.POST.get('user_type', UserProfile.PERMISSION_PLAYER)
-        
-        if password != password2:
-            messages.error(request, 'A jelszavak nem egyeznek!')
-        elif User.objects.filter(username=username).exists():
-            messages.error(request, 'Ez a felhasználónév már foglalt!')
-        else:
-            user = User.objects.create_user(username=username, password=password)
-            UserProfile.objects.create(user=user, user_type=user_type)
-            messages.success(request, 'Sikeres regisztráció! Most már bejelentkezhetsz.')
-            return redirect('damareen:login')
-    
-    return render(request, 'damareen/register.html')
-
-
-@login_required
-def master_dashboard(request):
-    """Játékmester műszerfal"""
-    kornyezetek = JatekKornyezet.objects.filter(keszitette=request.user)
-    vilag_kartyak = Vilagkartya.objects.all()
-    vezer_kartyak = Vezerkartya.objects.all()
-    kazamatak = Kazamata.objects.all()
-    
-    return render(request, 'damareen/master/dashboard.html', {
-        'kornyezetek': kornyezetek,
-        'vilag_kartyak': vilag_kartyak,
-        'vezer_kartyak': vezer_kartyak,
-        'kazamatak': kazamatak,
-    })
-
-
-@login_required
-def create_kornyezet(request):
-    """Új játékkörnyezet létrehozása"""
-    if request.method == 'POST':
-        nev = request.POST.get('nev')
-        
-        # Játékkörnyezet létrehozása
-        kornyezet = JatekKornyezet.objects.create(
-            nev=nev,
-            keszitette=request.user
-        )
-        
-        messages.success(request, f'Játékkörnyezet "{nev}" létrehozva!')
-        return redirect('damareen:view_kornyezet', kornyezet_id=kornyezet.id)
-    
-    vilag_kartyak = Vilagkartya.objects.all()
-    return render(request, 'damareen/master/create_kornyezet.html', {
-        'vilag_kartyak': vilag_kartyak
-    })
-
-
-@login_required
-def view_kornyezet(request, kornyezet_id):
-    """Játékkörnyezet megtekintése"""
-    kornyezet = get_object_or_404(JatekKornyezet, id=kornyezet_id, keszitette=request.user)
-    
-    if request.method == 'POST':
-        # Kezdő gyűjtemény frissítése
-        valasztott_kartyak = request.POST.getlist('kartyak')
-        GyujtemenyKartya.objects.filter(kornyezet=kornyezet).delete()
-        
-        for kartya_id in valasztott_kartyak:
-            GyujtemenyKartya.objects.create(
-                kornyezet=kornyezet,
-                kartya_id=kartya_id
-            )
-        
-        messages.success(request, 'Kezdő gyűjtemény frissítve!')
-    
-    vilag_kartyak = Vilagkartya.objects.all()
-    kezdo_gyujtemeny = kornyezet.kezdo_gyujtemeny.all()
-    kazamatak = Kazamata.objects.all()
-    
-    return render(request, 'damareen/master/view_kornyezet.html', {
-        'kornyezet': kornyezet,
-        'vilag_kartyak': vilag_kartyak,
-        'kezdo_gyujtemeny': kezdo_gyujtemeny,
-        'kazamatak': kazamatak
-    })
-
-
-@login_required
-def player_dashboard(request):
-    """Játékos műszerfal"""
-    jatekok = Jatek.objects.filter(jatekos=request.user)
-    kornyezetek = JatekKornyezet.objects.all()
-    
-    return render(request, 'damareen/player/dashboard.html', {
-        'jatekok': jatekok,
-        'kornyezetek': kornyezetek
-    })
-
-
-@login_required
-@transaction.atomic
-def start_game(request, kornyezet_id):
-    """Új játék indítása"""
-    kornyezet = get_object_or_404(JatekKornyezet, id=kornyezet_id)
-    
-    # Ellenőrizzük, hogy van-e már játék ezzel a környezettel
-    jatek, created = Jatek.objects.get_or_create(
-        jatekos=request.user,
-        kornyezet=kornyezet
-    )
-    
-    if created:
-        # Kezdő gyűjtemény másolása
-        for gyujtemeny_kartya in kornyezet.kezdo_gyujtemeny.all():
-            Jatekoskartya.objects.create(
-                jatek=jatek,
-                eredeti_kartya=gyujtemeny_kartya.kartya,
-                aktualis_sebzes=gyujtemeny_kartya.kartya.sebzes,
-                aktualis_eletero=gyujtemeny_kartya.kartya.eletero
-            )
-        messages.success(request, f'Új játék indítva: {kornyezet.nev}')
-    else:
-        messages.info(request, 'Folytatod a megkezdett játékot.')
-    
-    return redirect('damareen:game_view', jatek_id=jatek.id)
-
-
-@login_required
-def game_view(request, jatek_id):
-    """Játék nézet"""
-    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
-    gyujtemeny = jatek.gyujtemeny.all()
-    pakli = None
-    
-    try:
-        pakli = jatek.pakli
-    except Pakli.DoesNotExist:
-        pass
-    
-    kazamatak = Kazamata.objects.all()
-    utolso_harcok = jatek.harcok.filter(befejezve=True).order_by('-inditas')[:5]
-    
-    return render(request, 'damareen/player/game_view.html', {
-        'jatek': jatek,
-        'gyujtemeny': gyujtemeny,
-        'pakli': pakli,
-        'kazamatak': kazamatak,
-        'utolso_harcok': utolso_harcok
-    })
-
-
-@login_required
-@transaction.atomic
-def pakli_osszeallit(request, jatek_id):
-    """Pakli összeállítása"""
-    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
-    
-    if request.method == 'POST':
-        valasztott_kartyak = request.POST.getlist('kartyak')
-        
-        if not valasztott_kartyak:
-            messages.error(request, 'Válassz ki legalább egy kártyát!')
-            return redirect('damareen:pakli_osszeallit', jatek_id=jatek_id)
-        
-        # Régi pakli törlése
-        try:
-            jatek.pakli.delete()
-        except Pakli.DoesNotExist:
-            pass
-        
-        # Új pakli létrehozása
-        pakli = Pakli.objects.create(jatek=jatek)
-        
-        for i, kartya_id in enumerate(valasztott_kartyak):
-            PakliKartya.objects.create(
-                pakli=pakli,
-                kartya_id=kartya_id,
-                sorrend=i + 1
-            )
-        
-        messages.success(request, f'Pakli összeállítva {len(valasztott_kartyak)} kártyával!')
-        return redirect('damareen:game_view', jatek_id=jatek_id)
-    
-    gyujtemeny = jatek.gyujtemeny.all()
-    return render(request, 'damareen/player/pakli_osszeallit.html', {
-        'jatek': jatek,
-        'gyujtemeny': gyujtemeny
-    })
-
-
-@login_required
-@transaction.atomic
-def harc_indit(request, jatek_id, kazamata_id):
-    """Harc indítása - új: WebSocket alapú real-time battle"""
-    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
-    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
-    
-    # Ellenőrizzük, hogy van-e pakli
-    try:
-        pakli = jatek.pakli
-    except Pakli.DoesNotExist:
-        messages.error(request, '❌ Először állíts össze egy paklit!')
-        return redirect('damareen:game_view', jatek_id=jatek_id)
-    
-    # Ellenőrizzük a kártyák számát
-    pakli_meret = pakli.get_kartyak_szama()
-    kazamata_meret = kazamata.get_kartyak_szama()
-    
-    if pakli_meret != kazamata_meret:
-        messages.error(request, 
-            f'❌ A paklidban {pakli_meret} kártya van, de a kazamatához {kazamata_meret} kell!')
-        return redirect('damareen:game_view', jatek_id=jatek_id)
-    
-    # Redirect to WebSocket battle arena
-    return redirect('damareen:battle_arena', jatek_id=jatek_id, kazamata_id=kazamata_id)
-
-
-@login_required
-def battle_arena(request, jatek_id, kazamata_id):
-    """Real-time battle arena with WebSocket"""
-    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
-    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
-    
-    return render(request, 'damareen/player/battle_arena.html', {
-        'jatek': jatek,
-        'kazamata': kazamata
-    })
-
-
-@login_required
-def harc_eredmeny(request, jatek_id, harc_id):
-    """Harc eredményének megtekintése"""
-    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
-    harc = get_object_or_404(Harc, id=harc_id, jatek=jatek)
-    
-    # Rangsor frissítése (csak egyszer)
-    if harc.befejezve and not harc.rangsor_frissitve:
-        frissit_rangsort(request.user, harc.jatekos_gyozott)
-        harc.rangsor_frissitve = True
-        harc.save(update_fields=['rangsor_frissitve'])
-    
-    utközetek = harc.utközetek.all()
-    
-    return render(request, 'damareen/player/harc_eredmeny.html', {
-        'jatek': jatek,
-        'harc': harc,
-        'utközetek': utközetek
-    })
-
-
-@login_required
-@transaction.atomic
-def jutalom_valaszt(request, jatek_id, harc_id):
-    """Jutalom kártya választása"""
-    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
-    harc = get_object_or_404(Harc, id=harc_id, jatek=jatek)
-    
-    if not harc.jatekos_gyozott:
-        messages.error(request, 'Csak győzelem esetén kaphatsz jutalmat!')
-        return redirect('damareen:game_view', jatek_id=jatek_id)
-    
-    if request.method == 'POST':
-        kartya_id = request.POST.get('kartya_id')
-        
-        try:
-            uzenet = jutalom_alkalmazasa(jatek, harc.kazamata, kartya_id)
-            messages.success(request, uzenet)
-            return redirect('damareen:game_view', jatek_id=jatek_id)
-        except Exception as e:
-            messages.error(request, f'Hiba: {str(e)}')
-    
-    gyujtemeny = jatek.gyujtemeny.all()
-    
-    return render(request, 'damareen/player/jutalom_valaszt.html', {
-        'jatek': jatek,
-        'harc': harc,
-        'gyujtemeny': gyujtemeny
-    })
-
-
-# ============= JÁTÉKMESTER FUNKCIÓK (Admin nélkül) =============
-
-@login_required
-def manage_vilagkartyak(request):
-    """Világkártyák kezelése"""
-    kartyak = Vilagkartya.objects.all().order_by('nev')
-    
-    return render(request, 'damareen/master/manage_vilagkartyak.html', {
-        'kartyak': kartyak
-    })
-
-
-@login_required
-@transaction.atomic
-def create_vilagkartya(request):
-    """Új világkártya létrehozása"""
-    if request.method == 'POST':
-        form = VilagkartyaForm(request.POST)
-        if form.is_valid():
-            kartya = form.save()
-            messages.success(request, f'Világkártya "{kartya.nev}" létrehozva!')
-            return redirect('damareen:manage_vilagkartyak')
-    else:
-        form = VilagkartyaForm()
-    
-    return render(request, 'damareen/master/create_vilagkartya.html', {
-        'form': form
-    })
-
-
-@login_required
-@transaction.atomic
-def edit_vilagkartya(request, kartya_id):
-    """Világkártya szerkesztése"""
-    kartya = get_object_or_404(Vilagkartya, id=kartya_id)
-    
-    if request.method == 'POST':
-        form = VilagkartyaForm(request.POST, instance=kartya)
-        if form.is_valid():
-            form.save()
-            messages.success(request, f'Világkártya "{kartya.nev}" frissítve!')
-            return redirect('damareen:manage_vilagkartyak')
-    else:
-        form = VilagkartyaForm(instance=kartya)
-    
-    return render(request, 'damareen/master/edit_vilagkartya.html', {
-        'kartya': kartya,
-        'form': form
-    })
-
-
-@login_required
-@transaction.atomic
-def delete_vilagkartya(request, kartya_id):
-    """Világkártya törlése"""
-    kartya = get_object_or_404(Vilagkartya, id=kartya_id)
-    
-    if request.method == 'POST':
-        nev = kartya.nev
-        kartya.delete()
-        messages.success(request, f'Világkártya "{nev}" törölve!')
-        return redirect('damareen:manage_vilagkartyak')
-    
-    return render(request, 'damareen/master/delete_vilagkartya.html', {
-        'kartya': kartya
-    })
-
-
-@login_required
-def manage_vezerkartyak(request):
-    """Vezérkártyák kezelése"""
-    kartyak = Vezerkartya.objects.all().order_by('nev')
-    
-    return render(request, 'damareen/master/manage_vezerkartyak.html', {
-        'kartyak': kartyak
-    })
-
-
-@login_required
-@transaction.atomic
-def create_vezerkartya(request):
-    """Új vezérkártya létrehozása"""
-    if request.method == 'POST':
-        form = VezerkartyaForm(request.POST)
-        if form.is_valid():
-            kartya = form.save()
-            messages.success(request, f'Vezérkártya "{kartya.nev}" létrehozva!')
-            return redirect('damareen:manage_vezerkartyak')
-    else:
-        form = VezerkartyaForm()
-    
-    vilag_kartyak = Vilagkartya.objects.all().order_by('nev')
-    
-    return render(request, 'damareen/master/create_vezerkartya.html', {
-        'form': form,
-        'vilag_kartyak': vilag_kartyak
-    })
-
-
-@login_required
-@transaction.atomic
-def delete_vezerkartya(request, kartya_id):
-    """Vezérkártya törlése"""
-    kartya = get_object_or_404(Vezerkartya, id=kartya_id)
-    
-    if request.method == 'POST':
-        nev = kartya.nev
-        kartya.delete()
-        messages.success(request, f'Vezérkártya "{nev}" törölve!')
-        return redirect('damareen:manage_vezerkartyak')
-    
-    return render(request, 'damareen/master/delete_vezerkartya.html', {
-        'kartya': kartya
-    })
-
-
-@login_required
-def manage_kazamatak(request):
-    """Kazamaták kezelése"""
-    kazamatak = Kazamata.objects.all().order_by('nev')
-    
-    return render(request, 'damareen/master/manage_kazamatak.html', {
-        'kazamatak': kazamatak
-    })
-
-
-@login_required
-@transaction.atomic
-def create_kazamata(request):
-    """Új kazamata létrehozása"""
-    if request.method == 'POST':
-        form = KazamataForm(request.POST)
-        if form.is_valid():
-            kazamata = form.save()
-            messages.success(request, f'Kazamata "{kazamata.nev}" létrehozva! Most add hozzá a kártyákat.')
-            return redirect('damareen:edit_kazamata', kazamata_id=kazamata.id)
-    else:
-        form = KazamataForm()
-    
-    return render(request, 'damareen/master/create_kazamata.html', {
-        'form': form
-    })
-
-
-@login_required
-@transaction.atomic
-def edit_kazamata(request, kazamata_id):
-    """Kazamata szerkesztése (kártyák hozzáadása/törlése)"""
-    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
-    
-    if request.method == 'POST':
-        # Kártya eltávolítása
-        if 'remove_card' in request.POST:
-            kazamata_kartya_id = request.POST.get('remove_card')
-            try:
-                KazamataKartya.objects.get(id=kazamata_kartya_id).delete()
-                messages.success(request, 'Kártya eltávolítva!')
-            except Exception as e:
-                messages.error(request, f'Hiba: {str(e)}')
-            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
-        
-        # Normál kártya hozzáadása
-        if 'add_normal_card' in request.POST:
-            vilag_kartya_id = request.POST.get('add_normal_card')
-            try:
-                vilag_kartya = Vilagkartya.objects.get(id=vilag_kartya_id)
-                # Következő sorrend meghatározása
-                max_sorrend = kazamata.kartyak.aggregate(Max('sorrend'))['sorrend__max'] or 0
-                KazamataKartya.objects.create(
-                    kazamata=kazamata,
-                    sorrend=max_sorrend + 1,
-                    vilag_kartya=vilag_kartya
-                )
-                messages.success(request, f'"{vilag_kartya.nev}" hozzáadva!')
-            except Exception as e:
-                messages.error(request, f'Hiba: {str(e)}')
-            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
-        
-        # Vezérkártya hozzáadása
-        if 'add_leader_card' in request.POST:
-            vezer_kartya_id = request.POST.get('add_leader_card')
-            try:
-                vezer_kartya = Vezerkartya.objects.get(id=vezer_kartya_id)
-                # Következő sorrend meghatározása
-                max_sorrend = kazamata.kartyak.aggregate(Max('sorrend'))['sorrend__max'] or 0
-                KazamataKartya.objects.create(
-                    kazamata=kazamata,
-                    sorrend=max_sorrend + 1,
-                    vezer_kartya=vezer_kartya
-                )
-                messages.success(request, f'Vezér "{vezer_kartya.nev}" hozzáadva!')
-            except Exception as e:
-                messages.error(request, f'Hiba: {str(e)}')
-            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
-        
-        # Alapadatok módosítása
-        form = KazamataForm(request.POST, instance=kazamata)
-        if form.is_valid():
-            # Ha típus változott, töröljük a kártyákat
-            if form.cleaned_data['tipus'] != kazamata.tipus:
-                kazamata.kartyak.all().delete()
-                messages.warning(request, 'A típus megváltozott, az összes kártya törölve!')
-            form.save()
-            messages.success(request, 'Kazamata módosítva!')
-            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
-    else:
-        form = KazamataForm(instance=kazamata)
-    
-    # Kártyák lekérdezése
-    vilag_kartyak = Vilagkartya.objects.all().order_by('nev')
-    vezer_kartyak = Vezerkartya.objects.all().order_by('nev')
-    
-    # Kapacitás számítás
-    if kazamata.tipus == Kazamata.TIPUS_EGYSZERU:
-        max_normalis = 1
-        max_vezer = 0
-        max_kartyak = 1
-    elif kazamata.tipus == Kazamata.TIPUS_KIS:
-        max_normalis = 3
-        max_vezer = 1
-        max_kartyak = 4
-    else:  # NAGY
-        max_normalis = 5
-        max_vezer = 1
-        max_kartyak = 6
-    
-    # Jelenlegi kártyák száma
-    current_normal = kazamata.kartyak.filter(vilag_kartya__isnull=False).count()
-    current_leader = kazamata.kartyak.filter(vezer_kartya__isnull=False).count()
-    
-    can_add_normal = current_normal < max_normalis
-    can_add_leader = (max_vezer > 0) and (current_leader < max_vezer)
-    
-    return render(request, 'damareen/master/edit_kazamata.html', {
-        'kazamata': kazamata,
-        'form': form,
-        'vilag_kartyak': vilag_kartyak,
-        'vezer_kartyak': vezer_kartyak,
-        'max_kartyak': max_kartyak,
-        'can_add_normal': can_add_normal,
-        'can_add_leader': can_add_leader,
-    })
-
-
-@login_required
-@transaction.atomic
-def delete_kazamata(request, kazamata_id):
-    """Kazamata törlése"""
-    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
-    
-    if request.method == 'POST':
-        nev = kazamata.nev
-        kazamata.delete()
-        messages.success(request, f'Kazamata "{nev}" törölve!')
-        return redirect('damareen:manage_kazamatak')
-    
-    return render(request, 'damareen/master/delete_kazamata.html', {
-        'kazamata': kazamata
-    })
-
-
-# ============= RANGSOR ÉS ACHIEVEMENTEK =============
-
-def leaderboard(request):
-    """Rangsor - legjobb játékosok listája"""
-    # Top 50 játékos pontszám szerint
-    top_players = UserProfile.objects.filter(
-        user_type=UserProfile.PERMISSION_PLAYER
-    ).select_related('user').order_by('-osszes_pontszam', '-osszes_gyozelem')[:50]
-    
-    # Aktuális felhasználó rangja
-    current_user_rank = None
-    current_user_profile = None
-    
-    if request.user.is_authenticated:
-        try:
-            current_user_profile = request.user.userprofile
-            # Megkeressük a rangját
-            all_profiles = UserProfile.objects.filter(
-                user_type=UserProfile.PERMISSION_PLAYER
-            ).order_by('-osszes_pontszam', '-osszes_gyozelem')
-            
-            for idx, profile in enumerate(all_profiles, 1):
-                if profile.user == request.user:
-                    current_user_rank = idx
-                    break
-        except UserProfile.DoesNotExist:
-            pass
-    
-    return render(request, 'damareen/leaderboard.html', {
-        'top_players': top_players,
-        'current_user_rank': current_user_rank,
-        'current_user_profile': current_user_profile
-    })
-
-
-@login_required
-def my_achievements(request):
-    """Saját achievementek megtekintése"""
-    # Összes achievement
-    all_achievements = Achievement.objects.all().order_by('cel_ertek', 'nev')
-    
-    # Játékos achievementjei
-    player_achievements = PlayerAchievement.objects.filter(
-        jatekos=request.user
-    ).select_related('achievement')
-    
-    #Dict létrehozása gyors kereséshez
-    player_ach_dict = {pa.achievement.id: pa for pa in player_achievements}
-    
-    # Achievement lista előkészítése haladással
-    achievements_with_progress = []
-    for achievement in all_achievements:
-        player_ach = player_ach_dict.get(achievement.id)
-        
-        if player_ach:
-            achievements_with_progress.append({
-                'achievement': achievement,
-                'haladás': player_ach.jelenlegi_haladás,
-                'teljesitve': player_ach.teljesitve,
-                'szazalek': player_ach.get_haladás_szazalek(),
-                'megszerzve': player_ach.megszerzve if player_ach.teljesitve else None
-            })
-        else:
-            achievements_with_progress.append({
-                'achievement': achievement,
-                'haladás': 0,
-                'teljesitve': False,
-                'szazalek': 0,
-                'megszerzve': None
-            })
-    
-    # Statisztikák
-    teljesitett_szam = sum(1 for a in achievements_with_progress if a['teljesitve'])
-    osszes_szam = len(achievements_with_progress)
-    
-    try:
-        profile = request.user.userprofile
-    except UserProfile.DoesNotExist:
-        profile = None
-    
-    return render(request, 'damareen/achievements.html', {
-        'achievements': achievements_with_progress,
-        'teljesitett_szam': teljesitett_szam,
-        'osszes_szam': osszes_szam,
-        'profile': profile
-    })
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.contrib import messages
+from django.db import transaction
+from django.http import Http404, JsonResponse
+from django.views.csrf import csrf_failure
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_POST
+from django.db.models import Max
+from functools import wraps
+
+from .models import (
+    UserProfile, JatekKornyezet, Jatek, Jatekoskartya,
+    Pakli, PakliKartya, Kazamata, Harc, Vilagkartya,
+    Vezerkartya, GyujtemenyKartya, KazamataKartya,
+    Achievement, PlayerAchievement, JatekosMetrika, Szezon
+)
+from .game_logic import (
+    jutalom_alkalmazasa, pakli_javaslat,
+    kampany_terv_keszitese, azonnali_harc, automatikus_harcok, MAX_AUTOMATIKUS_HARC,
+    pakli_elorejelzes, jutalom_ajanlas, harc_elszamolasa
+)
+from .achievements import harc_metrikak
+from .balance import balansz_matrix
+from .battle_plan import harc_cache_statisztika
+from . import leaderboard_index
+from .forms import KazamataForm, VilagkartyaForm, VezerkartyaForm
+
+
+def index(request):
+    """Főoldal"""
+    return render(request, 'damareen/index.html')
+
+
+def user_login(request):
+    """Bejelentkezés"""
+    if request.method == 'POST':
+        username = request.POST.get('username')
+        password = request.POST.get('password')
+        user = authenticate(request, username=username, password=password)
+        
+        if user is not None:
+            login(request, user)
+            messages.success(request, f'Üdvözöl a Damareen, {user.username}!')
+            return redirect('damareen:index')
+        else:
+            messages.error(request, 'Hibás felhasználónév vagy jelszó!')
+    
+    return render(request, 'damareen/login.html')
+
+
+def user_logout(request):
+    """Kijelentkezés"""
+    logout(request)
+    messages.info(request, 'Sikeresen kijelentkeztél!')
+    return redirect('damareen:index')
+
+
+def user_register(request):
+    """Regisztráció"""
+    if request.method == 'POST':
+        username = request.POST.get('username')
+        password = request.POST.get('password')
+        password2 = request.POST.get('password2')
+        user_type = request.POST.get('user_type', UserProfile.PERMISSION_PLAYER)
+        
+        if password != password2:
+            messages.error(request, 'A jelszavak nem egyeznek!')
+        elif User.objects.filter(username=username).exists():
+            messages.error(request, 'Ez a felhasználónév már foglalt!')
+        else:
+            user = User.objects.create_user(username=username, password=password)
+            UserProfile.objects.create(user=user, user_type=user_type)
+            messages.success(request, 'Sikeres regisztráció! Most már bejelentkezhetsz.')
+            return redirect('damareen:login')
+    
+    return render(request, 'damareen/register.html')
+
+
+@login_required
+def master_dashboard(request):
+    """Játékmester műszerfal"""
+    kornyezetek = JatekKornyezet.objects.filter(keszitette=request.user)
+    vilag_kartyak = Vilagkartya.objects.all()
+    vezer_kartyak = Vezerkartya.objects.all()
+    kazamatak = Kazamata.objects.all()
+    # Csak a cache-elt eredmény; számolni a balance_matrix command számol
+    balansz, balansz_elavult = balansz_matrix()
+    
+    return render(request, 'damareen/master/dashboard.html', {
+        'kornyezetek': kornyezetek,
+        'vilag_kartyak': vilag_kartyak,
+        'vezer_kartyak': vezer_kartyak,
+        'kazamatak': kazamatak,
+        'balansz': balansz,
+        'balansz_elavult': balansz_elavult,
+        'harc_cache': harc_cache_statisztika(),
+    })
+
+
+@login_required
+def create_kornyezet(request):
+    """Új játékkörnyezet létrehozása"""
+    if request.method == 'POST':
+        nev = request.POST.get('nev')
+        
+        # Játékkörnyezet létrehozása
+        kornyezet = JatekKornyezet.objects.create(
+            nev=nev,
+            keszitette=request.user
+        )
+        
+        messages.success(request, f'Játékkörnyezet "{nev}" létrehozva!')
+        return redirect('damareen:view_kornyezet', kornyezet_id=kornyezet.id)
+    
+    vilag_kartyak = Vilagkartya.objects.all()
+    return render(request, 'damareen/master/create_kornyezet.html', {
+        'vilag_kartyak': vilag_kartyak
+    })
+
+
+@login_required
+def view_kornyezet(request, kornyezet_id):
+    """Játékkörnyezet megtekintése"""
+    kornyezet = get_object_or_404(JatekKornyezet, id=kornyezet_id, keszitette=request.user)
+    
+    if request.method == 'POST':
+        # Kezdő gyűjtemény frissítése
+        valasztott_kartyak = request.POST.getlist('kartyak')
+        GyujtemenyKartya.objects.filter(kornyezet=kornyezet).delete()
+        
+        for kartya_id in valasztott_kartyak:
+            GyujtemenyKartya.objects.create(
+                kornyezet=kornyezet,
+                kartya_id=kartya_id
+            )
+        
+        messages.success(request, 'Kezdő gyűjtemény frissítve!')
+    
+    vilag_kartyak = Vilagkartya.objects.all()
+    kezdo_gyujtemeny = kornyezet.kezdo_gyujtemeny.all()
+    kazamatak = Kazamata.objects.all()
+    
+    return render(request, 'damareen/master/view_kornyezet.html', {
+        'kornyezet': kornyezet,
+        'vilag_kartyak': vilag_kartyak,
+        'kezdo_gyujtemeny': kezdo_gyujtemeny,
+        'kazamatak': kazamatak
+    })
+
+
+@login_required
+def player_dashboard(request):
+    """Játékos műszerfal"""
+    jatekok = Jatek.objects.filter(jatekos=request.user)
+    kornyezetek = JatekKornyezet.objects.all()
+    
+    return render(request, 'damareen/player/dashboard.html', {
+        'jatekok': jatekok,
+        'kornyezetek': kornyezetek
+    })
+
+
+@login_required
+@transaction.atomic
+def start_game(request, kornyezet_id):
+    """Új játék indítása"""
+    kornyezet = get_object_or_404(JatekKornyezet, id=kornyezet_id)
+    
+    # Ellenőrizzük, hogy van-e már játék ezzel a környezettel
+    jatek, created = Jatek.objects.get_or_create(
+        jatekos=request.user,
+        kornyezet=kornyezet
+    )
+    
+    if created:
+        # Kezdő gyűjtemény másolása
+        for gyujtemeny_kartya in kornyezet.kezdo_gyujtemeny.all():
+            Jatekoskartya.objects.create(
+                jatek=jatek,
+                eredeti_kartya=gyujtemeny_kartya.kartya,
+                aktualis_sebzes=gyujtemeny_kartya.kartya.sebzes,
+                aktualis_eletero=gyujtemeny_kartya.kartya.eletero
+            )
+        messages.success(request, f'Új játék indítva: {kornyezet.nev}')
+    else:
+        messages.info(request, 'Folytatod a megkezdett játékot.')
+    
+    return redirect('damareen:game_view', jatek_id=jatek.id)
+
+
+@login_required
+def game_view(request, jatek_id):
+    """Játék nézet"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    gyujtemeny = jatek.gyujtemeny.all()
+    pakli = None
+    
+    try:
+        pakli = jatek.pakli
+    except Pakli.DoesNotExist:
+        pass
+    
+    kazamatak = list(Kazamata.objects.all())
+    utolso_harcok = jatek.harcok.filter(befejezve=True).order_by('-inditas')[:5]
+    
+    # Várható eredmény a jelenlegi paklival minden illeszkedő kazamata ellen
+    if pakli:
+        elorejelzes = pakli_elorejelzes(pakli, kazamatak)
+        for kazamata in kazamatak:
+            kazamata.elorejelzes = elorejelzes.get(kazamata.id)
+    
+    return render(request, 'damareen/player/game_view.html', {
+        'jatek': jatek,
+        'gyujtemeny': gyujtemeny,
+        'pakli': pakli,
+        'kazamatak': kazamatak,
+        'utolso_harcok': utolso_harcok,
+        'max_automatikus_harc': MAX_AUTOMATIKUS_HARC
+    })
+
+
+@login_required
+@transaction.atomic
+def pakli_osszeallit(request, jatek_id):
+    """Pakli összeállítása"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    
+    if request.method == 'POST':
+        valasztott_kartyak = request.POST.getlist('kartyak')
+        
+        if not valasztott_kartyak:
+            messages.error(request, 'Válassz ki legalább egy kártyát!')
+            return redirect('damareen:pakli_osszeallit', jatek_id=jatek_id)
+        
+        # Régi pakli törlése
+        try:
+            jatek.pakli.delete()
+        except Pakli.DoesNotExist:
+            pass
+        
+        # Új pakli létrehozása
+        pakli = Pakli.objects.create(jatek=jatek)
+        
+        for i, kartya_id in enumerate(valasztott_kartyak):
+            PakliKartya.objects.create(
+                pakli=pakli,
+                kartya_id=kartya_id,
+                sorrend=i + 1
+            )
+        
+        messages.success(request, f'Pakli összeállítva {len(valasztott_kartyak)} kártyával!')
+        return redirect('damareen:game_view', jatek_id=jatek_id)
+    
+    gyujtemeny = jatek.gyujtemeny.all()
+    kazamatak = Kazamata.objects.all().order_by('nev')
+    
+    # Legjobb pakli javaslata a kiválasztott kazamatához
+    javaslat = None
+    javaslat_kazamata_id = request.GET.get('javaslat')
+    if javaslat_kazamata_id:
+        kazamata = get_object_or_404(Kazamata, id=javaslat_kazamata_id)
+        try:
+            javaslat = pakli_javaslat(jatek, kazamata)
+        except ValueError as e:
+            messages.error(request, str(e))
+    
+    return render(request, 'damareen/player/pakli_osszeallit.html', {
+        'jatek': jatek,
+        'gyujtemeny': gyujtemeny,
+        'kazamatak': kazamatak,
+        'javaslat': javaslat
+    })
+
+
+@login_required
+def kampany_terv(request, jatek_id, kazamata_id):
+    """Terv egy kazamata legyőzhetővé tételéhez (mely harcok, melyik fejlesztés)"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
+    
+    terv = None
+    try:
+        terv = kampany_terv_keszitese(jatek, kazamata)
+        if terv is None:
+            messages.warning(request, 'Nem találtunk tervet ehhez a kazamatához ésszerű számú harcon belül.')
+    except ValueError as e:
+        messages.error(request, str(e))
+    
+    return render(request, 'damareen/player/kampany_terv.html', {
+        'jatek': jatek,
+        'kazamata': kazamata,
+        'terv': terv
+    })
+
+
+@login_required
+@transaction.atomic
+def harc_indit(request, jatek_id, kazamata_id):
+    """Harc indítása - új: WebSocket alapú real-time battle"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
+    
+    # Ellenőrizzük, hogy van-e pakli
+    try:
+        pakli = jatek.pakli
+    except Pakli.DoesNotExist:
+        messages.error(request, '❌ Először állíts össze egy paklit!')
+        return redirect('damareen:game_view', jatek_id=jatek_id)
+    
+    # Ellenőrizzük a kártyák számát
+    pakli_meret = pakli.get_kartyak_szama()
+    kazamata_meret = kazamata.get_kartyak_szama()
+    
+    if pakli_meret != kazamata_meret:
+        messages.error(request, 
+            f'❌ A paklidban {pakli_meret} kártya van, de a kazamatához {kazamata_meret} kell!')
+        return redirect('damareen:game_view', jatek_id=jatek_id)
+    
+    # Redirect to WebSocket battle arena
+    return redirect('damareen:battle_arena', jatek_id=jatek_id, kazamata_id=kazamata_id)
+
+
+def _json_keres(request):
+    """Igaz, ha a kliens JSON választ kér (Accept fejléc)"""
+    return 'application/json' in request.headers.get('Accept', '')
+
+
+def json_vegpont(csak_json=True):
+    """
+    POST végpont dekorátor, amely hiba esetén is JSON-t ad (átirányítás és HTML helyett).
+    
+    A bejelentkezés, a metódus és a 404 hibák JSON 4xx választ adnak; a CSRF
+    ellenőrzés ezek után, csrf_protect-tel fut, a hibáját a csrf_hiba adja
+    JSON-ben. csak_json=False esetén ez csak a JSON-t kérő (Accept) hívókra
+    vonatkozik, a böngészős űrlapok a megszokott login_required / require_POST
+    / CSRF viselkedést kapják.
+    """
+    def dekorator(view):
+        vedett_view = csrf_protect(view)
+        oldal_view = login_required(require_POST(vedett_view))
+        
+        # A middleware helyett a csrf_protect ellenőriz, a bejelentkezés és a metódus után
+        @csrf_exempt
+        @wraps(view)
+        def burkolo(request, *args, **kwargs):
+            if not csak_json and not _json_keres(request):
+                return oldal_view(request, *args, **kwargs)
+            
+            if not request.user.is_authenticated:
+                return JsonResponse({'error': 'Bejelentkezés szükséges!'}, status=401)
+            if request.method != 'POST':
+                valasz = JsonResponse({'error': 'Csak POST kérés engedélyezett!'}, status=405)
+                valasz['Allow'] = 'POST'
+                return valasz
+            try:
+                return vedett_view(request, *args, **kwargs)
+            except Http404:
+                return JsonResponse({'error': 'A játék vagy a kazamata nem található!'}, status=404)
+        
+        burkolo.json_vegpont = csak_json
+        return burkolo
+    return dekorator
+
+
+def csrf_hiba(request, reason=''):
+    """
+    CSRF_FAILURE_VIEW: a JSON végpontoknak (lásd json_vegpont) JSON 403,
+    minden másnak a Django alapértelmezett oldala.
+    """
+    csak_json = getattr(getattr(request.resolver_match, 'func', None), 'json_vegpont', None)
+    if csak_json is not None and (csak_json or _json_keres(request)):
+        return JsonResponse({'error': 'Hiányzó vagy hibás CSRF token!'}, status=403)
+    return csrf_failure(request, reason)
+
+
+@json_vegpont(csak_json=False)
+@transaction.atomic
+def automatikus_harc(request, jatek_id, kazamata_id):
+    """
+    Több harc egymás után animáció nélkül, választott jutalom kártyával.
+    
+    Böngészős űrlapról a játék oldalára irányít vissza, JSON-t kérő
+    hívónak (Accept: application/json) JSON-ben válaszol.
+    """
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
+    
+    try:
+        try:
+            darab = int(request.POST.get('darab', 1))
+            kartya_id = request.POST.get('kartya_id') or None
+            kartya_id = int(kartya_id) if kartya_id else None
+        except ValueError:
+            raise ValueError('Hibás darabszám vagy kártya azonosító!')
+        eredmeny = automatikus_harcok(jatek, kazamata, darab, kartya_id)
+    except ValueError as e:
+        if _json_keres(request):
+            return JsonResponse({'error': str(e)}, status=400)
+        messages.error(request, f'❌ {e}')
+        return redirect('damareen:game_view', jatek_id=jatek_id)
+    
+    if _json_keres(request):
+        return JsonResponse({
+            'harc_idk': [harc.id for harc in eredmeny['harcok']],
+            'gyozelmek': eredmeny['gyozelmek'],
+            'veresegek': eredmeny['veresegek'],
+            'jutalom': eredmeny['jutalom'],
+        })
+    
+    messages.success(request,
+        f'🔁 {darab} harc lefutott: {eredmeny["gyozelmek"]} győzelem, {eredmeny["veresegek"]} vereség.')
+    if eredmeny['jutalom']:
+        messages.success(request, eredmeny['jutalom'])
+    return redirect('damareen:game_view', jatek_id=jatek_id)
+
+
+@login_required
+def battle_arena(request, jatek_id, kazamata_id):
+    """Real-time battle arena with WebSocket"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
+    
+    return render(request, 'damareen/player/battle_arena.html', {
+        'jatek': jatek,
+        'kazamata': kazamata
+    })
+
+
+@json_vegpont()
+@transaction.atomic
+def harc_api(request, jatek_id, kazamata_id):
+    """Harc azonnali lefuttatása animáció nélkül, JSON eredménnyel"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
+    
+    try:
+        harc, eredmeny = azonnali_harc(jatek, kazamata)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'harc_id': harc.id,
+        'kazamata': kazamata.nev,
+        'jatekos_gyozott': eredmeny.jatekos_gyozott,
+        'jatekos_gyozelmek': eredmeny.jatekos_gyozelmek,
+        'osszes_utkozet': len(eredmeny.utkozetek),
+        'jutalom': kazamata.get_nyeremeny_leiras() if eredmeny.jatekos_gyozott else None,
+        'utkozetek': [
+            {
+                'sorrend': utkozet.sorrend,
+                'jatekos_kartya': {
+                    'id': utkozet.jatekos.id,
+                    'nev': utkozet.jatekos.nev,
+                    'sebzes': utkozet.jatekos.sebzes,
+                    'eletero': utkozet.jatekos.eletero,
+                    'tipus': utkozet.jatekos.tipus,
+                },
+                'kazamata_kartya': {
+                    'id': utkozet.kazamata.id,
+                    'nev': utkozet.kazamata.nev,
+                    'sebzes': utkozet.kazamata.sebzes,
+                    'eletero': utkozet.kazamata.eletero,
+                    'tipus': utkozet.kazamata.tipus,
+                    'vezer': utkozet.kazamata.vezer,
+                },
+                'jatekos_nyert': utkozet.jatekos_nyert,
+                'ok': int(utkozet.ok),
+                'ok_szoveg': utkozet.ok_szoveg,
+            }
+            for utkozet in eredmeny.utkozetek
+        ],
+    })
+
+
+@login_required
+def harc_eredmeny(request, jatek_id, harc_id):
+    """Harc eredményének megtekintése"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    harc = get_object_or_404(Harc.objects.select_related('kazamata'), id=harc_id, jatek=jatek)
+    utközetek = list(harc.utközetek.all())
+    
+    # Rangsor elszámolása (pontosan egyszer, a feltételes UPDATE dönt)
+    if harc.befejezve and not harc.rangsor_frissitve:
+        harc_elszamolasa(harc.id, request.user.id, harc.jatekos_gyozott, harc_metrikak(
+            harc.kazamata, harc.jatekos_gyozott, ((u.jatekos_tipus, u.jatekos_nyert) for u in utközetek)
+        ))
+    
+    return render(request, 'damareen/player/harc_eredmeny.html', {
+        'jatek': jatek,
+        'harc': harc,
+        'utközetek': utközetek
+    })
+
+
+@login_required
+@transaction.atomic
+def jutalom_valaszt(request, jatek_id, harc_id):
+    """Jutalom kártya választása"""
+    jatek = get_object_or_404(Jatek, id=jatek_id, jatekos=request.user)
+    harc = get_object_or_404(Harc, id=harc_id, jatek=jatek)
+    
+    if not harc.jatekos_gyozott:
+        messages.error(request, 'Csak győzelem esetén kaphatsz jutalmat!')
+        return redirect('damareen:game_view', jatek_id=jatek_id)
+    
+    if request.method == 'POST':
+        kartya_id = request.POST.get('kartya_id')
+        
+        try:
+            uzenet = jutalom_alkalmazasa(jatek, harc.kazamata, kartya_id)
+            messages.success(request, uzenet)
+            return redirect('damareen:game_view', jatek_id=jatek_id)
+        except Exception as e:
+            messages.error(request, f'Hiba: {str(e)}')
+    
+    gyujtemeny = list(jatek.gyujtemeny.select_related('eredeti_kartya'))
+    
+    # Melyik kártya fejlesztése nyitna meg a legtöbb új kazamatát
+    ajanlas = jutalom_ajanlas(jatek, harc.kazamata)
+    legjobb = max(ajanlas.values(), default=0)
+    for kartya in gyujtemeny:
+        kartya.uj_kazamatak = ajanlas.get(kartya.id)
+        kartya.ajanlott = legjobb > 0 and kartya.uj_kazamatak == legjobb
+    
+    return render(request, 'damareen/player/jutalom_valaszt.html', {
+        'jatek': jatek,
+        'harc': harc,
+        'gyujtemeny': gyujtemeny
+    })
+
+
+# ============= JÁTÉKMESTER FUNKCIÓK (Admin nélkül) =============
+
+@login_required
+def manage_vilagkartyak(request):
+    """Világkártyák kezelése"""
+    kartyak = Vilagkartya.objects.all().order_by('nev')
+    
+    return render(request, 'damareen/master/manage_vilagkartyak.html', {
+        'kartyak': kartyak
+    })
+
+
+@login_required
+@transaction.atomic
+def create_vilagkartya(request):
+    """Új világkártya létrehozása"""
+    if request.method == 'POST':
+        form = VilagkartyaForm(request.POST)
+        if form.is_valid():
+            kartya = form.save()
+            messages.success(request, f'Világkártya "{kartya.nev}" létrehozva!')
+            return redirect('damareen:manage_vilagkartyak')
+    else:
+        form = VilagkartyaForm()
+    
+    return render(request, 'damareen/master/create_vilagkartya.html', {
+        'form': form
+    })
+
+
+@login_required
+@transaction.atomic
+def edit_vilagkartya(request, kartya_id):
+    """Világkártya szerkesztése"""
+    kartya = get_object_or_404(Vilagkartya, id=kartya_id)
+    
+    if request.method == 'POST':
+        form = VilagkartyaForm(request.POST, instance=kartya)
+        if form.is_valid():
+            form.save()
+            messages.success(request, f'Világkártya "{kartya.nev}" frissítve!')
+            return redirect('damareen:manage_vilagkartyak')
+    else:
+        form = VilagkartyaForm(instance=kartya)
+    
+    return render(request, 'damareen/master/edit_vilagkartya.html', {
+        'kartya': kartya,
+        'form': form
+    })
+
+
+@login_required
+@transaction.atomic
+def delete_vilagkartya(request, kartya_id):
+    """Világkártya törlése"""
+    kartya = get_object_or_404(Vilagkartya, id=kartya_id)
+    
+    if request.method == 'POST':
+        nev = kartya.nev
+        kartya.delete()
+        messages.success(request, f'Világkártya "{nev}" törölve!')
+        return redirect('damareen:manage_vilagkartyak')
+    
+    return render(request, 'damareen/master/delete_vilagkartya.html', {
+        'kartya': kartya
+    })
+
+
+@login_required
+def manage_vezerkartyak(request):
+    """Vezérkártyák kezelése"""
+    kartyak = Vezerkartya.objects.all().order_by('nev')
+    
+    return render(request, 'damareen/master/manage_vezerkartyak.html', {
+        'kartyak': kartyak
+    })
+
+
+@login_required
+@transaction.atomic
+def create_vezerkartya(request):
+    """Új vezérkártya létrehozása"""
+    if request.method == 'POST':
+        form = VezerkartyaForm(request.POST)
+        if form.is_valid():
+            kartya = form.save()
+            messages.success(request, f'Vezérkártya "{kartya.nev}" létrehozva!')
+            return redirect('damareen:manage_vezerkartyak')
+    else:
+        form = VezerkartyaForm()
+    
+    vilag_kartyak = Vilagkartya.objects.all().order_by('nev')
+    
+    return render(request, 'damareen/master/create_vezerkartya.html', {
+        'form': form,
+        'vilag_kartyak': vilag_kartyak
+    })
+
+
+@login_required
+@transaction.atomic
+def delete_vezerkartya(request, kartya_id):
+    """Vezérkártya törlése"""
+    kartya = get_object_or_404(Vezerkartya, id=kartya_id)
+    
+    if request.method == 'POST':
+        nev = kartya.nev
+        kartya.delete()
+        messages.success(request, f'Vezérkártya "{nev}" törölve!')
+        return redirect('damareen:manage_vezerkartyak')
+    
+    return render(request, 'damareen/master/delete_vezerkartya.html', {
+        'kartya': kartya
+    })
+
+
+@login_required
+def manage_kazamatak(request):
+    """Kazamaták kezelése"""
+    kazamatak = Kazamata.objects.all().order_by('nev')
+    
+    return render(request, 'damareen/master/manage_kazamatak.html', {
+        'kazamatak': kazamatak
+    })
+
+
+@login_required
+@transaction.atomic
+def create_kazamata(request):
+    """Új kazamata létrehozása"""
+    if request.method == 'POST':
+        form = KazamataForm(request.POST)
+        if form.is_valid():
+            kazamata = form.save()
+            messages.success(request, f'Kazamata "{kazamata.nev}" létrehozva! Most add hozzá a kártyákat.')
+            return redirect('damareen:edit_kazamata', kazamata_id=kazamata.id)
+    else:
+        form = KazamataForm()
+    
+    return render(request, 'damareen/master/create_kazamata.html', {
+        'form': form
+    })
+
+
+@login_required
+@transaction.atomic
+def edit_kazamata(request, kazamata_id):
+    """Kazamata szerkesztése (kártyák hozzáadása/törlése)"""
+    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
+    
+    if request.method == 'POST':
+        # Kártya eltávolítása
+        if 'remove_card' in request.POST:
+            kazamata_kartya_id = request.POST.get('remove_card')
+            try:
+                KazamataKartya.objects.get(id=kazamata_kartya_id).delete()
+                messages.success(request, 'Kártya eltávolítva!')
+            except Exception as e:
+                messages.error(request, f'Hiba: {str(e)}')
+            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
+        
+        # Normál kártya hozzáadása
+        if 'add_normal_card' in request.POST:
+            vilag_kartya_id = request.POST.get('add_normal_card')
+            try:
+                vilag_kartya = Vilagkartya.objects.get(id=vilag_kartya_id)
+                # Következő sorrend meghatározása
+                max_sorrend = kazamata.kartyak.aggregate(Max('sorrend'))['sorrend__max'] or 0
+                KazamataKartya.objects.create(
+                    kazamata=kazamata,
+                    sorrend=max_sorrend + 1,
+                    vilag_kartya=vilag_kartya
+                )
+                messages.success(request, f'"{vilag_kartya.nev}" hozzáadva!')
+            except Exception as e:
+                messages.error(request, f'Hiba: {str(e)}')
+            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
+        
+        # Vezérkártya hozzáadása
+        if 'add_leader_card' in request.POST:
+            vezer_kartya_id = request.POST.get('add_leader_card')
+            try:
+                vezer_kartya = Vezerkartya.objects.get(id=vezer_kartya_id)
+                # Következő sorrend meghatározása
+                max_sorrend = kazamata.kartyak.aggregate(Max('sorrend'))['sorrend__max'] or 0
+                KazamataKartya.objects.create(
+                    kazamata=kazamata,
+                    sorrend=max_sorrend + 1,
+                    vezer_kartya=vezer_kartya
+                )
+                messages.success(request, f'Vezér "{vezer_kartya.nev}" hozzáadva!')
+            except Exception as e:
+                messages.error(request, f'Hiba: {str(e)}')
+            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
+        
+        # Alapadatok módosítása
+        form = KazamataForm(request.POST, instance=kazamata)
+        if form.is_valid():
+            # Ha típus változott, töröljük a kártyákat
+            if form.cleaned_data['tipus'] != kazamata.tipus:
+                kazamata.kartyak.all().delete()
+                messages.warning(request, 'A típus megváltozott, az összes kártya törölve!')
+            form.save()
+            messages.success(request, 'Kazamata módosítva!')
+            return redirect('damareen:edit_kazamata', kazamata_id=kazamata_id)
+    else:
+        form = KazamataForm(instance=kazamata)
+    
+    # Kártyák lekérdezése
+    vilag_kartyak = Vilagkartya.objects.all().order_by('nev')
+    vezer_kartyak = Vezerkartya.objects.all().order_by('nev')
+    
+    # Kapacitás számítás
+    if kazamata.tipus == Kazamata.TIPUS_EGYSZERU:
+        max_normalis = 1
+        max_vezer = 0
+        max_kartyak = 1
+    elif kazamata.tipus == Kazamata.TIPUS_KIS:
+        max_normalis = 3
+        max_vezer = 1
+        max_kartyak = 4
+    else:  # NAGY
+        max_normalis = 5
+        max_vezer = 1
+        max_kartyak = 6
+    
+    # Jelenlegi kártyák száma
+    current_normal = kazamata.kartyak.filter(vilag_kartya__isnull=False).count()
+    current_leader = kazamata.kartyak.filter(vezer_kartya__isnull=False).count()
+    
+    can_add_normal = current_normal < max_normalis
+    can_add_leader = (max_vezer > 0) and (current_leader < max_vezer)
+    
+    return render(request, 'damareen/master/edit_kazamata.html', {
+        'kazamata': kazamata,
+        'form': form,
+        'vilag_kartyak': vilag_kartyak,
+        'vezer_kartyak': vezer_kartyak,
+        'max_kartyak': max_kartyak,
+        'can_add_normal': can_add_normal,
+        'can_add_leader': can_add_leader,
+    })
+
+
+@login_required
+@transaction.atomic
+def delete_kazamata(request, kazamata_id):
+    """Kazamata törlése"""
+    kazamata = get_object_or_404(Kazamata, id=kazamata_id)
+    
+    if request.method == 'POST':
+        nev = kazamata.nev
+        kazamata.delete()
+        messages.success(request, f'Kazamata "{nev}" törölve!')
+        return redirect('damareen:manage_kazamatak')
+    
+    return render(request, 'damareen/master/delete_kazamata.html', {
+        'kazamata': kazamata
+    })
+
+
+# ============= RANGSOR ÉS ACHIEVEMENTEK =============
+
+def leaderboard(request):
+    """Rangsor - legjobb játékosok listája, a processzen belüli rangsor indexből"""
+    # Top 50 játékos pontszám szerint
+    top_players = leaderboard_index.szelet(0, 50)
+    
+    # Aktuális felhasználó rangja
+    current_user_rank = None
+    current_user_profile = None
+    
+    if request.user.is_authenticated:
+        current_user_profile = leaderboard_index.sor(request.user.id)
+        current_user_rank = leaderboard_index.rang(request.user.id)
+    
+    return render(request, 'damareen/leaderboard.html', {
+        'top_players': top_players,
+        'current_user_rank': current_user_rank,
+        'current_user_profile': current_user_profile
+    })
+
+
+def szezon_rangsor(request, szezon_id=None):
+    """Szezon rangsor - az aktív vagy egy korábbi szezon legjobbjai"""
+    szezonok = Szezon.objects.all()
+    if szezon_id is not None:
+        szezon = get_object_or_404(Szezon, id=szezon_id)
+    else:
+        szezon = Szezon.aktualis()
+    
+    eredmenyek = []
+    if szezon is not None:
+        eredmenyek = szezon.eredmenyek.select_related('jatekos').order_by(
+            '-pontszam', '-gyozelmek', 'jatekos_id'
+        )[:50]
+    
+    return render(request, 'damareen/szezon.html', {
+        'szezonok': szezonok,
+        'szezon': szezon,
+        'eredmenyek': eredmenyek
+    })
+
+
+RANGSOR_API_MAX_DARAB = 200
+
+
+def _rangsor_json(sorok):
+    return [
+        {
+            'rang': rang,
+            'user_id': sor.user_id,
+            'username': sor.username,
+            'pontszam': sor.osszes_pontszam,
+            'gyozelmek': sor.osszes_gyozelem,
+            'veresegek': sor.osszes_vereseg,
+            'legmagasabb_sorozat': sor.legmagasabb_sorozat,
+        }
+        for rang, sor in sorok
+    ]
+
+
+def rangsor_api(request):
+    """
+    Teljes rangsor JSON-ben, kulcs alapú lapozással.
+    
+    A következő oldalhoz a válasz 'kovetkezo' értékét kell visszaküldeni
+    ?utan=... paraméterként; mélyebb oldalak sem drágábbak.
+    """
+    try:
+        darab = min(max(int(request.GET.get('darab', 50)), 1), RANGSOR_API_MAX_DARAB)
+        utan = request.GET.get('utan')
+        if utan:
+            pontszam, gyozelmek, user_id = (int(resz) for resz in utan.split('.'))
+            utan = (pontszam, gyozelmek, user_id)
+    except ValueError:
+        return JsonResponse({'error': 'Hibás lapozási paraméter!'}, status=400)
+    
+    sorok, kovetkezo = leaderboard_index.oldal(utan or None, darab)
+    return JsonResponse({
+        'jatekosok': _rangsor_json(sorok),
+        'kovetkezo': '.'.join(map(str, kovetkezo)) if kovetkezo else None,
+        'osszes': leaderboard_index.meret(),
+    })
+
+
+def rangsor_kornyezet_api(request, user_id):
+    """A játékos körüli ±n helyezés JSON-ben"""
+    try:
+        n = min(max(int(request.GET.get('n', 5)), 0), RANGSOR_API_MAX_DARAB // 2)
+    except ValueError:
+        return JsonResponse({'error': 'Hibás paraméter!'}, status=400)
+    
+    sorok = leaderboard_index.kornyezet(user_id, n)
+    if sorok is None:
+        return JsonResponse({'error': 'A játékos nem szerepel a rangsorban!'}, status=404)
+    return JsonResponse({
+        'user_id': user_id,
+        'rang': leaderboard_index.rang(user_id),
+        'jatekosok': _rangsor_json(sorok),
+    })
+
+
+@login_required
+def my_achievements(request):
+    """Saját achievementek megtekintése"""
+    # Összes achievement
+    all_achievements = Achievement.objects.all().order_by('cel_ertek', 'nev')
+    
+    # Játékos achievementjei
+    player_achievements = PlayerAchievement.objects.filter(
+        jatekos=request.user
+    ).select_related('achievement')
+    
+    #Dict létrehozása gyors kereséshez
+    player_ach_dict = {pa.achievement.id: pa for pa in player_achievements}
+    
+    # A még nem teljesített achievementek haladása a figyelt metrika
+    metrikak = dict(JatekosMetrika.objects.filter(jatekos=request.user).values_list('kulcs', 'ertek'))
+    
+    # Achievement lista előkészítése haladással
+    achievements_with_progress = []
+    for achievement in all_achievements:
+        player_ach = player_ach_dict.get(achievement.id)
+        
+        if player_ach and player_ach.teljesitve:
+            achievements_with_progress.append({
+                'achievement': achievement,
+                'haladás': player_ach.jelenlegi_haladás,
+                'teljesitve': True,
+                'szazalek': player_ach.get_haladás_szazalek(),
+                'megszerzve': player_ach.megszerzve
+            })
+        else:
+            haladas = min(metrikak.get(achievement.kulcs, 0), achievement.cel_ertek)
+            achievements_with_progress.append({
+                'achievement': achievement,
+                'haladás': haladas,
+                'teljesitve': False,
+                'szazalek': round(haladas / achievement.cel_ertek * 100, 1) if achievement.cel_ertek else 0,
+                'megszerzve': None
+            })
+    
+    # Statisztikák
+    teljesitett_szam = sum(1 for a in achievements_with_progress if a['teljesitve'])
+    osszes_szam = len(achievements_with_progress)
+    
+    try:
+        profile = request.user.userprofile
+    except UserProfile.DoesNotExist:
+        profile = None
+    
+    return render(request, 'damareen/achievements.html', {
+        'achievements': achievements_with_progress,
+        'teljesitett_szam': teljesitett_szam,
+        'osszes_szam': osszes_szam,
+        'profile': profile
+    })